@@ -1,5 +1,11 @@
 import streamlit as st
-import pandas as pd
+from datasets import get_dataset, dataset_version
+from result_cache import memoize
+from downloads import download_button
+from table_view import render_table
+from perf import instrument, stage
+from money import rupee_columns, to_rupees
+from facets import facet_values, keep_valid
 
 def card(title, amount, color="#4CAF50"):
     card_html = f"""
@@ -20,30 +26,69 @@ def card(title, amount, color="#4CAF50"):
     """
     return card_html
 
-def main():
-    st.title("💵 Cash Variance Report")
-
-    file_path = "CVR.csv"
+DISPLAY_COLS = [
+    "Date", "Location", "Total Sales", "Swiggy", "Zomato", "Card Sales",
+    "UPI", "Dineout", "Zomato Pro", "Expenses",
+    "Expected Cash Sales", "Actual Cash Sales", "Variance"
+]
+# Held as paise in the dataset (money.py); rupees only in the table and export
+AMOUNT_COLS = DISPLAY_COLS[2:]
+
+# --- Export frame: detail rows in date order, dates as dd-mm-yyyy ---
+def cvr_export(filtered_df):
+    download_df = rupee_columns(filtered_df[DISPLAY_COLS], AMOUNT_COLS).sort_values("Date")
+    download_df["Date"] = download_df["Date"].dt.strftime('%d-%m-%Y')
+    return download_df
+
+# --- Filtered rows and card totals for one selection (no widgets; also used by batch_reports) ---
+def cvr_summary(df, selected_year, selected_month, selected_location, date_range):
+    filtered_df = df
+
+    if selected_year != 'All':
+        filtered_df = filtered_df[filtered_df["Year"] == selected_year]
+    if selected_month != 'All':
+        filtered_df = filtered_df[filtered_df["Month"] == selected_month]
+    if selected_location != 'All':
+        filtered_df = filtered_df[filtered_df["Location"] == selected_location]
+    if isinstance(date_range, tuple) and len(date_range) == 2:
+        start_date, end_date = date_range
+        filtered_df = filtered_df[
+            (filtered_df["Date"].dt.date >= start_date) & 
+            (filtered_df["Date"].dt.date <= end_date)
+        ]
 
-    try:
-        df = pd.read_csv(file_path)
+    # Final values - exact paise sums, shown as whole rupees
+    totals = {
+        'expected': int(round(to_rupees(filtered_df["Expected Cash Sales"].sum()))),
+        'actual': int(round(to_rupees(filtered_df["Actual Cash Sales"].sum()))),
+        'variance': int(round(to_rupees(filtered_df["Variance"].sum()))),
+    }
+    return filtered_df, totals
 
-        df["Date"] = pd.to_datetime(df["Date"], format="%d-%m-%Y %H:%M", errors='coerce')
-        df = df.dropna(subset=["Date"])
+@memoize('cvr', datasets=['cvr'])
+def cvr_report(selected_year, selected_month, selected_location, date_range):
+    return cvr_summary(get_dataset('cvr'), selected_year, selected_month, selected_location, date_range)
 
-        df["Year"] = df["Date"].dt.year
-        df["Month"] = df["Date"].dt.strftime('%B')
+@instrument('cvr')
+def main():
+    st.title("💵 Cash Variance Report")
 
-        df["Variance"] = df["Actual Cash Sales"] - df["Expected Cash Sales"]
+    try:
+        stage('load')
+        df = get_dataset('cvr')
 
-        years = sorted(df["Year"].dropna().unique())
-        selected_year = st.sidebar.selectbox("Select Year", ['All'] + years, index=0)
+        stage('filter')
+        years = ['All'] + facet_values('cvr', 'Year')
+        keep_valid("cvr_year", years)
+        selected_year = st.sidebar.selectbox("Select Year", years, index=0, key="cvr_year")
 
-        months = sorted(df["Month"].dropna().unique())
-        selected_month = st.sidebar.selectbox("Select Month", ['All'] + months, index=0)
+        months = ['All'] + facet_values('cvr', 'Month', {'Year': selected_year})
+        keep_valid("cvr_month", months)
+        selected_month = st.sidebar.selectbox("Select Month", months, index=0, key="cvr_month")
 
-        locations = sorted(df["Location"].dropna().unique())
-        selected_location = st.sidebar.selectbox("Select Location", ['All'] + locations, index=0)
+        locations = ['All'] + facet_values('cvr', 'Location', {'Year': selected_year, 'Month': selected_month})
+        keep_valid("cvr_location", locations)
+        selected_location = st.sidebar.selectbox("Select Location", locations, index=0, key="cvr_location")
 
         min_date = df["Date"].min().date()
         max_date = df["Date"].max().date()
@@ -55,27 +100,14 @@ def main():
             key="date_range"
         )
 
-        filtered_df = df.copy()
-
-        if selected_year != 'All':
-            filtered_df = filtered_df[filtered_df["Year"] == selected_year]
-        if selected_month != 'All':
-            filtered_df = filtered_df[filtered_df["Month"] == selected_month]
-        if selected_location != 'All':
-            filtered_df = filtered_df[filtered_df["Location"] == selected_location]
-        if isinstance(date_range, tuple) and len(date_range) == 2:
-            start_date, end_date = date_range
-            filtered_df = filtered_df[
-                (filtered_df["Date"].dt.date >= start_date) & 
-                (filtered_df["Date"].dt.date <= end_date)
-            ]
-
-        # Final values - round and remove commas/₹
-        expected_total = int(round(filtered_df["Expected Cash Sales"].sum()))
-        actual_total = int(round(filtered_df["Actual Cash Sales"].sum()))
-        variance_total = int(round(filtered_df["Variance"].sum()))
+        stage('aggregate')
+        filtered_df, totals = cvr_report(selected_year, selected_month, selected_location, date_range)
+        expected_total = totals['expected']
+        actual_total = totals['actual']
+        variance_total = totals['variance']
         color = "#E53935" if variance_total < 0 else "#4CAF50"
 
+        stage('render')
         col1, col2, col3 = st.columns(3, gap="medium")
         with col1:
             st.markdown(card("🧾 Expected Cash Sales", str(expected_total)), unsafe_allow_html=True)
@@ -84,20 +116,22 @@ def main():
         with col3:
             st.markdown(card("🔀 Variance", str(variance_total), color=color), unsafe_allow_html=True)
 
-        # Format date for display
-        filtered_df["Date"] = filtered_df["Date"].dt.strftime('%d-%m-%Y')
-
         st.subheader("📋 Cash Variance Details")
-        display_cols = [
-            "Date", "Location", "Total Sales", "Swiggy", "Zomato", "Card Sales",
-            "UPI", "Dineout", "Zomato Pro", "Expenses",
-            "Expected Cash Sales", "Actual Cash Sales", "Variance"
-        ]
-        st.dataframe(filtered_df[display_cols].sort_values("Date"), use_container_width=True)
+        render_table(
+            rupee_columns(filtered_df[DISPLAY_COLS], AMOUNT_COLS),
+            key="cvr",
+            formats={"Date": lambda d: d.strftime('%d-%m-%Y')},
+            default_sort="Date"
+        )
 
-        # Download button
-        csv = filtered_df[display_cols].to_csv(index=False).encode('utf-8')
-        st.download_button("⬇️ Download Report as CSV", csv, "cash_variance_report.csv", "text/csv")
+        # Download: export built only when the button is clicked
+        download_button(
+            "Download Report",
+            lambda: cvr_export(filtered_df),
+            "cash_variance_report",
+            fingerprint=("cvr", dataset_version('cvr'), selected_year, selected_month, selected_location, tuple(date_range)),
+            key="cvr_download"
+        )
 
     except FileNotFoundError:
         st.error("❌ CVR.csv file not found.")
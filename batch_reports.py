@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+
+# === Headless month-end report pack ===
+# Runs the compute functions of the report modules (no widgets) for every
+# report × outlet × period and writes one bundle folder per period and outlet:
+#   <out>/<YYYY-MM>/<outlet>/<report>.xlsx (one sheet per table) and/or
+#   <report>__<table>.csv / .parquet
+# Tasks are spread over a process pool; each worker loads a dataset once.
+#
+#   python batch_reports.py --year 2025 --month April --formats XLSX CSV
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(BASE_DIR, 'output files', 'month_end')
+ALL_OUTLETS = 'All'
+
+
+# --- Report builders: (year, month, outlet) -> {table name: frame} ---
+def _pnl_tables(year, month, outlet):
+    from datasets import get_dataset
+    from pnl_dashboard import pnl_statement, statement_export
+
+    df = get_dataset('pnl')
+    locations = sorted(df['Location'].dropna().unique()) if outlet == ALL_OUTLETS else [outlet]
+    cards, rows = pnl_statement(df, [year], [month], locations)
+    return {'Statement': statement_export(rows), 'Summary': pd.DataFrame([cards])}
+
+
+def _cvr_tables(year, month, outlet):
+    from datasets import get_dataset
+    from CVR import cvr_summary, cvr_export
+
+    filtered_df, totals = cvr_summary(get_dataset('cvr'), year, month, outlet, None)
+    return {'Details': cvr_export(filtered_df), 'Summary': pd.DataFrame([totals])}
+
+
+def _food_cost_tables(year, month, outlet):
+    from datasets import get_dataset
+    from ideal_vs_actual import food_cost_summary
+
+    cards, loc_table, cat_table = food_cost_summary(get_dataset('foodcost_cube'), year, month, outlet)
+    return {'Summary': cards.to_frame().T, 'Location-wise': loc_table, 'Category-wise': cat_table}
+
+
+def _consumption_tables(year, month, outlet):
+    from inventory_consumption import consumption_table
+
+    table_df, totals = consumption_table.uncached(year, month, outlet)
+    return {'Consumption': pd.concat([table_df, totals], ignore_index=True)}
+
+
+def _loss_tables(year, month, outlet):
+    from inventory_loss import loss_summary
+
+    cards, item_table, variance_df = loss_summary.uncached(year, month, outlet)
+    return {'Summary': pd.DataFrame([cards]), 'Items': item_table, 'Variance': variance_df}
+
+
+# dataset: where the report's periods and outlets come from
+REPORTS = {
+    'pnl': {'dataset': 'pnl', 'build': _pnl_tables},
+    'cash_variance': {'dataset': 'cvr', 'build': _cvr_tables},
+    'food_cost': {'dataset': 'foodcost', 'build': _food_cost_tables},
+    'inventory_consumption': {'dataset': 'inventory', 'build': _consumption_tables},
+    'inventory_loss': {'dataset': 'inventory', 'build': _loss_tables},
+}
+
+
+def _month_number(month):
+    return datetime.strptime(str(month), '%B').month
+
+
+# --- (year, month) pairs and outlets present in a report's dataset ---
+def report_scope(report):
+    from datasets import get_dataset
+
+    df = get_dataset(REPORTS[report]['dataset'])
+    periods = df[['Year', 'Month']].dropna().drop_duplicates()
+    periods = sorted(
+        ((int(year), month) for year, month in periods.itertuples(index=False, name=None)),
+        key=lambda period: (period[0], _month_number(period[1]))
+    )
+    outlets = sorted(df['Location'].dropna().unique())
+    return periods, outlets
+
+
+def plan_tasks(reports, years=None, months=None, outlets=None, latest_only=True):
+    tasks = []
+    for report in reports:
+        periods, report_outlets = report_scope(report)
+        if years:
+            periods = [p for p in periods if p[0] in years]
+        if months:
+            periods = [p for p in periods if p[1] in months]
+        if latest_only and not (years or months) and periods:
+            periods = periods[-1:]
+        selected = [o for o in report_outlets if not outlets or o in outlets]
+        for year, month in periods:
+            for outlet in [ALL_OUTLETS] + selected:
+                tasks.append((report, year, month, outlet))
+    return tasks
+
+
+def _write_tables(tables, folder, report, formats):
+    from downloads import WRITERS
+
+    os.makedirs(folder, exist_ok=True)
+    written = []
+    if 'XLSX' in formats:
+        path = os.path.join(folder, f'{report}.xlsx')
+        with pd.ExcelWriter(path) as writer:
+            for name, frame in tables.items():
+                frame.to_excel(writer, sheet_name=name[:31], index=False)
+        written.append(path)
+    for fmt, extension in (('CSV', 'csv'), ('Parquet', 'parquet')):
+        if fmt not in formats:
+            continue
+        for name, frame in tables.items():
+            path = os.path.join(folder, f"{report}__{name.lower().replace(' ', '_')}.{extension}")
+            with open(path, 'wb') as f:
+                WRITERS[fmt](frame, f)
+            written.append(path)
+    return written
+
+
+# --- One task, run inside a pool worker ---
+def render_task(task, out_dir, formats):
+    report, year, month, outlet = task
+    started = time.perf_counter()
+    tables = REPORTS[report]['build'](year, month, outlet)
+    folder = os.path.join(out_dir, f'{year}-{_month_number(month):02d}', outlet)
+    written = _write_tables(tables, folder, report, formats)
+    return task, written, time.perf_counter() - started
+
+
+def main(argv=None):
+    from downloads import EXPORT_FORMATS, available_formats
+
+    parser = argparse.ArgumentParser(description="Render every report for every outlet and period without the UI.")
+    parser.add_argument('--reports', nargs='+', choices=sorted(REPORTS), default=sorted(REPORTS))
+    parser.add_argument('--year', type=int, nargs='+', help="years to render (default: latest period only)")
+    parser.add_argument('--month', nargs='+', help="month names to render, e.g. April")
+    parser.add_argument('--outlets', nargs='+', help="outlets to render (default: all, plus the 'All' roll-up)")
+    parser.add_argument('--all-periods', action='store_true', help="render every period in the data")
+    parser.add_argument('--formats', nargs='+', choices=list(EXPORT_FORMATS), default=['XLSX', 'CSV'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--out', default=DEFAULT_OUT)
+    args = parser.parse_args(argv)
+
+    formats = available_formats(args.formats)
+    missing = sorted(set(args.formats) - set(formats))
+    if missing:
+        print(f"Skipping {', '.join(missing)}: writer library not installed")
+    if not formats:
+        return 1
+
+    tasks = plan_tasks(args.reports, args.year, args.month, args.outlets, latest_only=not args.all_periods)
+    if not tasks:
+        print("Nothing to render for that selection.")
+        return 1
+
+    started = time.perf_counter()
+    failures = 0
+    files = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(render_task, task, args.out, formats): task for task in tasks}
+        for future in as_completed(futures):
+            report, year, month, outlet = futures[future]
+            try:
+                _, written, _ = future.result()
+                files += len(written)
+            except Exception as e:
+                failures += 1
+                print(f"❌ {report} {month} {year} {outlet}: {e}")
+
+    print(f"{len(tasks) - failures}/{len(tasks)} reports, {files} files in {time.perf_counter() - started:.1f}s → {args.out}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import os
+import numpy as np
+import pandas as pd
+
+# === Time-series downsampling for trend charts ===
+# A browser cannot draw more points than the chart is wide, so long series are
+# cut to about one point per pixel before the figure is built. Largest-Triangle-
+# Three-Buckets keeps the points that carry the shape (peaks, dips, steps)
+# instead of averaging them away.
+
+# Plot width of a trend chart on the wide layout, in pixels (points per series)
+CHART_POINTS = int(os.environ.get('CHART_POINTS', 1000))
+
+
+# --- Indices of the points LTTB keeps out of (x, y); x must be increasing ---
+def lttb(x, y, threshold):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # First and last points are always kept; the rest is split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # The next bucket is represented by its average point (the last point for the final bucket)
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        # Twice the triangle area (prev point, candidate, next average); the largest wins
+        area = np.abs(
+            (x[prev] - next_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (next_y - y[prev])
+        )
+        prev = start + int(area.argmax())
+        keep[i + 1] = prev
+    return keep
+
+
+# --- Wide frame (date index, one column per series) -> long frame of kept points ---
+def downsample_series(wide, max_points=CHART_POINTS, value_name='Sales Value', series_name='Series'):
+    x = wide.index.to_numpy(dtype='datetime64[ns]').astype('int64')
+    parts = []
+    for column in wide.columns:
+        y = wide[column].to_numpy(dtype=float)
+        keep = lttb(x, y, max_points)
+        parts.append(pd.DataFrame({
+            wide.index.name or 'Date': wide.index[keep],
+            series_name: column,
+            value_name: y[keep],
+        }))
+    if not parts:
+        return pd.DataFrame(columns=[wide.index.name or 'Date', series_name, value_name])
+    return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,420 @@
+import os
+import re
+import time
+import threading
+import importlib
+import pandas as pd
+from metrics import inc, observe, set_gauge
+from perf import current_report
+from money import downcast, money_columns, parse_amount, to_paise
+from shared_store import load_shared, store_shared
+from disk_cache import disk_get, disk_put
+from validation import (
+    flag_rows, passed_loader, quarantine_loader, sales_read_rules, swiggy_sales_read_rules, swiggy_sales_rules
+)
+
+# === Central dataset registry ===
+# Every report reads its data through get_dataset(name). Each dataset declares
+# its source files, required columns, loader and invalidation rule here, and the
+# loaded frame is held once per server process and shared by all sessions.
+
+# DASHBOARD_DATA_DIR points the registry at another data root (e.g. synthetic load-test data)
+BASE_DIR = os.environ.get('DASHBOARD_DATA_DIR') or os.path.dirname(os.path.abspath(__file__))
+
+# Shared frames are handed out as shallow copies; copy-on-write keeps a
+# session's column edits from leaking into the cached frame.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+DATASETS = {}
+FACETS = {}
+FACET_COUNT = 'Rows'
+
+_cache = {}
+_partitions = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+# --- Declaration ---
+def register_dataset(name, loader=None, sources=(), directory=None, extensions=('.csv',),
+                     schema=None, depends_on=(), invalidation='mtime', partition_loader=None, allow_empty=False):
+    # sources: paths relative to BASE_DIR; a tuple entry lists alternatives, first existing wins
+    # directory: every file under it with one of `extensions` (sorted) is a source
+    # loader: callable or "module:function"; base loaders get the resolved paths,
+    #         derived loaders get the frames of `depends_on` in order
+    # partition_loader: with `directory`, loads one file; only new or changed files are
+    #         re-read and `loader` (default: concat) combines the partition frames
+    # invalidation: 'mtime' reloads when a source's mtime/size changes, 'never' loads once,
+    #         'daily' also rebuilds on the first read of each day (rules relative to today)
+    # allow_empty: with `directory`, a missing folder or one with no files loads as an
+    #         empty frame with the `schema` columns instead of raising FileNotFoundError
+    DATASETS[name] = {
+        'name': name,
+        'loader': loader or (_concat_partitions if partition_loader else None),
+        'partition_loader': partition_loader,
+        'sources': list(sources),
+        'directory': directory,
+        'extensions': tuple(extensions),
+        'schema': list(schema or []),
+        'depends_on': list(depends_on),
+        'invalidation': invalidation,
+        'allow_empty': allow_empty,
+    }
+    _locks[name] = threading.Lock()
+
+
+# --- Facet index of a dataset: its distinct filter combinations with row counts,
+# held as the '<name>_facets' dataset and rebuilt with it (lookups in facets.py) ---
+def register_facets(name, dimensions, order=None, weight=None):
+    # order: {dimension: column its values are sorted by}; default is the values themselves
+    # weight: column summed as the row count, for pre-aggregated datasets
+    FACETS[name] = {'dataset': f'{name}_facets', 'dimensions': list(dimensions), 'order': dict(order or {})}
+    columns = list(dict.fromkeys(list(dimensions) + list((order or {}).values())))
+
+    def build(df):
+        grouped = df.groupby(columns, dropna=False, sort=False)
+        counts = grouped[weight].sum() if weight else grouped.size()
+        return counts.rename(FACET_COUNT).reset_index()
+
+    register_dataset(f'{name}_facets', build, depends_on=[name])
+
+
+# --- Source resolution and fingerprints ---
+def _abs(path):
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+
+def resolve_sources(name):
+    spec = DATASETS[name]
+    paths = []
+    for source in spec['sources']:
+        candidates = source if isinstance(source, tuple) else (source,)
+        found = next((_abs(c) for c in candidates if os.path.exists(_abs(c))), None)
+        if found is None:
+            raise FileNotFoundError(f"{name}: none of {list(candidates)} found")
+        paths.append(found)
+
+    if spec['directory']:
+        root_dir = _abs(spec['directory'])
+        if not os.path.isdir(root_dir):
+            if spec['allow_empty']:
+                return paths
+            raise FileNotFoundError(f"{name}: folder '{spec['directory']}' not found")
+        for root, dirs, files in os.walk(root_dir):
+            for file in files:
+                if file.lower().endswith(spec['extensions']):
+                    paths.append(os.path.join(root, file))
+        paths.sort()
+    return paths
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+def dataset_version(name):
+    spec = DATASETS[name]
+    if spec['depends_on']:
+        version = tuple(dataset_version(dep) for dep in spec['depends_on'])
+    elif spec['invalidation'] == 'never' and name in _cache:
+        return _cache[name][0]
+    else:
+        version = tuple(file_stamp(path) for path in resolve_sources(name))
+    if spec['invalidation'] == 'daily':
+        version += (time.strftime('%Y-%m-%d'),)
+    return version
+
+
+# --- Loading ---
+def _resolve_loader(loader):
+    if callable(loader):
+        return loader
+    module_name, func_name = loader.split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+def _check_schema(name, df):
+    missing = [col for col in DATASETS[name]['schema'] if col not in df.columns]
+    if missing:
+        raise ValueError(f"{name}: missing columns {missing}")
+
+def _load_partitions(name, paths):
+    loader = _resolve_loader(DATASETS[name]['partition_loader'])
+    previous = _partitions.get(name, {})
+    current = {}
+    for path in paths:
+        stamp = file_stamp(path)
+        if path in previous and previous[path]['stamp'] == stamp:
+            current[path] = previous[path]
+            continue
+        try:
+            current[path] = {'stamp': stamp, 'frame': loader(path), 'error': None}
+        except Exception as e:
+            current[path] = {'stamp': stamp, 'frame': None, 'error': str(e)}
+    _partitions[name] = current
+    return [part['frame'] for part in current.values() if part['frame'] is not None]
+
+def _load(name):
+    spec = DATASETS[name]
+    loader = _resolve_loader(spec['loader'])
+    if spec['depends_on']:
+        df = loader(*[get_dataset(dep) for dep in spec['depends_on']])
+    else:
+        paths = resolve_sources(name)
+        if not paths and spec['allow_empty']:
+            return pd.DataFrame(columns=spec['schema'])
+        if not paths:
+            raise FileNotFoundError(f"{name}: no source files found")
+        if spec['partition_loader']:
+            frames = _load_partitions(name, paths)
+            if not frames:
+                raise FileNotFoundError(f"{name}: no readable source files")
+            df = loader(frames)
+        else:
+            df = loader(paths)
+    _check_schema(name, df)
+    return df
+
+def get_dataset(name):
+    version = dataset_version(name)
+    cached = _cache.get(name)
+    if cached is None or cached[0] != version:
+        with _locks[name]:
+            cached = _cache.get(name)
+            if cached is None or cached[0] != version:
+                started = time.perf_counter()
+                # Another server process may already have built this version (shared_store.py)
+                frame = load_shared(name, version)
+                status = 'shared'
+                if frame is None:
+                    # ... or an earlier run of this server (disk_cache.py)
+                    found, frame = disk_get('datasets', (name, version))
+                    status = 'disk'
+                    if not found:
+                        try:
+                            frame = _load(name)
+                        except Exception:
+                            inc('dashboard_dataset_loads_total', {'dataset': name, 'status': 'error'})
+                            raise
+                        disk_put('datasets', (name, version), frame)
+                        status = 'ok'
+                    store_shared(name, version, frame)
+                observe('dashboard_dataset_load_seconds', {'dataset': name}, time.perf_counter() - started)
+                inc('dashboard_dataset_loads_total', {'dataset': name, 'status': status})
+                set_gauge('dashboard_dataset_rows', {'dataset': name}, len(frame))
+                cached = (version, frame)
+                with _registry_lock:
+                    _cache[name] = cached
+    inc('dashboard_dataset_rows_served_total', {'dataset': name, 'report': current_report() or 'background'}, len(cached[1]))
+    return cached[1].copy(deep=False)
+
+def is_loaded(name):
+    cached = _cache.get(name)
+    if cached is None:
+        return False
+    try:
+        return cached[0] == dataset_version(name)
+    except FileNotFoundError:
+        return False
+
+def dependents(name):
+    found = []
+    for other, spec in DATASETS.items():
+        if name in spec['depends_on'] and other not in found:
+            found.append(other)
+            found.extend(d for d in dependents(other) if d not in found)
+    return found
+
+def partition_status(name):
+    return {
+        path: {'stamp': part['stamp'], 'rows': 0 if part['frame'] is None else len(part['frame']), 'error': part['error']}
+        for path, part in _partitions.get(name, {}).items()
+    }
+
+# --- Drop cached frames; with `paths`, only those partitions are re-read on next load ---
+def invalidate(name=None, paths=None):
+    with _registry_lock:
+        if name is None:
+            _cache.clear()
+            _partitions.clear()
+            return
+        for affected in [name] + dependents(name):
+            _cache.pop(affected, None)
+        if paths is None:
+            _partitions.pop(name, None)
+        else:
+            for path in paths:
+                _partitions.get(name, {}).pop(path, None)
+
+
+# --- Base loaders ---
+def _concat_partitions(frames):
+    return pd.concat(frames, ignore_index=True)
+
+def _read_pnl(paths):
+    df = pd.read_csv(paths[0])
+    return money_columns(df, ['Amount'])
+
+def _read_cvr(paths):
+    df = pd.read_csv(paths[0])
+    df["Date"] = pd.to_datetime(df["Date"], format="%d-%m-%Y %H:%M", errors='coerce')
+    df = df.dropna(subset=["Date"])
+    df["Year"] = df["Date"].dt.year
+    df["Month"] = df["Date"].dt.strftime('%B')
+    # Amounts in paise; Variance is taken on the int64 values, before the int32 downcast
+    for col in CVR_AMOUNTS:
+        df[col] = to_paise(df[col])
+    df["Variance"] = df["Actual Cash Sales"] - df["Expected Cash Sales"]
+    for col in CVR_AMOUNTS + ["Variance"]:
+        df[col] = downcast(df[col])
+    return df
+
+def _read_csv(paths):
+    return pd.read_csv(paths[0])
+
+def _read_foodcost(paths):
+    df = pd.read_csv(paths[0])
+    # Remove ₹ symbol and commas; these are food cost percentages, so they stay float, not paise
+    for col in ['Ideal Cost', 'Actual Cost', 'Variance']:
+        df[col] = parse_amount(df[col])
+    df['Month'] = df['Month'].astype(str)
+    return df
+
+def _read_inventory(paths):
+    df = pd.read_csv(paths[0])
+    df['Month'] = df['Month'].astype(str)
+    # Stock values in paise (money.py); Price stays a rupee rate per unit
+    return money_columns(df, ['Ideal Closing stock Value', 'Actual Closing stock Value', 'Variance'])
+
+SWIGGY_ORDER_COLUMNS = ['Order Date', 'Order Status', 'Order ID', 'Total Customer Paid']
+
+def _read_swiggy_order_file(path):
+    # 'Order Level' sheet of one invoice annexure; header on row 3, columns matched loosely
+    df = pd.read_excel(path, sheet_name='Order Level', skiprows=2)
+    matched_columns = [
+        next((col for col in df.columns if keyword.lower() in str(col).lower()), None)
+        for keyword in SWIGGY_ORDER_COLUMNS
+    ]
+    if None in matched_columns:
+        raise ValueError(f"missing columns {[k for k, c in zip(SWIGGY_ORDER_COLUMNS, matched_columns) if c is None]}")
+
+    df_filtered = df[matched_columns].copy()
+    df_filtered.columns = SWIGGY_ORDER_COLUMNS
+    df_filtered['Order Date'] = pd.to_datetime(df_filtered['Order Date'], errors='coerce')
+    df_filtered['Total Customer Paid'] = pd.to_numeric(df_filtered['Total Customer Paid'], errors='coerce')
+    restaurant = re.search(r'Annexure_(\d+)_', os.path.basename(path))
+    df_filtered['Restaurant ID'] = restaurant.group(1) if restaurant else ''
+    return df_filtered
+
+def _read_swiggy_sales(paths):
+    pos_file, mapping_file = paths
+    pos_df = pd.read_excel(pos_file, usecols=['Deployment', 'Order Id', 'Bill Date', 'Gross Bill Amount', 'Source'])
+    map_df = pd.read_excel(mapping_file, usecols=['Restaurant ID', 'Deployment'])
+    # Unreadable dates and amounts become NaT/NaN and are quarantined below, not a load error
+    pos_df['Bill Date'] = pd.to_datetime(pos_df['Bill Date'], errors='coerce')
+    pos_df['Gross Bill Amount'] = pd.to_numeric(pos_df['Gross Bill Amount'], errors='coerce')
+
+    pos_df['Deployment'] = pos_df['Deployment'].astype(str).str.strip()
+    map_df['Deployment'] = map_df['Deployment'].astype(str).str.strip()
+    map_df['Restaurant ID'] = map_df['Restaurant ID'].astype(str).str.strip()
+
+    merged_df = pos_df.merge(map_df[['Restaurant ID', 'Deployment']], how='left', on='Deployment')
+    merged_df.rename(columns={'Deployment': 'Location'}, inplace=True)
+
+    merged_df['Year'] = merged_df['Bill Date'].dt.year
+    merged_df['Month'] = merged_df['Bill Date'].dt.month
+    merged_df['MonthName'] = merged_df['Bill Date'].dt.strftime('%B')
+    # Rows failing validation.py's checks are tagged; 'Source' (the cleaner's input file) is kept
+    return flag_rows(merged_df, swiggy_sales_rules(merged_df))
+
+
+# --- Registry ---
+CVR_AMOUNTS = [
+    'Total Sales', 'Swiggy', 'Zomato', 'Card Sales', 'UPI', 'Dineout', 'Zomato Pro', 'Expenses',
+    'Expected Cash Sales', 'Actual Cash Sales'
+]
+SALES_COLUMNS = ['Date', 'Tabs', 'Sale', 'Discount', 'Net Sale', 'Charges', 'Total Tax', 'Gross Amount', 'Outlet Name']
+INVENTORY_COLUMNS = [
+    'Year', 'Month', 'Location', 'Item', 'UOM', 'Price', 'Opening Stock (Qty)', 'Purchases (Qty)',
+    'Consumption (Qty)', 'Ideal Closing Stock', 'Actual Closing Stock',
+    'Ideal Closing stock Value', 'Actual Closing stock Value', 'Variance'
+]
+
+# One partition per tabwise export; a new or changed file re-reads only that file
+register_dataset(
+    'sales_ingest', directory='Input files', partition_loader='web_sales:load_sales_file', schema=SALES_COLUMNS
+)
+# Reports read the rows that passed validation.py's checks; the rest are kept for review
+# (future dates are checked here, at read time, so both rebuild daily)
+register_dataset('sales', passed_loader(sales_read_rules), depends_on=['sales_ingest'], invalidation='daily')
+register_dataset(
+    'sales_quarantine', quarantine_loader('sales', sales_read_rules), depends_on=['sales_ingest'], invalidation='daily'
+)
+register_dataset('sales_daily', 'web_sales:daily_sales', depends_on=['sales'])
+register_facets(
+    'sales', ['Year', 'Month', 'Outlet Name', 'Week', 'Day'],
+    order={'Month': 'Month_Num', 'Week': 'Week_Start', 'Day': 'Date'}
+)
+# Extends the stored forecast fit with the new days (forecast.py; refitted nightly)
+register_dataset('sales_forecast', 'forecast:sales_forecast', depends_on=['sales_daily'])
+
+register_dataset(
+    'pnl', _read_pnl, sources=['PnL.csv'],
+    schema=['Year', 'Month', 'Location', 'Category', 'Sub-Category', 'Super-Sub-Category', 'Amount']
+)
+register_facets('pnl', ['Year', 'Month', 'Location'])
+register_dataset(
+    'cvr', _read_cvr, sources=['CVR.csv'],
+    schema=['Date', 'Location', 'Expected Cash Sales', 'Actual Cash Sales', 'Variance']
+)
+register_facets('cvr', ['Year', 'Month', 'Location'])
+register_dataset(
+    'dish', _read_csv, sources=['dish.csv'],
+    schema=['Outlet', 'Year', 'Month', 'Item Name', 'Cost Price', 'Selling Price', 'Selling Qty']
+)
+register_facets('dish', ['Outlet', 'Year', 'Month'])
+
+register_dataset(
+    'foodcost', _read_foodcost,
+    sources=[('foodcost_category.csv', 'Food cost analysis/foodcost_inputs/foodcost_category.csv')],
+    schema=['Year', 'Month', 'Location', 'Category', 'Ideal Cost', 'Actual Cost', 'Variance']
+)
+register_dataset('foodcost_cube', 'ideal_vs_actual:build_foodcost_cube', depends_on=['foodcost'])
+register_facets('foodcost_cube', ['Year', 'Month', 'Location'], weight='Rows')
+
+register_dataset(
+    'inventory', _read_inventory,
+    sources=[('inventory_loss.csv', 'Food cost analysis/foodcost_inputs/inventory_loss.csv')],
+    schema=INVENTORY_COLUMNS
+)
+register_dataset('inventory_agg', 'inventory_data:aggregate_inventory', depends_on=['inventory'])
+register_dataset('inventory_ledger', 'inventory_ledger:build_ledger', depends_on=['inventory_agg'])
+register_facets('inventory_agg', ['Year', 'Month', 'Location'])
+
+SWIGGY_MAPPING = ('Reconciliations/Swiggy/output files/swiggy_mapping_table.xlsx', 'output files/swiggy_mapping_table.xlsx')
+register_dataset(
+    'swiggy_sales_ingest', _read_swiggy_sales,
+    sources=[
+        ('Reconciliations/Swiggy/output files/swiggy_pos.xlsx', 'output files/swiggy_pos.xlsx'),
+        SWIGGY_MAPPING,
+    ],
+    schema=['Location', 'Order Id', 'Bill Date', 'Gross Bill Amount', 'Restaurant ID']
+)
+# The reconciliation reads the bills that passed validation.py's checks (future dates at read time)
+register_dataset(
+    'swiggy_sales', passed_loader(swiggy_sales_read_rules), depends_on=['swiggy_sales_ingest'], invalidation='daily'
+)
+register_dataset(
+    'swiggy_sales_quarantine', quarantine_loader('swiggy_sales', swiggy_sales_read_rules),
+    depends_on=['swiggy_sales_ingest'], invalidation='daily'
+)
+register_dataset('swiggy_weekly', 'swiggy_reconciliation:assign_week_label', depends_on=['swiggy_sales'])
+register_facets(
+    'swiggy_weekly', ['Year', 'MonthName', 'WeekLabel', 'Location'],
+    order={'MonthName': 'Month'}
+)
+
+# One partition per weekly invoice annexure under swiggy_input/<Month>/; a drop there
+# re-reads only that file. Month folders are often empty, which loads as no rows
+register_dataset(
+    'swiggy_orders', directory='Reconciliations/Swiggy/swiggy_input', extensions=('.xlsx', '.xls'),
+    partition_loader=_read_swiggy_order_file, schema=SWIGGY_ORDER_COLUMNS + ['Restaurant ID'], allow_empty=True
+)
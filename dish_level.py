@@ -1,28 +1,13 @@
 import streamlit as st
-import pandas as pd
+from table_view import render_table
+from datasets import get_dataset
+from perf import instrument, stage
+from result_cache import memoize
+from facets import facet_values, keep_valid
 
-def main():
-    st.title("🍽️ Dish Level Costing Report")
-
-    # Load data
-    @st.cache_data
-    def load_data():
-        return pd.read_csv("dish.csv")
-    
-    df = load_data()
-
-    # Sidebar filters
-    st.sidebar.header("🔎 Filter Options")
-    outlet_list = ["All"] + sorted(df["Outlet"].dropna().unique())
-    year_list = ["All"] + sorted(df["Year"].dropna().unique())
-    month_list = ["All"] + sorted(df["Month"].dropna().unique())
-
-    selected_outlet = st.sidebar.selectbox("Select Outlet", outlet_list)
-    selected_year = st.sidebar.selectbox("Select Year", year_list)
-    selected_month = st.sidebar.selectbox("Select Month", month_list)
-
-    # Apply filters
-    filtered_df = df.copy()
+# --- Item-wise cost and margin for one selection (no widgets); None when nothing matches ---
+def dish_costing(df, selected_outlet, selected_year, selected_month):
+    filtered_df = df
 
     if selected_outlet != "All":
         filtered_df = filtered_df[filtered_df["Outlet"] == selected_outlet]
@@ -34,10 +19,10 @@ def main():
         filtered_df = filtered_df[filtered_df["Month"] == selected_month]
 
     if filtered_df.empty:
-        st.warning("No data available for selected filters.")
-        return
+        return None
 
     # Calculations
+    filtered_df = filtered_df.copy()
     filtered_df["Total Cost"] = filtered_df["Selling Qty"] * filtered_df["Cost Price"]
     filtered_df["Total Revenue"] = filtered_df["Selling Qty"] * filtered_df["Selling Price"]
     filtered_df["% of Cost"] = (filtered_df["Total Cost"] / filtered_df["Total Revenue"]) * 100
@@ -46,8 +31,54 @@ def main():
     # Summary cards
     total_cost = filtered_df["Total Cost"].sum()
     total_revenue = filtered_df["Total Revenue"].sum()
-    food_cost_pct = (total_cost / total_revenue * 100) if total_revenue != 0 else 0
+    cards = {
+        'total_cost': total_cost,
+        'total_revenue': total_revenue,
+        'food_cost_pct': (total_cost / total_revenue * 100) if total_revenue != 0 else 0,
+    }
+
+    table_df = filtered_df[[
+        "Item Name", "Cost Price", "Selling Qty", "Total Cost", "Total Revenue", "% of Cost", "% of Margin"
+    ]]
+    return cards, table_df
+
+@memoize('dish_level', datasets=['dish'])
+def dish_report(selected_outlet, selected_year, selected_month):
+    return dish_costing(get_dataset('dish'), selected_outlet, selected_year, selected_month)
 
+@instrument('dish_level')
+def main():
+    st.title("🍽️ Dish Level Costing Report")
+
+    # Sidebar filters (cascading; the first lookup loads the data)
+    stage('filter')
+    st.sidebar.header("🔎 Filter Options")
+    outlet_list = ["All"] + facet_values('dish', 'Outlet')
+    keep_valid("dish_outlet", outlet_list)
+    selected_outlet = st.sidebar.selectbox("Select Outlet", outlet_list, key="dish_outlet")
+
+    year_list = ["All"] + facet_values('dish', 'Year', {'Outlet': selected_outlet})
+    keep_valid("dish_year", year_list)
+    selected_year = st.sidebar.selectbox("Select Year", year_list, key="dish_year")
+
+    month_list = ["All"] + facet_values('dish', 'Month', {'Outlet': selected_outlet, 'Year': selected_year})
+    keep_valid("dish_month", month_list)
+    selected_month = st.sidebar.selectbox("Select Month", month_list, key="dish_month")
+
+    # Apply filters and cost calculations (memoized)
+    stage('aggregate')
+    report = dish_report(selected_outlet, selected_year, selected_month)
+    if report is None:
+        st.warning("No data available for selected filters.")
+        return
+
+    cards, table_df = report
+    total_cost = cards['total_cost']
+    total_revenue = cards['total_revenue']
+    food_cost_pct = cards['food_cost_pct']
+
+    # Summary cards
+    stage('render')
     col1, col2, col3 = st.columns(3)
     col1.metric("💰 Total Cost Value", f"₹{total_cost:,.0f}")
     col2.metric("📈 Total Revenue", f"₹{total_revenue:,.0f}")
@@ -56,15 +87,14 @@ def main():
     # Table
     st.markdown("### 📋 Item-wise Food Cost Details")
 
-    table_df = filtered_df[[
-        "Item Name", "Cost Price", "Selling Qty", "Total Cost", "Total Revenue", "% of Cost", "% of Margin"
-    ]].copy()
-
-    # Format percentage columns as strings with exact two decimals (not rounded early)
-    table_df["% of Cost"] = table_df["% of Cost"].apply(lambda x: f"{x:.2f}%")
-    table_df["% of Margin"] = table_df["% of Margin"].apply(lambda x: f"{x:.2f}%")
-
-    st.dataframe(table_df.sort_values(by="Total Revenue", ascending=False), use_container_width=True)
+    # Percentages keep full precision for sorting; two decimals only on the visible page
+    render_table(
+        table_df,
+        key="dish_level",
+        formats={"% of Cost": "{:.2f}%", "% of Margin": "{:.2f}%"},
+        default_sort="Total Revenue",
+        ascending=False
+    )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,118 @@
+import os
+import glob
+import pickle
+import hashlib
+import threading
+from metrics import inc, gauge_callback
+
+# === Results and datasets persisted across restarts ===
+# Expensive artifacts (processed datasets, memoized report results) are pickled
+# under RESULT_CACHE_DIR, keyed by the code version and the caller's key (which
+# carries the source file fingerprints). A restarted server finds them there
+# instead of re-reading Input files/ and the Swiggy workbooks. The folder is
+# bounded by RESULT_CACHE_DISK_MB; the least recently used files go first.
+# RESULT_CACHE_DIR= (empty) turns it off.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get('RESULT_CACHE_DIR', os.path.join(BASE_DIR, '.result_cache'))
+MAX_DISK_BYTES = int(float(os.environ.get('RESULT_CACHE_DISK_MB', 1024)) * 1024 * 1024)
+# Results quicker than this to compute are not worth a file
+MIN_SECONDS = float(os.environ.get('RESULT_CACHE_DISK_MIN_SECONDS', 0.05))
+
+_lock = threading.Lock()
+
+
+# --- Hash of the app's modules: any code change starts a fresh cache ---
+def _code_version():
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(BASE_DIR, '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(os.path.basename(path).encode('utf-8'))
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+CODE_VERSION = _code_version()
+
+
+def _path(namespace, key):
+    digest = hashlib.sha1(repr((CODE_VERSION, key)).encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, namespace, f'{digest}.pkl')
+
+
+# --- (True, value) from disk, or (False, None) ---
+def disk_get(namespace, key):
+    if not CACHE_DIR:
+        return False, None
+    path = _path(namespace, key)
+    try:
+        with open(path, 'rb') as f:
+            value = pickle.load(f)
+    except FileNotFoundError:
+        inc('dashboard_disk_cache_requests_total', {'namespace': namespace, 'result': 'miss'})
+        return False, None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        # Truncated or from an incompatible library version; recomputed and rewritten
+        inc('dashboard_disk_cache_requests_total', {'namespace': namespace, 'result': 'error'})
+        return False, None
+    try:
+        # Access time for eviction; mtime because atime is often not updated
+        os.utime(path)
+    except OSError:
+        pass
+    inc('dashboard_disk_cache_requests_total', {'namespace': namespace, 'result': 'hit'})
+    return True, value
+
+
+def disk_put(namespace, key, value):
+    if not CACHE_DIR:
+        return False
+    path = _path(namespace, key)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    _evict()
+    return True
+
+
+def _files():
+    files = []
+    for path in glob.glob(os.path.join(CACHE_DIR, '*', '*.pkl')):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    return files
+
+
+# --- Drop least recently used files until the folder fits its budget ---
+def _evict():
+    with _lock:
+        files = sorted(_files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= MAX_DISK_BYTES:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                inc('dashboard_disk_cache_evictions_total')
+            except OSError:
+                pass
+
+
+def disk_usage():
+    if not CACHE_DIR:
+        return 0
+    return sum(size for _, size, _ in _files())
+
+
+gauge_callback('dashboard_disk_cache_bytes', disk_usage, 'Bytes held by the on-disk result cache.')
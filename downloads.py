@@ -0,0 +1,92 @@
+import io
+import importlib.util
+import tempfile
+import threading
+from collections import OrderedDict
+import streamlit as st
+
+CHUNK_ROWS = 50_000
+MAX_CACHED_EXPORTS = 32
+
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'XLSX': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+}
+FORMAT_MODULES = {'XLSX': 'openpyxl', 'Parquet': 'pyarrow'}
+
+_exports = OrderedDict()
+_exports_lock = threading.Lock()
+
+# --- Formats whose optional writer library is installed ---
+def available_formats(formats=tuple(EXPORT_FORMATS)):
+    return [
+        fmt for fmt in formats
+        if fmt not in FORMAT_MODULES or importlib.util.find_spec(FORMAT_MODULES[fmt]) is not None
+    ]
+
+# --- Chunked writers: each spools to a temp file instead of one big in-memory string ---
+def _write_csv(df, buffer):
+    text = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+    for start in range(0, max(len(df), 1), CHUNK_ROWS):
+        df.iloc[start:start + CHUNK_ROWS].to_csv(text, index=False, header=(start == 0))
+    text.flush()
+    text.detach()
+
+def _write_xlsx(df, buffer):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Report")
+    sheet.append([str(col) for col in df.columns])
+    for start in range(0, len(df), CHUNK_ROWS):
+        chunk = df.iloc[start:start + CHUNK_ROWS].astype(object).where(lambda c: c.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append(list(row))
+    workbook.save(buffer)
+
+def _write_parquet(df, buffer):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(buffer, schema) as writer:
+        for start in range(0, len(df), CHUNK_ROWS):
+            writer.write_table(pa.Table.from_pandas(df.iloc[start:start + CHUNK_ROWS], schema=schema, preserve_index=False))
+
+WRITERS = {'CSV': _write_csv, 'XLSX': _write_xlsx, 'Parquet': _write_parquet}
+
+def export_bytes(fingerprint, fmt, build_frame):
+    cache_key = (fingerprint, fmt)
+    with _exports_lock:
+        if cache_key in _exports:
+            _exports.move_to_end(cache_key)
+            return _exports[cache_key]
+
+    df = build_frame()
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as buffer:
+        WRITERS[fmt](df, buffer)
+        buffer.seek(0)
+        payload = buffer.read()
+
+    with _exports_lock:
+        _exports[cache_key] = payload
+        while len(_exports) > MAX_CACHED_EXPORTS:
+            _exports.popitem(last=False)
+    return payload
+
+# --- Download button whose payload is only generated when clicked ---
+# A fragment: switching the format reruns just the button
+@st.fragment
+def download_button(label, build_frame, file_stem, fingerprint, key, formats=tuple(EXPORT_FORMATS)):
+    options = available_formats(formats)
+    fmt = st.radio(f"{label} format", options, horizontal=True, key=f"{key}_format") if len(options) > 1 else options[0]
+    extension, mime = EXPORT_FORMATS[fmt]
+    st.download_button(
+        f"⬇️ {label} ({fmt})",
+        data=lambda: export_bytes(fingerprint, fmt, build_frame),
+        file_name=f"{file_stem}.{extension}",
+        mime=mime,
+        key=f"{key}_button",
+        on_click="ignore"
+    )
@@ -0,0 +1,80 @@
+import streamlit as st
+from datasets import FACETS, FACET_COUNT, get_dataset
+from result_cache import cached_result
+
+# === Cascading sidebar filters ===
+# Option lists come from a dataset's facet index (register_facets in datasets.py):
+# the distinct combinations of its filter columns with row counts, built once
+# per dataset version. The values offered for one dimension are those that occur
+# with the other selections, so a choice never leads to an empty report, and a
+# lookup filters a few thousand index rows instead of the dataset. Lookups are
+# memoized per selection.
+# The widgets are keyed, so a selection survives its options changing; values
+# no longer offered are dropped by keep_valid() before the widget is drawn.
+
+# Selections that leave a dimension open
+ALL = 'All'
+
+
+def _values(selection):
+    if selection is None or (isinstance(selection, str) and selection == ALL):
+        return ()
+    if isinstance(selection, (list, tuple, set, frozenset)):
+        # Sorted, so the same selection in any order shares one memoized lookup
+        return tuple(sorted(selection, key=repr))
+    return (selection,)
+
+
+# --- Values of `dimension` (in display order) with their row counts, given the other selections ---
+def facet_counts(dataset, dimension, selections=None):
+    # selections: {dimension: value or list of values}; None, 'All' and [] leave it open
+    constraints = tuple(sorted(
+        (dim, _values(selection)) for dim, selection in (selections or {}).items()
+        if dim != dimension and _values(selection)
+    ))
+    spec = FACETS[dataset]
+    return cached_result(
+        'facets', [spec['dataset']], (dataset, dimension, constraints),
+        lambda: _counts(spec, dimension, constraints)
+    )
+
+
+def _counts(spec, dimension, constraints):
+    index = get_dataset(spec['dataset'])
+    mask = index[dimension].notna().to_numpy()
+    for dim, values in constraints:
+        mask = mask & index[dim].isin(values).to_numpy()
+    matched = index[mask]
+
+    counts = matched.groupby(dimension)[FACET_COUNT].sum()
+    order_col = spec['order'].get(dimension)
+    if order_col:
+        counts = counts.reindex(matched.groupby(dimension)[order_col].min().sort_values(kind='stable').index)
+    return counts[counts > 0]
+
+
+def facet_values(dataset, dimension, selections=None):
+    return facet_counts(dataset, dimension, selections).index.tolist()
+
+
+# --- Drop a keyed widget's values that are no longer among its options ---
+def keep_valid(key, options, default=None):
+    # default: initial value (set here, not on the widget) and fallback once nothing valid is left
+    if key not in st.session_state:
+        if default is not None:
+            st.session_state[key] = default
+        return
+    value = st.session_state[key]
+    if isinstance(value, list):
+        kept = [v for v in value if v in options]
+        if len(kept) == len(value):
+            return
+        value = kept or default
+    elif value in options:
+        return
+    else:
+        value = default
+    if value is None:
+        del st.session_state[key]
+    else:
+        st.session_state[key] = value
@@ -0,0 +1,92 @@
+import os
+import time
+import threading
+from collections import deque
+from datasets import DATASETS, BASE_DIR, resolve_sources, invalidate, dependents, file_stamp
+from prewarm import start_prewarm
+
+# === Polling file watcher ===
+# Every WATCH_INTERVAL seconds the source files of each base dataset are
+# stat'ed. New, changed and deleted files drop only their own partitions (and
+# the derived datasets built on them), which are then rebuilt in the background.
+
+WATCH_INTERVAL = float(os.environ.get('WATCH_INTERVAL', 5))
+
+_snapshots = {}
+_events = deque(maxlen=50)
+_lock = threading.Lock()
+_thread = None
+
+
+def _scan_sources(name):
+    try:
+        return {path: file_stamp(path) for path in resolve_sources(name)}
+    except FileNotFoundError:
+        return {}
+
+
+# --- Compare one dataset's sources with the previous scan ---
+def _diff(before, after):
+    added = [path for path in after if path not in before]
+    deleted = [path for path in before if path not in after]
+    changed = [path for path in after if path in before and after[path] != before[path]]
+    return added, changed, deleted
+
+
+def check_once():
+    refreshed = []
+    for name, spec in DATASETS.items():
+        if spec['depends_on'] or spec['invalidation'] == 'never':
+            continue
+        current = _scan_sources(name)
+        with _lock:
+            previous = _snapshots.get(name)
+            _snapshots[name] = current
+        if previous is None:
+            continue
+
+        added, changed, deleted = _diff(previous, current)
+        if not (added or changed or deleted):
+            continue
+
+        affected_paths = changed + deleted if spec['partition_loader'] else None
+        invalidate(name, paths=affected_paths)
+        refreshed.extend([name] + dependents(name))
+        with _lock:
+            for kind, paths in (('added', added), ('changed', changed), ('deleted', deleted)):
+                for path in paths:
+                    _events.append({
+                        'time': time.time(),
+                        'dataset': name,
+                        'kind': kind,
+                        'path': os.path.relpath(path, BASE_DIR),
+                    })
+
+    if refreshed:
+        start_prewarm(list(dict.fromkeys(refreshed)))
+    return refreshed
+
+
+def _run():
+    while True:
+        try:
+            check_once()
+        except Exception:
+            pass
+        time.sleep(WATCH_INTERVAL)
+
+
+# --- Start the polling thread once per server process ---
+def start_watcher():
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_run, name='file-watcher', daemon=True)
+        _thread.start()
+
+
+def recent_events(seconds=300):
+    cutoff = time.time() - seconds
+    with _lock:
+        return [event for event in _events if event['time'] >= cutoff]
@@ -0,0 +1,308 @@
+import os
+import sys
+import time
+import pickle
+import argparse
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+from money import to_rupees
+
+# === Sales forecast per outlet × tab ===
+# Every outlet × tab series of daily sales is fitted with the same regression:
+# level + trend, day of week and annual seasonality (Fourier terms), with older
+# days weighted down exponentially (FORECAST_HALF_LIFE_DAYS). All series share
+# the design matrix, so a fit is kept as per-series sufficient statistics
+# (XᵀWX, XᵀWy, yᵀWy and their lag-1 counterparts for the residual
+# autocorrelation), built for every series with one matrix product and solved
+# as one batched linear system. On top of the regression, the recent residuals
+# (exponentially smoothed, FORECAST_LEVEL_HALF_LIFE_DAYS) shift the level, so a
+# step change shows up in the forecast within a couple of weeks.
+#
+# A refit decays the stored statistics and adds only the days since the last
+# one; the state lives in FORECAST_STATE between runs. If any day already
+# fitted has changed (a re-exported file), the fit starts over from the whole
+# history. `python forecast.py` is the nightly refit and the only writer of the
+# state; the dashboard extends it in memory with the days since.
+#
+#   python forecast.py [--full] [--weeks 12] [--out forecast.csv]
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.environ.get('FORECAST_STATE', os.path.join(BASE_DIR, 'output files', 'forecast', 'state.pkl'))
+HALF_LIFE_DAYS = float(os.environ.get('FORECAST_HALF_LIFE_DAYS', 120))
+HARMONICS = 6
+LEVEL_HALF_LIFE_DAYS = float(os.environ.get('FORECAST_LEVEL_HALF_LIFE_DAYS', 14))
+# Pulls trend and seasonal terms of short series towards the level (about a week of data)
+RIDGE = 7.0
+WEEK_RANGE = (4, 12)
+INTERVAL = 0.8
+# Series with less history, or no sales in the last DORMANT_DAYS, are not forecast
+MIN_DAYS = 28
+DORMANT_DAYS = 56
+
+SERIES_KEYS = ['Outlet Name', 'Tabs']
+ORIGIN = pd.Timestamp('2020-01-01')
+# A stored state fitted with other settings is refitted from scratch
+MODEL = ('v1', HALF_LIFE_DAYS, HARMONICS, LEVEL_HALF_LIFE_DAYS)
+DECAY = 0.5 ** (1 / HALF_LIFE_DAYS)
+LEVEL_DECAY = 0.5 ** (1 / LEVEL_HALF_LIFE_DAYS)
+Z = NormalDist().inv_cdf(0.5 + INTERVAL / 2)
+
+
+# --- Features of each day (days since ORIGIN): level, trend in years, Tue..Sun, annual harmonics ---
+def design(days):
+    days = np.asarray(days, dtype=float)
+    dow = (days.astype(np.int64) + ORIGIN.dayofweek) % 7
+    columns = [np.ones_like(days), days / 365.25]
+    columns += [(dow == d).astype(float) for d in range(1, 7)]
+    phase = 2 * np.pi * days / 365.25
+    for k in range(1, HARMONICS + 1):
+        columns += [np.sin(k * phase), np.cos(k * phase)]
+    return np.column_stack(columns)
+
+
+def _day_numbers(dates):
+    return (pd.DatetimeIndex(dates) - ORIGIN).days.to_numpy()
+
+
+# --- Fingerprint of the rows already fitted; order-independent ---
+def history_hash(daily):
+    rows = daily[['Date'] + SERIES_KEYS].assign(**{'Sales Value': daily['Sales Value'].astype('int64')})
+    return int(pd.util.hash_pandas_object(rows, index=False).to_numpy().sum())
+
+
+def _empty_state(through, p):
+    return {
+        'model': MODEL, 'through': through, 'series': [], 'first': np.zeros(0, dtype=np.int64),
+        'last': np.zeros(0, dtype=np.int64), 'days': np.zeros(0), 'last_y': np.zeros(0),
+        'A': np.zeros((0, p, p)), 'b': np.zeros((0, p)), 'c': np.zeros(0), 'n': np.zeros(0), 'n2': np.zeros(0),
+        'L': np.zeros((0, p, p)), 'bx': np.zeros((0, p)), 'by': np.zeros((0, p)), 'cl': np.zeros(0), 'nl': np.zeros(0),
+        'sx': np.zeros((0, p)), 'sy': np.zeros(0), 'sn': np.zeros(0), 'sn2': np.zeros(0),
+    }
+
+
+def _grow(state, new_series):
+    # New series start with zero statistics
+    count = len(new_series)
+    for key, value in state.items():
+        if isinstance(value, np.ndarray):
+            state[key] = np.concatenate([value, np.zeros((count,) + value.shape[1:], dtype=value.dtype)])
+    state['series'] = state['series'] + new_series
+
+
+# --- Fit (or extend the stored fit) through the last day of `daily` ---
+def update_state(state, daily):
+    daily = daily[daily['Sales Value'] != 0]
+    days = _day_numbers(daily['Date'])
+    through = int(days.max())
+    p = design([0]).shape[1]
+
+    refit = 'incremental refit'
+    if (state is None or state['model'] != MODEL or state['through'] > through
+            or state['history'] != history_hash(daily[days <= state['through']])):
+        state = _empty_state(int(days.min()) - 1, p)
+        refit = 'full refit'
+    else:
+        state = dict(state)
+        if state['through'] == through:
+            state['refit'] = 'already up to date'
+            return state
+
+    new = days > state['through']
+    block = daily[new]
+    block_days = days[new] - state['through']
+    span = through - state['through']
+
+    # Dense day × series block; row 0 is the last day already fitted (for the lag pairs)
+    keys = pd.MultiIndex.from_frame(block[SERIES_KEYS])
+    known = {series: i for i, series in enumerate(state['series'])}
+    new_series = sorted(set(keys) - set(known))
+    _grow(state, new_series)
+    known.update({series: len(known) + i for i, series in enumerate(new_series)})
+    columns = np.array([known[series] for series in keys], dtype=np.int64)
+    Y = np.zeros((span + 1, len(state['series'])))
+    np.add.at(Y, (block_days, columns), to_rupees(block['Sales Value'].to_numpy(dtype=float)))
+    Y[0] = state['last_y']
+
+    # First and last day with sales per series
+    seen = Y[1:] != 0
+    has_sales = seen.any(axis=0)
+    first_new = state['through'] + 1 + seen.argmax(axis=0)
+    last_new = state['through'] + span - seen[::-1].argmax(axis=0)
+    is_new = np.arange(len(state['series'])) >= len(state['series']) - len(new_series)
+    state['first'] = np.where(is_new & has_sales, first_new, state['first'])
+    state['last'] = np.where(has_sales, last_new, state['last'])
+
+    # Weights: exponential decay from `through`, zero before a series' first sale
+    day_numbers = state['through'] + np.arange(span + 1)
+    active = day_numbers[:, None] >= state['first'][None, :]
+    W = np.where(active, DECAY ** (through - day_numbers)[:, None], 0.0)
+    X = design(day_numbers)
+    outer = (X[:, :, None] * X[:, None, :]).reshape(len(X), -1)
+    lagged = (X[1:, :, None] * X[:-1, None, :]).reshape(len(X) - 1, -1)
+    S = len(state['series'])
+
+    # Statistics so far lose weight as the window moves on by `span` days
+    decay = DECAY ** span
+    for key in ('A', 'b', 'c', 'n', 'L', 'bx', 'by', 'cl', 'nl'):
+        state[key] = state[key] * decay
+    state['n2'] = state['n2'] * decay ** 2
+    for key in ('sx', 'sy', 'sn'):
+        state[key] = state[key] * LEVEL_DECAY ** span
+    state['sn2'] = state['sn2'] * LEVEL_DECAY ** (2 * span)
+
+    w, y = W[1:], Y[1:]
+    wl = np.where(active[:-1], w, 0.0)
+    state['A'] = state['A'] + (w.T @ outer[1:]).reshape(S, p, p)
+    state['b'] = state['b'] + (w * y).T @ X[1:]
+    state['c'] = state['c'] + (w * y * y).sum(axis=0)
+    state['n'] = state['n'] + w.sum(axis=0)
+    state['n2'] = state['n2'] + (w * w).sum(axis=0)
+    state['days'] = state['days'] + active[1:].sum(axis=0)
+    # Lag-1 pairs (day, previous day) where both days are active
+    state['L'] = state['L'] + (wl.T @ lagged).reshape(S, p, p)
+    state['bx'] = state['bx'] + (wl * Y[:-1]).T @ X[1:]
+    state['by'] = state['by'] + (wl * y).T @ X[:-1]
+    state['cl'] = state['cl'] + (wl * y * Y[:-1]).sum(axis=0)
+    state['nl'] = state['nl'] + wl.sum(axis=0)
+    # Short-memory sums for the smoothed residual level
+    ws = np.where(active[1:], LEVEL_DECAY ** (through - day_numbers[1:])[:, None], 0.0)
+    state['sx'] = state['sx'] + ws.T @ X[1:]
+    state['sy'] = state['sy'] + (ws * y).sum(axis=0)
+    state['sn'] = state['sn'] + ws.sum(axis=0)
+    state['sn2'] = state['sn2'] + (ws * ws).sum(axis=0)
+
+    state['last_y'] = Y[-1]
+    state['through'] = through
+    state['history'] = history_hash(daily)
+    state['refit'] = refit
+    return state
+
+
+# --- Coefficients, their inverse normal matrix, residual variance, lag-1 autocorrelation,
+# and the daily level shift (smoothed recent residual) with its variance ---
+def solve(state):
+    A, b = state['A'], state['b']
+    p = A.shape[-1]
+    penalty = np.diag(np.r_[0.0, np.full(p - 1, RIDGE)])
+    inverse = np.linalg.inv(A + penalty)
+    beta = np.einsum('sij,sj->si', inverse, b)
+
+    def quad(M, u, v):
+        return np.einsum('si,sij,sj->s', u, M, v)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rss = state['c'] - 2 * (beta * b).sum(axis=1) + quad(A, beta, beta)
+        n_eff = state['n'] ** 2 / state['n2']
+        sigma2 = np.maximum(rss, 0) / state['n'] * n_eff / np.maximum(n_eff - p, 1)
+        lag_rss = (state['cl'] - (beta * state['bx']).sum(axis=1) - (beta * state['by']).sum(axis=1)
+                   + quad(state['L'], beta, beta))
+        rho = lag_rss / state['nl'] / (np.maximum(rss, 0) / state['n'])
+        level = (state['sy'] - (beta * state['sx']).sum(axis=1)) / state['sn']
+        level_var = sigma2 * state['sn2'] / state['sn'] ** 2
+    # Negative autocorrelation would narrow the intervals; it is not trusted
+    rho = np.clip(np.nan_to_num(rho), 0, 0.95)
+    level_var = np.nan_to_num(level_var) * (1 + rho) / (1 - rho)
+    return beta, inverse, np.nan_to_num(sigma2), rho, np.nan_to_num(level), level_var
+
+
+# --- Variance factor of a sum of m consecutive AR(1) errors, per series ---
+def _sum_factor(m, rho):
+    k = np.arange(1, m)
+    return m + 2 * ((m - k) * rho[:, None] ** k).sum(axis=1)
+
+
+# --- Weekly forecast for the full Monday-based weeks after the last day fitted ---
+# Std Error is the week's own; Cumulative Std Error is that of the total from the
+# first forecast week through this one (weeks share the coefficient errors).
+def forecast_frame(state, weeks=WEEK_RANGE[1]):
+    columns = SERIES_KEYS + ['Week_Start', 'Forecast', 'Std Error', 'Cumulative Std Error']
+    through = state['through']
+    live = (state['days'] >= MIN_DAYS) & (state['last'] > through - DORMANT_DAYS)
+    if not live.any():
+        return pd.DataFrame(columns=columns)
+
+    beta, inverse, sigma2, rho, level, level_var = solve(state)
+    start = through + 1 + (-(through + 1 + ORIGIN.dayofweek)) % 7
+    future = start + np.arange(weeks * 7)
+    p = beta.shape[1]
+    weekly_x = design(future).reshape(weeks, 7, p).sum(axis=1)
+    cumulative_x = weekly_x.cumsum(axis=0)
+
+    mean = beta @ weekly_x.T + 7 * level[:, None]
+    # Noise of the days summed (AR(1) errors) plus the uncertainty of the coefficients and the level
+    days_ahead = 7 * np.arange(1, weeks + 1)
+    variance = ((sigma2 * _sum_factor(7, rho) + 49 * level_var)[:, None]
+                + sigma2[:, None] * np.einsum('wi,sij,wj->sw', weekly_x, inverse, weekly_x))
+    noise = np.column_stack([sigma2 * _sum_factor(m, rho) for m in days_ahead])
+    cumulative = (noise + level_var[:, None] * days_ahead ** 2
+                  + sigma2[:, None] * np.einsum('wi,sij,wj->sw', cumulative_x, inverse, cumulative_x))
+
+    series = [series for series, keep in zip(state['series'], live) if keep]
+    frame = pd.DataFrame(series * weeks, columns=SERIES_KEYS)
+    frame['Week_Start'] = np.repeat(ORIGIN + pd.to_timedelta(start + 7 * np.arange(weeks), unit='D'), len(series))
+    frame['Forecast'] = np.maximum(mean[live].T.ravel(), 0)
+    frame['Std Error'] = np.sqrt(variance[live].T.ravel())
+    frame['Cumulative Std Error'] = np.sqrt(cumulative[live].T.ravel())
+    return frame[columns]
+
+
+# --- Stored state (FORECAST_STATE= (empty) keeps it in memory only) ---
+def load_state():
+    if not STATE_PATH:
+        return None
+    try:
+        with open(STATE_PATH, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+
+def save_state(state):
+    if not STATE_PATH:
+        return False
+    tmp_path = f'{STATE_PATH}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, STATE_PATH)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+
+# --- 'sales_forecast' dataset: extend the nightly fit with the new days (not saved) and forecast ---
+def sales_forecast(daily):
+    return forecast_frame(update_state(load_state(), daily))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refit the sales forecast of every outlet × tab series.")
+    parser.add_argument('--full', action='store_true', help="refit from the whole history, ignoring the stored state")
+    parser.add_argument('--weeks', type=int, default=WEEK_RANGE[1])
+    parser.add_argument('--out', help="write the weekly forecast to this CSV")
+    args = parser.parse_args(argv)
+
+    from datasets import get_dataset
+
+    daily = get_dataset('sales_daily')
+    started = time.perf_counter()
+    state = update_state(None if args.full else load_state(), daily)
+    save_state(state)
+    forecast = forecast_frame(state, args.weeks)
+    elapsed = time.perf_counter() - started
+
+    through = (ORIGIN + pd.Timedelta(days=state['through'])).date()
+    print(f"{len(state['series'])} series through {through}: {state['refit']} in {elapsed:.2f}s, "
+          f"{forecast[SERIES_KEYS].drop_duplicates().shape[0]} forecast")
+    if args.out:
+        forecast.to_csv(args.out, index=False)
+        print(f"→ {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
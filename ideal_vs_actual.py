@@ -1,130 +1,110 @@
 import streamlit as st
 import pandas as pd
-
+from downloads import download_button
+from datasets import get_dataset, dataset_version
+from result_cache import memoize
+from perf import instrument, stage
+from facets import facet_values, keep_valid
+
+COST_COLS = ['Ideal Cost', 'Actual Cost', 'Variance']
+CUBE_KEYS = ['Year', 'Month', 'Location', 'Category']
+
+# --- Build the food-cost cube once per dataset version ('foodcost_cube' dataset) ---
+def build_foodcost_cube(df):
+    # Sums and row counts per (year, month, location, category)
+    cube = df.groupby(CUBE_KEYS, as_index=False).agg(
+        **{col: (col, 'sum') for col in COST_COLS},
+        Rows=('Category', 'size')
+    )
+    return cube
+
+# --- Cards, location and category tables from the cube ---
+def food_cost_summary(cube, selected_year, selected_month, selected_location):
+    selection = cube[cube['Year'] == selected_year]
+    if selected_month != 'All':
+        selection = selection[selection['Month'] == selected_month]
+    if selected_location != 'All':
+        selection = selection[selection['Location'] == selected_location]
+
+    # Each outlet-month is weighted equally: total food cost % per cell
+    cells = selection.groupby(['Month', 'Location'])[COST_COLS + ['Rows']].sum()
+    cells = cells[cells['Rows'] > 0]
+    cell_count = len(cells)
+
+    if cell_count:
+        cards = cells[COST_COLS].mean()
+    else:
+        cards = pd.Series(0.0, index=COST_COLS)
+
+    loc_table = cells.groupby(level='Location')[COST_COLS].mean().reset_index()
+
+    cat_table = selection.groupby('Category')[COST_COLS].sum()
+    if cell_count:
+        cat_table = cat_table / cell_count
+    cat_table = cat_table.reset_index()
+
+    return cards, loc_table, cat_table
+
+@memoize('ideal_vs_actual', datasets=['foodcost_cube'])
+def food_cost_report(selected_year, selected_month, selected_location):
+    return food_cost_summary(get_dataset('foodcost_cube'), selected_year, selected_month, selected_location)
+
+@instrument('ideal_vs_actual')
 def main():
     st.title("📊 Ideal vs Actual Food Cost Analysis")
 
-    file_path = r"foodcost_category.csv"
-
     try:
-        df = pd.read_csv(file_path)
-
-        # Remove ₹ symbol and commas, convert to float
-        for col in ['Ideal Cost', 'Actual Cost', 'Variance']:
-            df[col] = df[col].replace({'₹': '', ',': ''}, regex=True).astype(float)
-
-        df['Month'] = df['Month'].astype(str)
-
-        # Sidebar Filters
-        years = sorted(df['Year'].dropna().unique())
-        selected_year = st.sidebar.selectbox("Select Year", years)
-
-        months = sorted(df[df['Year'] == selected_year]['Month'].dropna().unique())
-        selected_month = st.sidebar.selectbox("Select Month (optional)", ['All'] + months)
-
-        locations = sorted(df[df['Year'] == selected_year]['Location'].dropna().unique())
-        selected_location = st.sidebar.selectbox("Select Location (optional)", ['All'] + locations)
+        # Sidebar Filters (the first lookup loads the dataset)
+        stage('filter')
+        years = facet_values('foodcost_cube', 'Year')
+        keep_valid("foodcost_year", years)
+        selected_year = st.sidebar.selectbox("Select Year", years, key="foodcost_year")
 
-        # Filtered Data
-        filtered_df = df[df['Year'] == selected_year]
-        if selected_month != 'All':
-            filtered_df = filtered_df[filtered_df['Month'] == selected_month]
-        if selected_location != 'All':
-            filtered_df = filtered_df[filtered_df['Location'] == selected_location]
+        months = ['All'] + facet_values('foodcost_cube', 'Month', {'Year': selected_year})
+        keep_valid("foodcost_month", months)
+        selected_month = st.sidebar.selectbox("Select Month (optional)", months, key="foodcost_month")
 
-        # Card Calculations
-        if selected_month == 'All' and selected_location == 'All':
-            total_ideal = df[df['Year'] == selected_year]['Ideal Cost'].sum()
-            total_actual = df[df['Year'] == selected_year]['Actual Cost'].sum()
-            total_variance = df[df['Year'] == selected_year]['Variance'].sum()
+        locations = ['All'] + facet_values('foodcost_cube', 'Location', {'Year': selected_year, 'Month': selected_month})
+        keep_valid("foodcost_location", locations)
+        selected_location = st.sidebar.selectbox("Select Location (optional)", locations, key="foodcost_location")
 
-            month_count = df[df['Year'] == selected_year]['Month'].nunique()
-            location_count = df[df['Year'] == selected_year]['Location'].nunique()
-
-            ideal_cost = total_ideal / (month_count * location_count)
-            actual_cost = total_actual / (month_count * location_count)
-            variance = total_variance / (month_count * location_count)
-
-        elif selected_month != 'All' and selected_location == 'All':
-            total_ideal = df[(df['Year'] == selected_year) & (df['Month'] == selected_month)]['Ideal Cost'].sum()
-            total_actual = df[(df['Year'] == selected_year) & (df['Month'] == selected_month)]['Actual Cost'].sum()
-            total_variance = df[(df['Year'] == selected_year) & (df['Month'] == selected_month)]['Variance'].sum()
-
-            location_count = df[(df['Year'] == selected_year) & (df['Month'] == selected_month)]['Location'].nunique()
-
-            ideal_cost = total_ideal / location_count
-            actual_cost = total_actual / location_count
-            variance = total_variance / location_count
-
-        else:
-            ideal_cost = filtered_df['Ideal Cost'].sum()
-            actual_cost = filtered_df['Actual Cost'].sum()
-            variance = filtered_df['Variance'].sum()
+        stage('aggregate')
+        cards, loc_table, cat_table = food_cost_report(selected_year, selected_month, selected_location)
 
         # Display Cards
+        stage('render')
         col1, col2, col3 = st.columns(3)
-        col1.metric("Ideal Food Cost %", f"{ideal_cost:.2f}%")
-        col2.metric("Actual Food Cost %", f"{actual_cost:.2f}%")
-        col3.metric("Variance %", f"{variance:.2f}%")
+        col1.metric("Ideal Food Cost %", f"{cards['Ideal Cost']:.2f}%")
+        col2.metric("Actual Food Cost %", f"{cards['Actual Cost']:.2f}%")
+        col3.metric("Variance %", f"{cards['Variance']:.2f}%")
 
         # Location-wise Table
         st.subheader("📍 Location-wise Food Cost")
-        if selected_month == 'All' and selected_location == 'All':
-            month_count = df[df['Year'] == selected_year]['Month'].nunique()
-            loc_table = df[df['Year'] == selected_year].groupby('Location').agg({
-                'Ideal Cost': 'sum', 'Actual Cost': 'sum', 'Variance': 'sum'
-            }).reset_index()
-            loc_table['Ideal Cost'] = loc_table['Ideal Cost'] / month_count
-            loc_table['Actual Cost'] = loc_table['Actual Cost'] / month_count
-            loc_table['Variance'] = loc_table['Variance'] / month_count
-        elif selected_month != 'All' and selected_location == 'All':
-            loc_table = df[(df['Year'] == selected_year) & (df['Month'] == selected_month)].groupby('Location').agg({
-                'Ideal Cost': 'sum', 'Actual Cost': 'sum', 'Variance': 'sum'
-            }).reset_index()
-        else:
-            loc_table = filtered_df.groupby('Location').agg({
-                'Ideal Cost': 'sum', 'Actual Cost': 'sum', 'Variance': 'sum'
-            }).reset_index()
 
         # Format as % in table
-        for col in ['Ideal Cost', 'Actual Cost', 'Variance']:
+        for col in COST_COLS:
             loc_table[col] = loc_table[col].map(lambda x: f"{x:.2f}%")
         st.dataframe(loc_table)
 
         # Category-wise Table
         st.subheader("🍽️ Category-wise Food Cost")
-        if selected_month == 'All' and selected_location == 'All':
-            month_count = df[df['Year'] == selected_year]['Month'].nunique()
-            location_count = df[df['Year'] == selected_year]['Location'].nunique()
-            cat_table = df[df['Year'] == selected_year].groupby('Category').agg({
-                'Ideal Cost': 'sum', 'Actual Cost': 'sum', 'Variance': 'sum'
-            }).reset_index()
-            cat_table['Ideal Cost'] = cat_table['Ideal Cost'] / (month_count * location_count)
-            cat_table['Actual Cost'] = cat_table['Actual Cost'] / (month_count * location_count)
-            cat_table['Variance'] = cat_table['Variance'] / (month_count * location_count)
-        elif selected_month != 'All' and selected_location == 'All':
-            cat_table = df[(df['Year'] == selected_year) & (df['Month'] == selected_month)].groupby('Category').agg({
-                'Ideal Cost': 'sum', 'Actual Cost': 'sum', 'Variance': 'sum'
-            }).reset_index()
-
-            location_count = df[(df['Year'] == selected_year) & (df['Month'] == selected_month)]['Location'].nunique()
-            cat_table['Ideal Cost'] = cat_table['Ideal Cost'] / location_count
-            cat_table['Actual Cost'] = cat_table['Actual Cost'] / location_count
-            cat_table['Variance'] = cat_table['Variance'] / location_count
-        else:
-            cat_table = filtered_df.groupby('Category').agg({
-                'Ideal Cost': 'sum', 'Actual Cost': 'sum', 'Variance': 'sum'
-            }).reset_index()
 
         # Format as % in table
-        for col in ['Ideal Cost', 'Actual Cost', 'Variance']:
+        for col in COST_COLS:
             cat_table[col] = cat_table[col].map(lambda x: f"{x:.2f}%")
         st.dataframe(cat_table)
 
-        # Download Buttons
+        # Download Buttons (exports generated on click)
+        fingerprint = ("ideal_vs_actual", dataset_version('foodcost'), selected_year, selected_month, selected_location)
+
         def download_buttons(name, df_table):
-            csv = df_table.to_csv(index=False).encode('utf-8')
-            st.download_button(f"Download {name} CSV", csv, f"{name.lower().replace(' ', '_')}.csv", "text/csv")
+            download_button(
+                f"Download {name}",
+                lambda: df_table,
+                name.lower().replace(' ', '_'),
+                fingerprint=fingerprint + (name,),
+                key=f"{name.lower().replace(' ', '_')}_download"
+            )
 
         download_buttons("Location-wise Food Cost", loc_table)
         download_buttons("Category-wise Food Cost", cat_table)
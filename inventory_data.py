@@ -0,0 +1,90 @@
+import calendar
+import pandas as pd
+import numpy as np
+from facets import facet_values
+
+MONTH_NUMBERS = {name: num for num, name in enumerate(calendar.month_name) if name}
+
+AGG_KEYS = ['Item', 'UOM', 'Location', 'Year', 'Month']
+QTY_VALUE_COLS = [
+    'Opening Stock (Qty)', 'Purchases (Qty)', 'Consumption (Qty)',
+    'Ideal Closing Stock', 'Actual Closing Stock',
+    'Ideal Closing stock Value', 'Actual Closing stock Value', 'Variance'
+]
+
+# --- Aggregate shared by the Inventory Loss and Consumption reports ('inventory_agg' dataset) ---
+def aggregate_inventory(df):
+    # Per (item, UOM, location, month) sums; price kept as sum + count for exact means
+    agg = df.groupby(AGG_KEYS, as_index=False).agg(
+        **{col: (col, 'sum') for col in QTY_VALUE_COLS},
+        **{'Price Sum': ('Price', 'sum'), 'Price Count': ('Price', 'count')}
+    )
+    return agg
+
+# --- Sidebar option helpers (from the 'inventory_agg' facet index; 'All' leaves a filter open) ---
+def year_options():
+    return facet_values('inventory_agg', 'Year')
+
+def month_options(selected_year):
+    return facet_values('inventory_agg', 'Month', {'Year': selected_year})
+
+def location_options(selected_year, selected_month):
+    return facet_values('inventory_agg', 'Location', {'Year': selected_year, 'Month': selected_month})
+
+# --- Apply Year / Month / Location filters to the aggregate ---
+def filter_inventory(agg, selected_year, selected_month, selected_location):
+    mask = pd.Series(True, index=agg.index)
+    if selected_year != 'All':
+        mask &= agg['Year'] == selected_year
+    if selected_month != 'All':
+        mask &= agg['Month'] == selected_month
+    if selected_location != 'All':
+        mask &= agg['Location'] == selected_location
+    return agg[mask]
+
+# --- Roll the filtered aggregate up to one row per (Item, UOM) ---
+def item_totals(filtered, columns):
+    table = filtered.groupby(['Item', 'UOM'], as_index=False)[columns + ['Price Sum', 'Price Count']].sum()
+    table.insert(2, 'Price', table['Price Sum'] / table['Price Count'])
+    return table.drop(columns=['Price Sum', 'Price Count'])
+
+# --- Item-level variance measures for the top/bottom explorer ---
+VARIANCE_METRICS = {
+    'Value': 'Variance (Value)',
+    'Quantity': 'Variance (Qty)',
+    '% of Consumption': 'Variance % of Consumption',
+}
+
+def variance_table(filtered):
+    table = item_totals(filtered, ['Ideal Closing Stock', 'Actual Closing Stock', 'Consumption (Qty)', 'Variance'])
+    table = table.rename(columns={'Variance': 'Variance (Value)'})
+    table['Variance (Qty)'] = table['Actual Closing Stock'] - table['Ideal Closing Stock']
+    consumption = table['Consumption (Qty)'].where(table['Consumption (Qty)'] != 0)
+    table['Variance % of Consumption'] = table['Variance (Qty)'] / consumption * 100
+    return table
+
+# --- Partial selection: n largest / smallest rows without sorting the whole table ---
+def extreme_rows(table, column, n, largest=True):
+    values = table[column].to_numpy(dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    n = min(n, len(valid))
+    if n == 0:
+        return table.iloc[[]]
+
+    keys = -values[valid] if largest else values[valid]
+    picked = valid[np.argpartition(keys, n - 1)[:n]]
+    picked = picked[np.argsort(-values[picked] if largest else values[picked], kind='stable')]
+    return table.iloc[picked]
+
+# --- Per-month series for one item over the filtered aggregate ---
+def item_month_series(filtered, item, uom):
+    rows = filtered[(filtered['Item'] == item) & (filtered['UOM'] == uom)]
+    series = rows.groupby(['Year', 'Month'], as_index=False)[
+        ['Consumption (Qty)', 'Ideal Closing Stock', 'Actual Closing Stock', 'Variance']
+    ].sum()
+    series['Month Num'] = series['Month'].map(MONTH_NUMBERS)
+    series = series.sort_values(['Year', 'Month Num']).drop(columns='Month Num')
+    series['Variance (Qty)'] = series['Actual Closing Stock'] - series['Ideal Closing Stock']
+    series = series.rename(columns={'Variance': 'Variance (Value)'})
+    series.index = series['Month'].str[:3] + ' ' + series['Year'].astype(str)
+    return series
@@ -0,0 +1,95 @@
+import pandas as pd
+import numpy as np
+from inventory_data import MONTH_NUMBERS
+
+LEDGER_KEYS = ['Location', 'Item', 'UOM']
+TOLERANCE = 1e-6
+
+# --- Stock ledger: carry-forward and book identities over the whole dataset ('inventory_ledger' dataset) ---
+def build_ledger(agg):
+    month_num = agg['Month'].map(MONTH_NUMBERS).to_numpy(dtype=float)
+    period = agg['Year'].to_numpy(dtype=float) * 12 + month_num - 1
+
+    # One sort by (location, item, UOM, month); series boundaries come from the codes
+    codes = [pd.factorize(agg[col], sort=True)[0] for col in LEDGER_KEYS]
+    order = np.lexsort([period] + codes[::-1])
+
+    ledger = agg.iloc[order][LEDGER_KEYS + ['Year', 'Month']].reset_index(drop=True)
+    period = period[order]
+    series = np.zeros(len(order), dtype=np.int64)
+    for code in codes:
+        series = series * (code.max() + 1 if len(code) else 1) + code[order]
+
+    opening = agg['Opening Stock (Qty)'].to_numpy(dtype=float)[order]
+    purchases = agg['Purchases (Qty)'].to_numpy(dtype=float)[order]
+    consumption = agg['Consumption (Qty)'].to_numpy(dtype=float)[order]
+    ideal_closing = agg['Ideal Closing Stock'].to_numpy(dtype=float)[order]
+    actual_closing = agg['Actual Closing Stock'].to_numpy(dtype=float)[order]
+    # Values are paise (money.py), so the running totals are exact
+    variance_value = agg['Variance'].to_numpy(dtype=np.int64)[order]
+
+    # Previous row of the same series, shifted by one
+    has_prev = np.zeros(len(order), dtype=bool)
+    has_prev[1:] = series[1:] == series[:-1]
+    prev_closing = np.full(len(order), np.nan)
+    prev_closing[1:] = actual_closing[:-1]
+    prev_closing[~has_prev] = np.nan
+    prev_period = np.full(len(order), np.nan)
+    prev_period[1:] = period[:-1]
+    missing_month = has_prev & (period - prev_period > 1)
+
+    carry_gap = np.where(has_prev, opening - prev_closing, 0.0)
+    book_gap = opening + purchases - consumption - ideal_closing
+    shrinkage = actual_closing - ideal_closing
+
+    # Running totals per series: global cumsum minus the total at each series start
+    starts = np.flatnonzero(~has_prev)
+    lengths = np.diff(np.append(starts, len(order)))
+    cum_qty = np.cumsum(shrinkage)
+    cum_value = np.cumsum(variance_value)
+    offset_qty = np.repeat(cum_qty[starts] - shrinkage[starts], lengths)
+    offset_value = np.repeat(cum_value[starts] - variance_value[starts], lengths)
+
+    ledger['Period'] = period.astype(np.int64)
+    ledger['Opening Stock (Qty)'] = opening
+    ledger['Prev Actual Closing'] = prev_closing
+    ledger['Carry-forward Gap'] = carry_gap
+    ledger['Book Gap'] = book_gap
+    ledger['Missing Month'] = missing_month
+    ledger['Shrinkage (Qty)'] = shrinkage
+    ledger['Shrinkage (Value)'] = variance_value
+    ledger['Cumulative Shrinkage (Qty)'] = cum_qty - offset_qty
+    ledger['Cumulative Shrinkage (Value)'] = cum_value - offset_value
+    ledger['Carry-forward Break'] = np.abs(carry_gap) > TOLERANCE
+    ledger['Book Break'] = np.abs(book_gap) > TOLERANCE
+    return ledger
+
+# --- Rows where either identity fails, or a month is missing from a series ---
+def ledger_breaks(ledger):
+    mask = ledger['Carry-forward Break'] | ledger['Book Break'] | ledger['Missing Month']
+    return ledger[mask]
+
+# --- Per item shrinkage summary across the given ledger rows ---
+def shrinkage_by_item(ledger):
+    summary = ledger.groupby(['Item', 'UOM'], as_index=False).agg(
+        **{
+            'Shrinkage (Qty)': ('Shrinkage (Qty)', 'sum'),
+            'Shrinkage (Value)': ('Shrinkage (Value)', 'sum'),
+            'Months': ('Period', 'nunique'),
+            'Breaks': ('Book Break', 'sum'),
+        }
+    )
+    summary['Breaks'] += ledger.groupby(['Item', 'UOM'])['Carry-forward Break'].sum().to_numpy()
+    return summary.sort_values('Shrinkage (Value)')
+
+# --- Cumulative shrinkage per month for one item, summed over locations ---
+def shrinkage_trend(ledger, item, uom):
+    rows = ledger[(ledger['Item'] == item) & (ledger['UOM'] == uom)]
+    trend = rows.groupby('Period').agg(
+        Year=('Year', 'first'),
+        Month=('Month', 'first'),
+        **{'Shrinkage (Value)': ('Shrinkage (Value)', 'sum')}
+    ).sort_index()
+    trend['Cumulative Shrinkage (Value)'] = trend['Shrinkage (Value)'].cumsum()
+    trend.index = trend['Month'].str[:3] + ' ' + trend['Year'].astype(str)
+    return trend
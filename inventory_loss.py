@@ -1,51 +1,141 @@
 import streamlit as st
-import pandas as pd
-
+from datasets import get_dataset
+from inventory_data import (
+    VARIANCE_METRICS, year_options, month_options, location_options,
+    filter_inventory, item_totals, variance_table, extreme_rows, item_month_series
+)
+from facets import keep_valid
+from money import rupee_columns, to_rupees
+from inventory_ledger import ledger_breaks, shrinkage_by_item, shrinkage_trend
+from result_cache import memoize
+from perf import instrument, stage
+from sections import section
+
+# --- Memoized computations keyed on the filter selection ---
+@memoize('inventory_loss', datasets=['inventory_agg'])
+def loss_summary(selected_year, selected_month, selected_location):
+    filtered_df = filter_inventory(get_dataset('inventory_agg'), selected_year, selected_month, selected_location)
+
+    # Values are summed in paise and shown in rupees
+    cards = {
+        'ideal_value': to_rupees(filtered_df['Ideal Closing stock Value'].sum()),
+        'actual_value': to_rupees(filtered_df['Actual Closing stock Value'].sum()),
+        'variance': to_rupees(filtered_df['Variance'].sum()),
+    }
+
+    item_table = item_totals(filtered_df, ['Ideal Closing Stock', 'Actual Closing Stock', 'Variance'])
+    item_table = rupee_columns(item_table, ['Variance'])
+    item_table.rename(columns={
+        'Price': 'Avg Price',
+        'Ideal Closing Stock': 'Ideal Closing Stock (Qty)',
+        'Actual Closing Stock': 'Actual Closing Stock (Qty)',
+        'Variance': 'Variance (Value)'
+    }, inplace=True)
+
+    return cards, item_table, rupee_columns(variance_table(filtered_df), ['Variance (Value)'])
+
+@memoize('inventory_loss', datasets=['inventory_agg'])
+def drill_series(selected_year, selected_location, item, uom):
+    series = item_month_series(filter_inventory(get_dataset('inventory_agg'), selected_year, 'All', selected_location), item, uom)
+    return rupee_columns(series, ['Variance (Value)'])
+
+@memoize('inventory_loss', datasets=['inventory_ledger'])
+def ledger_view(selected_year, selected_month, selected_location):
+    ledger = filter_inventory(get_dataset('inventory_ledger'), selected_year, selected_month, selected_location)
+    return ledger_breaks(ledger), rupee_columns(shrinkage_by_item(ledger), ['Shrinkage (Value)'])
+
+@memoize('inventory_loss', datasets=['inventory_ledger'])
+def item_shrinkage_trend(selected_year, selected_month, selected_location, item, uom):
+    ledger = filter_inventory(get_dataset('inventory_ledger'), selected_year, selected_month, selected_location)
+    return rupee_columns(shrinkage_trend(ledger, item, uom), ['Shrinkage (Value)', 'Cumulative Shrinkage (Value)'])
+
+# --- Top / Bottom Variance Explorer ---
+@section('inventory_loss', 'explorer')
+def variance_explorer(variance_df, selected_year, selected_location):
+    st.subheader("🔝 Top & Bottom Variance")
+
+    col_metric, col_n = st.columns(2)
+    metric_label = col_metric.radio("Rank by", list(VARIANCE_METRICS), horizontal=True)
+    top_n = col_n.slider("Items to show", min_value=5, max_value=50, value=10, step=5)
+    metric_col = VARIANCE_METRICS[metric_label]
+
+    explorer_cols = ['Item', 'UOM', 'Consumption (Qty)', 'Variance (Qty)', 'Variance (Value)', 'Variance % of Consumption']
+    col_top, col_bottom = st.columns(2)
+    with col_top:
+        st.markdown(f"**Highest {top_n} by {metric_label}**")
+        st.dataframe(extreme_rows(variance_df, metric_col, top_n, largest=True)[explorer_cols], hide_index=True)
+    with col_bottom:
+        st.markdown(f"**Lowest {top_n} by {metric_label}**")
+        st.dataframe(extreme_rows(variance_df, metric_col, top_n, largest=False)[explorer_cols], hide_index=True)
+
+    if not variance_df.empty:
+        drill_labels = (variance_df['Item'] + ' (' + variance_df['UOM'] + ')').tolist()
+        drill_item = st.selectbox("Drill down into item", drill_labels)
+        drill_row = variance_df.iloc[drill_labels.index(drill_item)]
+        month_series = drill_series(selected_year, selected_location, drill_row['Item'], drill_row['UOM'])
+        st.bar_chart(month_series[['Variance (Value)']])
+        st.dataframe(month_series.drop(columns=['Year', 'Month']), use_container_width=True)
+
+# --- Stock Ledger Continuity ---
+@section('inventory_loss', 'ledger')
+def ledger_section(selected_year, selected_month, selected_location):
+    st.subheader("🧮 Stock Ledger Continuity")
+    breaks, shrinkage = ledger_view(selected_year, selected_month, selected_location)
+
+    col4, col5, col6 = st.columns(3)
+    col4.metric("Carry-forward Breaks", int(breaks['Carry-forward Break'].sum()))
+    col5.metric("Book Identity Breaks", int(breaks['Book Break'].sum()))
+    col6.metric("Missing Months", int(breaks['Missing Month'].sum()))
+
+    if breaks.empty:
+        st.success("✅ Opening stock matches the previous actual closing and every book identity holds.")
+    else:
+        st.dataframe(breaks[[
+            'Location', 'Item', 'UOM', 'Year', 'Month', 'Opening Stock (Qty)',
+            'Prev Actual Closing', 'Carry-forward Gap', 'Book Gap', 'Missing Month'
+        ]], use_container_width=True)
+
+    st.markdown("#### 📉 Cumulative Shrinkage by Item")
+    st.dataframe(shrinkage, use_container_width=True)
+
+    if not shrinkage.empty:
+        item_labels = (shrinkage['Item'] + ' (' + shrinkage['UOM'] + ')').tolist()
+        selected_item = st.selectbox("Shrinkage trend for item", item_labels)
+        item_row = shrinkage.iloc[item_labels.index(selected_item)]
+        trend = item_shrinkage_trend(selected_year, selected_month, selected_location, item_row['Item'], item_row['UOM'])
+        st.line_chart(trend[['Cumulative Shrinkage (Value)']])
+
+@instrument('inventory_loss')
 def main():
     st.title("📦 Inventory Loss Analysis")
 
-    file_path = r"inventory_loss.csv"
-
     try:
-        df = pd.read_csv(file_path)
-        df['Month'] = df['Month'].astype(str)
-
+        # Cascading filters (the first lookup loads the dataset)
+        stage('filter')
         # Year filter with 'All'
-        years = sorted(df['Year'].dropna().unique())
-        selected_year = st.sidebar.selectbox("Select Year", ['All'] + years)
+        years = ['All'] + year_options()
+        keep_valid("loss_year", years)
+        selected_year = st.sidebar.selectbox("Select Year", years, key="loss_year")
 
         # Month filter
-        if selected_year == 'All':
-            month_options = sorted(df['Month'].dropna().unique())
-            filtered_df = df.copy()
-        else:
-            month_options = sorted(df[df['Year'] == selected_year]['Month'].dropna().unique())
-            filtered_df = df[df['Year'] == selected_year]
-
-        selected_month = st.sidebar.selectbox("Select Month", ['All'] + month_options)
+        months = ['All'] + month_options(selected_year)
+        keep_valid("loss_month", months)
+        selected_month = st.sidebar.selectbox("Select Month", months, key="loss_month")
 
         # Location filter
-        if selected_year == 'All':
-            location_options = sorted(df['Location'].dropna().unique())
-        else:
-            location_options = sorted(df[df['Year'] == selected_year]['Location'].dropna().unique())
-
-        selected_location = st.sidebar.selectbox("Select Location", ['All'] + location_options)
-
-        # Apply Month filter
-        if selected_month != 'All':
-            filtered_df = filtered_df[filtered_df['Month'] == selected_month]
-
-        # Apply Location filter
-        if selected_location != 'All':
-            filtered_df = filtered_df[filtered_df['Location'] == selected_location]
+        locations = ['All'] + location_options(selected_year, selected_month)
+        keep_valid("loss_location", locations)
+        selected_location = st.sidebar.selectbox("Select Location", locations, key="loss_location")
 
         # Card Calculations
-        ideal_value = filtered_df['Ideal Closing stock Value'].sum()
-        actual_value = filtered_df['Actual Closing stock Value'].sum()
-        variance = filtered_df['Variance'].sum()
+        stage('aggregate')
+        cards, item_table, variance_df = loss_summary(selected_year, selected_month, selected_location)
+        ideal_value = cards['ideal_value']
+        actual_value = cards['actual_value']
+        variance = cards['variance']
 
         # Display Custom Metric Cards
+        stage('render')
         col1, col2, col3 = st.columns(3)
 
         with col1:
@@ -74,22 +164,11 @@ def main():
 
         # Table: Item, Avg Price, Ideal Closing Stock, Actual Closing Stock, Variance
         st.subheader("📋 Inventory Details by Item")
-        item_table = filtered_df.groupby(['Item', 'UOM']).agg({
-            'Price': 'mean',
-            'Ideal Closing Stock': 'sum',
-            'Actual Closing Stock': 'sum',
-            'Variance': 'sum'
-        }).reset_index()
-
-        item_table.rename(columns={
-            'Price': 'Avg Price',
-            'Ideal Closing Stock': 'Ideal Closing Stock (Qty)',
-            'Actual Closing Stock': 'Actual Closing Stock (Qty)',
-            'Variance': 'Variance (Qty)'
-        }, inplace=True)
-
         st.dataframe(item_table)
 
+        variance_explorer(variance_df, selected_year, selected_location)
+        ledger_section(selected_year, selected_month, selected_location)
+
     except FileNotFoundError:
         st.error("❌ Inventory loss file not found.")
     except Exception as e:
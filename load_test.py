@@ -0,0 +1,337 @@
+import os
+import sys
+import time
+import json
+import random
+import argparse
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+
+# === Concurrent-session load test ===
+# Drives main_dashboard.py through Streamlit's headless AppTest: every simulated
+# session logs in through the form, visits every report and changes random
+# sidebar filters, one rerun per change. Sessions run in parallel threads of one
+# process, so they share the dataset registry and result cache exactly like
+# sessions of a real server. Data is synthetic unless --data-dir is given.
+#
+#   python load_test.py --sessions 8 --rounds 2
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTLETS = ['Baga', 'KTC', 'Khorlim', 'Margao', 'Panaji', 'Porvorim', 'Siolim']
+TABS = ['NON AC', 'AC', 'SWIGGY', 'ZOMATO', 'TAKE AWAY']
+FOOD_CATEGORIES = ['Bakery', 'Beverages', 'Fruits', 'Groceries', 'Milk products', 'Ready to eat', 'Spices', 'Vegetables']
+EXPENSES = [
+    'Salaries', 'Rent', 'Water', 'Electricity', 'Staff room rent', 'Staff electricity',
+    'Commission', 'Admin expenses', 'Repairs and maintenance', 'Advertisement'
+]
+DISHES = ['Idli', 'Vada', 'Dosa', 'Upma', 'Thali', 'Pulao', 'Coffee', 'Tea', 'Lassi', 'Halwa']
+ITEMS = [('Oil', 'Packets'), ('Rice', 'Kg'), ('Dal', 'Kg'), ('Milk', 'Litre'), ('Sugar', 'Kg'), ('Flour', 'Kg')]
+PAGES = [
+    ("Sales Performance Analysis", "Sales Growth"),
+    ("Sales Performance Analysis", "Reconciliations"),
+    ("Sales Performance Analysis", "Cash Variance"),
+    ("Food Cost Analysis", "Ideal Vs Actual Food Cost"),
+    ("Food Cost Analysis", "Inventory Consumption Report"),
+    ("Food Cost Analysis", "Inventory Loss Report"),
+    ("Food Cost Analysis", "Dish Level Costing Report"),
+    ("Financial Reporting", "P&L Report"),
+]
+
+
+# --- Synthetic data in the same layout and columns as the real inputs ---
+def _month_starts(months):
+    end = pd.Timestamp.today().normalize().replace(day=1)
+    return pd.date_range(end=end, periods=months, freq='MS')
+
+
+def _write_sales(root, rng, month_starts):
+    for start in month_starts:
+        # Up to today: later rows would be quarantined as future-dated
+        days = pd.date_range(start, min(start + pd.offsets.MonthEnd(0), pd.Timestamp.today().normalize()))
+        grid = pd.MultiIndex.from_product([days, OUTLETS, TABS], names=['Date', 'Outlet', 'Tab']).to_frame(index=False)
+        sale = rng.gamma(4, 5000, len(grid)).round(2)
+        discount = (sale * rng.uniform(0, 0.1, len(grid))).round(2)
+        charges = rng.choice([0, 0, 250, 550], len(grid)).astype(float)
+        net = (sale - discount).round(2)
+        tax = (net * 0.05).round(2)
+        total = (net + charges + tax).round(2)
+        frame = pd.DataFrame({
+            'Building Type': '-', 'Area': '-', 'Region': '-',
+            'Outlet Name': grid['Outlet'] + ' Navtara',
+            'Date': grid['Date'].dt.strftime('%Y-%m-%d'),
+            'Tabs': grid['Tab'],
+            'No Of Items': rng.integers(50, 400, len(grid)),
+            'No Of Bills': rng.integers(10, 90, len(grid)),
+            'Sale': sale, 'Discount': discount, 'Charges': charges, 'Net Sale': net,
+            'Total Tax': tax, 'Total Amount': total,
+            'Round Off': (total.round() - total).round(2), 'Gross Amount': total.round(),
+        })
+        fiscal = start.year if start.month >= 4 else start.year - 1
+        folder = os.path.join(root, 'Input files', f'{fiscal}-{str(fiscal + 1)[-2:]}')
+        os.makedirs(folder, exist_ok=True)
+        frame.to_csv(os.path.join(folder, f"Enterprise_Daily_Sales_Tabwise_Report{start:%m.%Y}.csv"), index=False)
+
+
+def _write_monthly_files(root, rng, month_starts):
+    rows = [(start.year, start.strftime('%B'), start, outlet) for start in month_starts for outlet in OUTLETS]
+
+    pnl = []
+    for year, month, start, outlet in rows:
+        for tab in ['Non AC', 'AC', 'Swiggy', 'Zomato', 'Takeaway']:
+            pnl.append((year, month, start, 'Revenue', 'Sales', tab, outlet, rng.uniform(2e5, 2e6)))
+        for category in FOOD_CATEGORIES:
+            pnl.append((year, month, start, 'Food Cost', 'Purchases', category, outlet, rng.uniform(1e4, 2e5)))
+        for expense in EXPENSES:
+            pnl.append((year, month, start, 'Operating Cost', expense, expense, outlet, rng.uniform(5e3, 1.5e5)))
+    pnl = pd.DataFrame(pnl, columns=['Year', 'Month', 'Date', 'Category', 'Sub-Category', 'Super-Sub-Category', 'Location', 'Amount'])
+    pnl['Date'] = pnl['Date'].dt.strftime('%d-%m-%Y')
+    pnl['Amount'] = pnl['Amount'].round(2)
+    pnl.to_csv(os.path.join(root, 'PnL.csv'), index=False)
+
+    days = pd.date_range(month_starts[0], month_starts[-1] + pd.offsets.MonthEnd(0))
+    cvr = pd.MultiIndex.from_product([days, OUTLETS], names=['Date', 'Location']).to_frame(index=False)
+    n = len(cvr)
+    for col, scale in [('Swiggy', 3e4), ('Zomato', 3e4), ('Card Sales', 2e4), ('UPI', 1.5e4),
+                       ('Dineout', 4e3), ('Zomato Pro', 2e3), ('Expenses', 7e3)]:
+        cvr[col] = rng.integers(0, int(scale * 2), n)
+    cvr['Expected Cash Sales'] = rng.integers(2000, 9000, n)
+    cvr['Total Sales'] = cvr[['Swiggy', 'Zomato', 'Card Sales', 'UPI', 'Dineout', 'Zomato Pro', 'Expected Cash Sales']].sum(axis=1)
+    cvr['Actual Cash Sales'] = cvr['Expected Cash Sales'] + rng.integers(-400, 400, n)
+    cvr['Year'] = cvr['Date'].dt.year
+    cvr['Month'] = cvr['Date'].dt.strftime('%B')
+    cvr['Date'] = cvr['Date'].dt.strftime('%d-%m-%Y 00:00')
+    cvr.to_csv(os.path.join(root, 'CVR.csv'), index=False)
+
+    dish = pd.DataFrame([(outlet, year, month, name) for year, month, _, outlet in rows for name in DISHES],
+                        columns=['Outlet', 'Year', 'Month', 'Item Name'])
+    dish['Selling Price'] = rng.integers(40, 300, len(dish))
+    dish['Cost Price'] = (dish['Selling Price'] * rng.uniform(0.25, 0.45, len(dish))).round(2)
+    dish['Selling Qty'] = rng.integers(50, 900, len(dish))
+    dish.to_csv(os.path.join(root, 'dish.csv'), index=False)
+
+    food = pd.DataFrame([(year, month, outlet, category) for year, month, _, outlet in rows for category in FOOD_CATEGORIES],
+                        columns=['Year', 'Month', 'Location', 'Category'])
+    food['Ideal Cost'] = rng.uniform(0.5, 5, len(food)).round(2)
+    food['Actual Cost'] = (food['Ideal Cost'] + rng.normal(0, 0.1, len(food))).round(2)
+    food['Variance'] = (food['Actual Cost'] - food['Ideal Cost']).round(2)
+    food.to_csv(os.path.join(root, 'foodcost_category.csv'), index=False)
+
+    # Inventory rolls forward: opening stock is last month's actual closing
+    inventory = []
+    for outlet in OUTLETS:
+        for item, uom in ITEMS:
+            closing = int(rng.integers(20, 100))
+            for start in month_starts:
+                price = round(float(rng.uniform(40, 500)), 2)
+                purchases = int(rng.integers(20, 120))
+                consumption = int(rng.integers(10, purchases + closing))
+                ideal = closing + purchases - consumption
+                actual = max(ideal - int(rng.integers(0, 3)), 0)
+                inventory.append((start.year, start.strftime('%B'), outlet, item, 'Groceries', uom, price, closing,
+                                  purchases, consumption, ideal, actual, round(ideal * price, 2),
+                                  round(actual * price, 2), round((actual - ideal) * price, 2)))
+                closing = actual
+    pd.DataFrame(inventory, columns=[
+        'Year', 'Month', 'Location', 'Item', 'Category', 'UOM', 'Price', 'Opening Stock (Qty)', 'Purchases (Qty)',
+        'Consumption (Qty)', 'Ideal Closing Stock', 'Actual Closing Stock', 'Ideal Closing stock Value',
+        'Actual Closing stock Value', 'Variance'
+    ]).to_csv(os.path.join(root, 'inventory_loss.csv'), index=False)
+
+
+def _write_swiggy(root, rng, month_starts, orders_per_day):
+    swiggy_dir = os.path.join(root, 'Reconciliations', 'Swiggy')
+    os.makedirs(os.path.join(swiggy_dir, 'output files'), exist_ok=True)
+    mapping = pd.DataFrame({'Restaurant ID': [78872 + 1000 * i for i in range(len(OUTLETS))],
+                            'Deployment': [f'{outlet} Navtara' for outlet in OUTLETS]})
+    mapping.to_excel(os.path.join(swiggy_dir, 'output files', 'swiggy_mapping_table.xlsx'), index=False)
+
+    # POS bills cover the last two months only
+    days = pd.date_range(month_starts[-2], month_starts[-1] + pd.offsets.MonthEnd(0))
+    n = len(days) * len(OUTLETS) * orders_per_day
+    orders = pd.DataFrame({
+        'Deployment': np.repeat(mapping['Deployment'].to_numpy(), len(days) * orders_per_day),
+        'Bill Date': np.tile(np.repeat(days.to_numpy(), orders_per_day), len(OUTLETS)),
+        'Order Id': np.arange(n) + 203000000000000,
+        'Gross Bill Amount': rng.gamma(3, 120, n).round(2),
+    })
+    orders['Source'] = 'synthetic'
+    orders.to_excel(os.path.join(swiggy_dir, 'output files', 'swiggy_pos.xlsx'), index=False)
+
+
+def make_synthetic_data(root, months=24, orders_per_day=20, seed=0):
+    rng = np.random.default_rng(seed)
+    month_starts = _month_starts(months)
+    _write_sales(root, rng, month_starts)
+    _write_monthly_files(root, rng, month_starts)
+    _write_swiggy(root, rng, month_starts, orders_per_day)
+    return root
+
+
+# --- One simulated user ---
+def _radio(at, label):
+    return next(radio for radio in at.radio if radio.label == label)
+
+
+def _random_filter_change(at, rng):
+    widgets = [w for w in list(at.sidebar.selectbox) + list(at.sidebar.multiselect) if w.options]
+    if not widgets:
+        return None
+    widget = rng.choice(widgets)
+    if hasattr(widget, 'indices'):
+        return widget.set_value(rng.sample(widget.options, rng.randint(1, min(3, len(widget.options)))))
+    return widget.select_index(rng.randrange(len(widget.options)))
+
+
+def run_session(session_id, rounds, filter_changes, seed, results, start_barrier):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_id)
+    at = AppTest.from_file(os.path.join(APP_DIR, 'main_dashboard.py'), default_timeout=600)
+
+    # prepare() sets widget values and returns the element to run, or None to skip
+    def step(page, prepare):
+        started = time.perf_counter()
+        try:
+            element = prepare()
+            if element is None:
+                return False
+            element.run()
+            error = next((str(e.value) for e in at.exception), None)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        results.append({'session': session_id, 'page': page, 'seconds': time.perf_counter() - started, 'error': error})
+        return error is None
+
+    def login():
+        at.text_input[0].input('admin')
+        at.text_input[1].input('9876')
+        return at.button[0].click()
+
+    start_barrier.wait()
+    step('Login', lambda: at)
+    step('Login', login)
+
+    for _ in range(rounds):
+        for section, report in rng.sample(PAGES, len(PAGES)):
+            step(report, lambda: _radio(at, "Select Section").set_value(section))
+            if not step(report, lambda: _radio(at, "Select a Report").set_value(report)):
+                continue
+            for _ in range(filter_changes):
+                if not step(report, lambda: _random_filter_change(at, rng)):
+                    break
+
+
+# --- Make AppTest safe to drive from parallel threads. It installs a mock Runtime
+# per run and clears it when the run ends, pulling it from under the other
+# sessions, so the last one is kept alive ---
+def _share_test_runtime():
+    from streamlit.runtime.runtime import Runtime
+    create_or_fail = Runtime.instance.__func__
+    latest = [None]
+
+    def instance(cls):
+        if cls._instance is not None:
+            latest[0] = cls._instance
+        return latest[0] if latest[0] is not None else create_or_fail(cls)
+
+    Runtime.instance = classmethod(instance)
+
+    # Each run recompiles the script and ast.parse is not safe to call from
+    # several threads at once on every Python version; serialize just that step
+    from streamlit.runtime.scriptrunner import magic
+    add_magic, lock = magic.add_magic, threading.Lock()
+
+    def locked_add_magic(code, script_path):
+        with lock:
+            return add_magic(code, script_path)
+
+    magic.add_magic = locked_add_magic
+
+
+# --- Peak resident memory while the sessions run ---
+def _sample_memory(stop, peak):
+    from perf import process_rss
+    while not stop.is_set():
+        peak[0] = max(peak[0], process_rss())
+        stop.wait(0.05)
+
+
+def summarize(results):
+    frame = pd.DataFrame(results)
+    rows = []
+    for page, group in [('ALL', frame)] + list(frame.groupby('page')):
+        ms = group['seconds'].to_numpy() * 1000
+        rows.append({
+            'page': page, 'reruns': len(ms),
+            'p50_ms': np.percentile(ms, 50), 'p95_ms': np.percentile(ms, 95), 'p99_ms': np.percentile(ms, 99),
+            'max_ms': ms.max(), 'errors': int(group['error'].notna().sum()),
+        })
+    return pd.DataFrame(rows).round(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the dashboard (headless AppTest).")
+    parser.add_argument('--sessions', type=int, default=4, help="simulated concurrent users")
+    parser.add_argument('--rounds', type=int, default=1, help="passes over every report per session")
+    parser.add_argument('--filter-changes', type=int, default=3, help="random filter changes per report visit")
+    parser.add_argument('--months', type=int, default=24, help="months of synthetic history")
+    parser.add_argument('--orders-per-day', type=int, default=20, help="synthetic Swiggy orders per outlet per day")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', help="use existing data here instead of generating synthetic data")
+    parser.add_argument('--json', help="also write the summary and raw timings to this file")
+    args = parser.parse_args(argv)
+
+    data_dir = args.data_dir
+    if data_dir is None:
+        data_dir = tempfile.mkdtemp(prefix='dashboard_load_')
+        started = time.perf_counter()
+        make_synthetic_data(data_dir, args.months, args.orders_per_day, args.seed)
+        print(f"Synthetic data in {data_dir} ({time.perf_counter() - started:.1f}s)")
+
+    # Must be set before the dashboard modules import datasets
+    os.environ['DASHBOARD_DATA_DIR'] = os.path.abspath(data_dir)
+    os.environ.setdefault('PERF_LOG', os.path.join(data_dir, 'perf.jsonl'))
+    # Keep the run's result cache and forecast state out of the real ones
+    os.environ.setdefault('RESULT_CACHE_DIR', os.path.join(data_dir, '.result_cache'))
+    os.environ.setdefault('FORECAST_STATE', os.path.join(data_dir, 'forecast_state.pkl'))
+    os.chdir(APP_DIR)
+    sys.path.insert(0, APP_DIR)
+
+    _share_test_runtime()
+    results = []
+    stop, peak = threading.Event(), [0]
+    sampler = threading.Thread(target=_sample_memory, args=(stop, peak), daemon=True)
+    sampler.start()
+
+    barrier = threading.Barrier(args.sessions)
+    sessions = [
+        threading.Thread(target=run_session, args=(i, args.rounds, args.filter_changes, args.seed, results, barrier))
+        for i in range(args.sessions)
+    ]
+    started = time.perf_counter()
+    for thread in sessions:
+        thread.start()
+    for thread in sessions:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    sampler.join()
+
+    summary = summarize(results)
+    print(f"\n{args.sessions} sessions · {len(results)} reruns in {elapsed:.1f}s · peak RSS {peak[0] / 2**20:,.0f} MB\n")
+    print(summary.to_string(index=False))
+    errors = [r for r in results if r['error']]
+    for error in errors[:10]:
+        print(f"  session {error['session']} · {error['page']}: {error['error']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'sessions': args.sessions, 'elapsed_s': elapsed, 'peak_rss_bytes': peak[0],
+                       'summary': summary.to_dict('records'), 'reruns': results}, f, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,176 +1,165 @@
 import streamlit as st
-import importlib
-import sys
 import os
+import time
+from result_cache import cache_stats
+from prewarm import start_prewarm, prewarm_progress
+from file_watcher import start_watcher, recent_events
+from perf import is_admin, pop_last_run, report_summary, SLOW_MS
+from metrics import observe, start_metrics_export
+from reports import REPORTS, HEADINGS, PROMPTS, menu_options, report_at, report_entry
+from datasets import get_dataset, is_loaded, partition_status
+from validation import QUARANTINES, WARNINGS, WARNING_COL, quarantine_summary, warned_rows
 
 # --- LOGIN SETUP ---
 st.set_page_config(page_title="Client Performance Dashboard", layout="wide")
+rerun_started = time.perf_counter()
+page = "Login"
+
+# Metrics exporters (METRICS_PORT / METRICS_FILE); started once per process
+start_metrics_export()
 
 # Hardcoded login credentials
 USERNAME = "admin"
 PASSWORD = "9876"
 
-# Initialize login state
-if "logged_in" not in st.session_state:
-    st.session_state.logged_in = False
-
-# Login form
-if not st.session_state.logged_in:
-    st.title("🔐 Login to Client Dashboard")
-    with st.form("login_form"):
-        username_input = st.text_input("Username")
-        password_input = st.text_input("Password", type="password")
-        login_button = st.form_submit_button("Login")
-
-        if login_button:
-            if username_input == USERNAME and password_input == PASSWORD:
-                st.session_state.logged_in = True
-                st.success("✅ Login successful!")
-                st.rerun()
-            else:
-                st.error("❌ Invalid username or password.")
-
-# --- MAIN DASHBOARD ---
-if st.session_state.logged_in:
-    st.title("📈 Client Performance Dashboard")
-
-    # Sidebar navigation with logo
-    with st.sidebar:
-        st.image("logo.png", width=150)
-        st.markdown("---")
-
-        main_section = st.radio(
-            "Select Section",
-            ["Sales Performance Analysis", "Food Cost Analysis", "Financial Reporting"]
-        )
-
-        if main_section == "Sales Performance Analysis":
-            sub_option = st.radio(
-                "Select a Report",
-                ["Sales Growth", "Reconciliations", "Cash Variance"]
-            )
-
-        elif main_section == "Food Cost Analysis":
-            food_option = st.radio(
-                "Select a Report",
-                [
-                    "Ideal Vs Actual Food Cost",
-                    "Inventory Consumption Report",
-                    "Inventory Loss Report",
-                    "Dish Level Costing Report"
-                ]
-            )
-
-        elif main_section == "Financial Reporting":
-            finance_option = st.radio(
-                "Select a Report",
-                ["P&L Report", "Cash Flow Statement"]
-            )
-
-    # === SALES PERFORMANCE ANALYSIS ===
-    if main_section == "Sales Performance Analysis":
-        st.header("📊 Sales Performance Analysis")
-
-        if sub_option == "Sales Growth":
-            try:
-                import web_sales
-                web_sales.main()
-            except Exception as e:
-                st.error(f"❌ Error loading Sales Growth Report: {e}")
-
-        elif sub_option == "Reconciliations":
-            st.subheader("🔄 Reconciliations")
-            platform_option = st.radio("Choose Platform", ["Swiggy", "Zomato"])
-
-            if platform_option == "Swiggy":
-                swiggy_report = st.radio(
-                    "Select Swiggy Report",
-                    ["Sales Reconciliation", "Order Level Reconciliation"]
-                )
-
-                if swiggy_report == "Sales Reconciliation":
-                    try:
-                        swiggy_path = os.path.join(os.getcwd(), "Reconciliations", "Swiggy")
-                        if swiggy_path not in sys.path:
-                            sys.path.append(swiggy_path)
-                        import swiggy_reconciliation
-                        swiggy_reconciliation.main()
-                    except Exception as e:
-                        st.error(f"❌ Error loading Swiggy Sales Reconciliation: {e}")
+# Reruns that end in st.rerun(), st.stop() or an error are timed too
+try:
+    # Initialize login state
+    if "logged_in" not in st.session_state:
+        st.session_state.logged_in = False
+
+    # Optional warm-up at server start, before anyone logs in (no-op once running)
+    if os.environ.get("PREWARM_AT_STARTUP") == "1":
+        start_prewarm()
+        start_watcher()
+
+    # Login form
+    if not st.session_state.logged_in:
+        st.title("🔐 Login to Client Dashboard")
+        with st.form("login_form"):
+            username_input = st.text_input("Username")
+            password_input = st.text_input("Password", type="password")
+            login_button = st.form_submit_button("Login")
+
+            if login_button:
+                if username_input == USERNAME and password_input == PASSWORD:
+                    st.session_state.logged_in = True
+                    st.session_state.username = username_input
+                    # Load every dataset in the background while the landing view renders
+                    start_prewarm()
+                    start_watcher()
+                    st.success("✅ Login successful!")
+                    st.rerun()
                 else:
-                    st.info("Order Level Reconciliation – Coming Soon!")
-
-            elif platform_option == "Zomato":
-                st.info("Zomato Reports – Coming Soon!")
-
-        elif sub_option == "Cash Variance":
-            st.subheader("💰 Cash Variance")
-            try:
-                cvr_path = os.path.join(os.getcwd(), "Reconciliations", "CashVariance")
-                if cvr_path not in sys.path:
-                    sys.path.append(cvr_path)
-                import CVR
-                CVR.main()
-            except Exception as e:
-                st.error(f"❌ Error loading Cash Variance Report: {e}")
-
-    # === FOOD COST ANALYSIS ===
-    elif main_section == "Food Cost Analysis":
-        st.header("🍽️ Food Cost Analysis")
-
-        if food_option == "Ideal Vs Actual Food Cost":
-            try:
-                ideal_path = os.path.join(os.getcwd(), "food_cost_analysis", "ideal_vs_actual")
-                if ideal_path not in sys.path:
-                    sys.path.append(ideal_path)
-                import ideal_vs_actual
-                ideal_vs_actual.main()
-            except Exception as e:
-                st.error(f"❌ Error loading Ideal Vs Actual Food Cost: {e}")
-
-        elif food_option == "Inventory Consumption Report":
+                    st.error("❌ Invalid username or password.")
+
+    # --- MAIN DASHBOARD ---
+    if st.session_state.logged_in:
+        st.title("📈 Client Performance Dashboard")
+
+        if not st.session_state.get("prewarm_started"):
+            start_prewarm()
+            start_watcher()
+            st.session_state.prewarm_started = True
+
+        # Sidebar navigation with logo
+        with st.sidebar:
+            st.image("logo.png", width=150)
+
+            # Dataset warm-up progress; refreshes itself until every dataset is ready
+            finished, total, _ = prewarm_progress()
+            if finished < total:
+                @st.fragment(run_every=1)
+                def warmup_progress():
+                    done, total, status = prewarm_progress()
+                    if done < total:
+                        loading = [name for name, state in status.items() if state == 'loading']
+                        st.progress(done / total, text=f"Preparing datasets… {done}/{total}")
+                        if loading:
+                            st.caption("Loading: " + ", ".join(loading))
+                    else:
+                        st.caption("✅ All datasets ready")
+
+                warmup_progress()
+
+            # Source files picked up by the watcher in the last few minutes
+            events = recent_events()
+            if events:
+                st.caption("🔄 Data refreshed: " + ", ".join(
+                    sorted({f"{event['dataset']} ({event['kind']})" for event in events})
+                ))
+
+            st.markdown("---")
+
+            # Section and report radios, built from the report registry
+            menu_path = ()
+            while len(menu_path) < 2 and report_at(menu_path) is None:
+                menu_path += (st.radio(PROMPTS[menu_path], menu_options(menu_path)),)
+
+        page = menu_path[-1]
+
+        # Headings, then any deeper menu levels (platform, sub-report) on the page
+        st.header(HEADINGS[menu_path[:1]])
+        if menu_path in HEADINGS:
+            st.subheader(HEADINGS[menu_path])
+        while report_at(menu_path) is None:
+            menu_path += (st.radio(PROMPTS[menu_path], menu_options(menu_path)),)
+
+        # === Run the selected report ===
+        report_id = report_at(menu_path)
+        report = REPORTS[report_id]
+        if report['entry'] is None:
+            st.info(f"{report['title']} – Coming Soon!")
+        else:
+            start_prewarm(report['datasets'])
             try:
-                inv_path = os.path.join(os.getcwd(), "food_cost_analysis", "inventory_consumption")
-                if inv_path not in sys.path:
-                    sys.path.append(inv_path)
-                import inventory_consumption
-                inventory_consumption.main()
+                report_entry(report_id)()
             except Exception as e:
-                st.error(f"❌ Error loading Inventory Consumption Report: {e}")
-
-        elif food_option == "Inventory Loss Report":
-            try:
-                loss_path = os.path.join(os.getcwd(), "food_cost_analysis", "inventory_loss")
-                if loss_path not in sys.path:
-                    sys.path.append(loss_path)
-                import inventory_loss
-                inventory_loss.main()
-            except Exception as e:
-                st.error(f"❌ Error loading Inventory Loss Report: {e}")
-
-        elif food_option == "Dish Level Costing Report":
-            try:
-                dish_level_path = os.path.join(os.getcwd(), "food_cost_analysis", "dish_level")
-                if dish_level_path not in sys.path:
-                    sys.path.append(dish_level_path)
-                import dish_level
-                dish_level.main()
-            except Exception as e:
-                st.error(f"❌ Error loading Dish Level Costing Report: {e}")
-
-    # === FINANCIAL REPORTING ===
-    elif main_section == "Financial Reporting":
-        st.header("📑 Financial Reporting")
-
-        if finance_option == "P&L Report":
-            try:
-                pnl_path = os.path.join(os.getcwd(), "financial_reporting")
-                if pnl_path not in sys.path:
-                    sys.path.append(pnl_path)
-                import pnl_dashboard
-                pnl_dashboard.main()
-            except Exception as e:
-                st.error(f"❌ Error loading P&L Report: {e}")
+                st.error(f"❌ Error loading {report['title']}: {e}")
+
+        # --- Report result cache stats ---
+        with st.sidebar.expander("⚡ Report Cache"):
+            stats = cache_stats()
+            st.caption(
+                f"Hit rate {stats['hit_rate']:.0%} · {stats['hits']} hits / {stats['misses']} misses · "
+                f"{stats['entries']} entries · {stats['bytes'] / 2**20:.1f} of {stats['max_bytes'] / 2**20:.0f} MB · "
+                f"{stats['evictions']} evictions"
+            )
 
-        elif finance_option == "Cash Flow Statement":
-            st.info("Cash Flow Statement – Coming Soon!")
+        # --- Per-rerun timing breakdown (admins only) ---
+        if is_admin(st.session_state.get("username")):
+            run = pop_last_run()
+            with st.sidebar.expander("⏱️ Performance"):
+                if run:
+                    st.caption(f"{run['report']} · {run['total_ms']:,.0f} ms · RSS {run['rss_mb']:,.0f} MB")
+                    if run['slow']:
+                        st.warning(f"Slow rerun: over {SLOW_MS:,.0f} ms")
+                    st.dataframe(run['stages'], hide_index=True)
+                summary = report_summary()
+                if summary:
+                    st.caption("Recent runs by report (slowest first)")
+                    st.dataframe(summary, hide_index=True)
+
+            # --- Rows and files rejected at ingest; only datasets already loaded are shown ---
+            with st.sidebar.expander("🧪 Data Quality"):
+                for ingested, quarantine_name in QUARANTINES.items():
+                    if not is_loaded(quarantine_name):
+                        st.caption(f"{ingested}: not loaded yet")
+                        continue
+                    quarantine = get_dataset(quarantine_name)
+                    failed_files = {path: part['error'] for path, part in partition_status(ingested).items() if part['error']}
+                    st.caption(f"{ingested}: {len(quarantine):,} rows quarantined · {len(failed_files)} unreadable files")
+                    if len(quarantine):
+                        st.dataframe(quarantine_summary(quarantine), hide_index=True)
+                    for path, error in failed_files.items():
+                        st.warning(f"{os.path.basename(path)}: {error}")
+                    # Flagged but still in the reports (e.g. an outlet not in KNOWN_OUTLETS yet)
+                    dataset, warnings = WARNINGS.get(ingested, (None, None))
+                    if dataset and is_loaded(dataset):
+                        warned = warned_rows(get_dataset(dataset), warnings)
+                        st.caption(f"{ingested}: {len(warned):,} rows kept with warnings")
+                        if len(warned):
+                            st.dataframe(quarantine_summary(warned, WARNING_COL), hide_index=True)
+finally:
+    # --- Whole-script rerun latency for the metrics endpoint ---
+    observe("dashboard_page_rerun_seconds", {"page": page}, time.perf_counter() - rerun_started)
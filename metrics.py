@@ -0,0 +1,161 @@
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# === Process-wide metrics in the Prometheus text format ===
+# Counters, gauges and histograms are plain dicts keyed by (metric, labels).
+# The exposition is served on METRICS_PORT and/or rewritten to METRICS_FILE
+# every METRICS_INTERVAL seconds; neither is started unless configured.
+# With several server processes on one host only the first to bind
+# METRICS_PORT serves it; the others carry on without a listener.
+
+METRICS_HOST = os.environ.get('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = os.environ.get('METRICS_PORT')
+METRICS_FILE = os.environ.get('METRICS_FILE')
+METRICS_INTERVAL = float(os.environ.get('METRICS_INTERVAL', 15))
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HELP = {
+    'dashboard_dataset_loads_total': ('counter', 'Dataset loads by outcome.'),
+    'dashboard_dataset_load_seconds': ('histogram', 'Time to load or rebuild a dataset.'),
+    'dashboard_dataset_rows': ('gauge', 'Rows in the cached copy of a dataset.'),
+    'dashboard_dataset_rows_served_total': ('counter', 'Rows of the full cached dataset handed out per get_dataset call, before any report filtering.'),
+    'dashboard_report_cache_requests_total': ('counter', 'Report result cache lookups by result.'),
+    'dashboard_report_rerun_seconds': ('histogram', 'Report main() duration per rerun.'),
+    'dashboard_page_rerun_seconds': ('histogram', 'Full dashboard script duration per rerun, by page.'),
+    'dashboard_disk_cache_requests_total': ('counter', 'On-disk cache lookups by namespace and result.'),
+    'dashboard_disk_cache_evictions_total': ('counter', 'Files evicted from the on-disk cache.'),
+}
+
+_counters = {}
+_gauges = {}
+_histograms = {}
+_callbacks = {}
+_lock = threading.Lock()
+_started = set()
+
+
+def _key(name, labels):
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def inc(name, labels=None, value=1):
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name, labels=None, value=0):
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+# --- Gauges read at scrape time (process RSS, cache size, ...) ---
+def gauge_callback(name, func, help_text=''):
+    with _lock:
+        _callbacks[name] = func
+    HELP.setdefault(name, ('gauge', help_text))
+
+
+def observe(name, labels=None, value=0.0):
+    key = _key(name, labels)
+    with _lock:
+        buckets, total, count = _histograms.get(key, ((0,) * len(BUCKETS), 0.0, 0))
+        buckets = tuple(n + (value <= bound) for n, bound in zip(buckets, BUCKETS))
+        _histograms[key] = (buckets, total + value, count + 1)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def exposition():
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        histograms = dict(_histograms)
+        callbacks = dict(_callbacks)
+
+    for name, func in callbacks.items():
+        try:
+            gauges[(name, ())] = func()
+        except Exception:
+            pass
+
+    samples = {}
+    for (name, labels), value in counters.items():
+        samples.setdefault(name, []).append(f'{name}{_format_labels(labels)} {value}')
+    for (name, labels), value in gauges.items():
+        samples.setdefault(name, []).append(f'{name}{_format_labels(labels)} {value}')
+    for (name, labels), (buckets, total, count) in histograms.items():
+        lines = samples.setdefault(name, [])
+        for bound, n in zip(BUCKETS, buckets):
+            lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {n}')
+        lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {count}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+        lines.append(f'{name}_count{_format_labels(labels)} {count}')
+
+    out = []
+    for name in sorted(samples):
+        kind, help_text = HELP.get(name, ('untyped', ''))
+        out.append(f'# HELP {name} {help_text}')
+        out.append(f'# TYPE {name} {kind}')
+        out.extend(samples[name])
+    return '\n'.join(out) + '\n'
+
+
+# --- Text file export (atomic replace, e.g. for node_exporter's textfile collector) ---
+def write_metrics(path):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(exposition())
+    os.replace(tmp_path, path)
+
+
+def _write_loop(path):
+    while True:
+        try:
+            write_metrics(path)
+        except OSError:
+            pass
+        time.sleep(METRICS_INTERVAL)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = exposition().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# --- Start the configured exporters once per server process ---
+def start_metrics_export():
+    with _lock:
+        if METRICS_PORT and 'port' not in _started:
+            # Attempted once per process: a port held by another worker is not retried every rerun
+            _started.add('port')
+            try:
+                server = ThreadingHTTPServer((METRICS_HOST, int(METRICS_PORT)), _MetricsHandler)
+            except OSError as e:
+                print(f"⚠️ Metrics port {METRICS_HOST}:{METRICS_PORT} unavailable ({e}); "
+                      f"not serving metrics from process {os.getpid()}", file=sys.stderr)
+            else:
+                threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+        if METRICS_FILE and 'file' not in _started:
+            threading.Thread(target=_write_loop, args=(METRICS_FILE,), name='metrics-file', daemon=True).start()
+            _started.add('file')
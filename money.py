@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+# === Money as integer paise ===
+# Amounts are converted once at ingest to whole paise (int64, or int32 when
+# every value of the column fits), so sums and differences are exact integer
+# arithmetic however many rows they cover. Rupees come back only for display
+# and exports, through to_rupees().
+#
+# Sums of int32 columns come back as int64 (pandas/numpy widen on reduction),
+# but element-wise arithmetic does not: derive columns (a + b, a - b) from the
+# int64 values before they are downcast.
+
+PAISE_PER_RUPEE = 100
+INT32 = np.iinfo(np.int32)
+
+
+# --- Numbers or text such as "₹1,234.50" -> float (unparseable values become NaN) ---
+def parse_amount(values):
+    values = pd.Series(values)
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype(str).str.replace(r'[₹,\s]', '', regex=True)
+    return pd.to_numeric(values, errors='coerce')
+
+
+# --- Rupee amounts (numbers or text) -> int64 paise; blanks become 0 ---
+def to_paise(values):
+    rupees = parse_amount(values).fillna(0)
+    return (rupees * PAISE_PER_RUPEE).round().astype('int64')
+
+
+# --- Half the memory when the column's range allows it ---
+def downcast(paise):
+    if len(paise) and INT32.min <= paise.min() and paise.max() <= INT32.max:
+        return paise.astype('int32')
+    return paise
+
+
+def money_columns(df, columns):
+    for col in columns:
+        df[col] = downcast(to_paise(df[col]))
+    return df
+
+
+# --- Paise (scalar, array, Series or frame) -> rupees as float, for display ---
+def to_rupees(paise):
+    return paise / PAISE_PER_RUPEE
+
+
+# --- Copy of a frame with the given paise columns in rupees ---
+def rupee_columns(df, columns):
+    df = df.copy()
+    for col in columns:
+        df[col] = to_rupees(df[col])
+    return df
+
+
+# --- part as a percentage of whole; both in paise, so the ratio is taken on exact totals ---
+def percent_of(part, whole):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.asarray(part, dtype='int64') * 100 / np.asarray(whole, dtype='int64')
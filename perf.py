@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import threading
+import functools
+from collections import deque
+from metrics import observe, gauge_callback
+
+# === Per-rerun performance instrumentation ===
+# A report's main() is wrapped with @instrument(report); inside it, stage(name)
+# marks where the next phase begins (load, filter, aggregate, render). Each stage
+# records its wall time and the change in process RSS. Finished runs are kept for
+# the admin sidebar panel and appended as one JSON line to PERF_LOG.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PERF_LOG = os.environ.get('PERF_LOG', os.path.join(BASE_DIR, 'logs', 'perf.jsonl'))
+SLOW_MS = float(os.environ.get('PERF_SLOW_MS', 2000))
+ADMIN_USERS = {name.strip() for name in os.environ.get('ADMIN_USERS', 'admin').split(',') if name.strip()}
+
+_local = threading.local()
+_recent = deque(maxlen=500)
+_lock = threading.Lock()
+
+
+# --- Resident memory of this process (0 when the platform gives no reading) ---
+def process_rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+gauge_callback('dashboard_process_resident_memory_bytes', process_rss, 'Resident memory of the dashboard process.')
+
+
+def is_admin(username):
+    return username in ADMIN_USERS
+
+
+def _close_stage(run):
+    current = run.pop('_open', None)
+    if current is None:
+        return
+    name, started, rss_before = current
+    run['stages'].append({
+        'stage': name,
+        'ms': round((time.perf_counter() - started) * 1000, 1),
+        'rss_delta_mb': round((process_rss() - rss_before) / 2**20, 1),
+    })
+
+
+# --- Report whose main() is running on this thread, if any ---
+def current_report():
+    run = getattr(_local, 'run', None)
+    return run['report'] if run else None
+
+
+# --- Mark the start of the next stage; closes the one before it ---
+def stage(name):
+    run = getattr(_local, 'run', None)
+    if run is None:
+        return
+    _close_stage(run)
+    run['_open'] = (name, time.perf_counter(), process_rss())
+
+
+def _write_log(run):
+    try:
+        os.makedirs(os.path.dirname(PERF_LOG), exist_ok=True)
+        with _lock, open(PERF_LOG, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(run) + '\n')
+    except OSError:
+        pass
+
+
+def instrument(report):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            outer = getattr(_local, 'run', None)
+            run = {'report': report, 'time': time.time(), 'status': 'ok', 'stages': []}
+            _local.run = run
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except BaseException as e:
+                # st.stop() and reruns also end up here; they are recorded, not swallowed
+                run['status'] = type(e).__name__
+                raise
+            finally:
+                _close_stage(run)
+                run['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
+                run['rss_mb'] = round(process_rss() / 2**20, 1)
+                run['slow'] = run['total_ms'] >= SLOW_MS
+                observe('dashboard_report_rerun_seconds', {'report': report}, run['total_ms'] / 1000)
+                _local.run = outer
+                _local.last = run
+                with _lock:
+                    _recent.append(run)
+                _write_log(run)
+        return wrapper
+    return decorator
+
+
+# --- The run finished on this thread since the last call (one per rerun) ---
+def pop_last_run():
+    run = getattr(_local, 'last', None)
+    _local.last = None
+    return run
+
+
+# --- Per-report totals over recent runs in this process, slowest first ---
+def report_summary():
+    with _lock:
+        runs = list(_recent)
+    by_report = {}
+    for run in runs:
+        by_report.setdefault(run['report'], []).append(run['total_ms'])
+
+    summary = []
+    for report, totals in by_report.items():
+        totals.sort()
+        summary.append({
+            'report': report,
+            'runs': len(totals),
+            'median_ms': totals[len(totals) // 2],
+            'max_ms': totals[-1],
+            'slow_runs': sum(total >= SLOW_MS for total in totals),
+        })
+    return sorted(summary, key=lambda row: row['median_ms'], reverse=True)
@@ -1,39 +1,18 @@
 import streamlit as st
 import pandas as pd
-import os
-
-def main():
-    FILE_PATH = r"PnL.csv"
-    st.title("📈 Profit & Loss Summary")
-
-    # File check
-    if not os.path.exists(FILE_PATH):
-        st.error(f"❌ File not found at: {FILE_PATH}")
-        st.stop()
-
-    df = pd.read_csv(FILE_PATH)
-    df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce')
-
-    # Sidebar Filters
-    years = sorted(df['Year'].dropna().unique())
+from table_view import render_table
+from downloads import download_button
+from datasets import get_dataset, dataset_version
+from perf import instrument, stage
+from result_cache import memoize
+from money import to_rupees
+from facets import facet_values, keep_valid
+
+# --- P&L cards and statement rows for one selection (no widgets; also used by batch_reports) ---
+def pnl_statement(df, year, month, location):
     months = sorted(df['Month'].dropna().unique())
-    locations = sorted(df['Location'].dropna().unique())
-
-    st.sidebar.markdown("### 🔍 Filter Data")
-
-    year = st.sidebar.multiselect("Select Year", ["Select All"] + years, default=None)
-    if "Select All" in year or not year:
-        year = years
-
-    month = st.sidebar.multiselect("Select Month", ["Select All"] + months, default=None)
-    if "Select All" in month or not month:
-        month = months
-
-    location = st.sidebar.multiselect("Select Location", ["Select All"] + locations, default=None)
-    if "Select All" in location or not location:
-        location = locations
 
-    # Filter data based on sidebar
+    # Filter to the selection
     df_filtered = df[
         (df['Year'].isin(year)) &
         (df['Month'].isin(month)) &
@@ -51,61 +30,6 @@ def main():
     gross_profit = revenue - food_cost
     net_profit = revenue - food_cost - operating_cost
 
-    def format_currency(amount):
-        return f"₹ {amount:,.0f}"
-
-    pct = lambda x: f"{(x / revenue * 100):.2f}%" if revenue else "0.00%"
-
-    # CSS (cards style)
-    st.markdown("""
-    <style>
-    .card {
-        background-color: #ffffff;
-        border-radius: 15px;
-        padding: 20px;
-        margin: 10px 5px;
-        box-shadow: 2px 2px 8px rgba(0,0,0,0.08);
-        border: 1px solid #ccc;
-        text-align: center;
-    }
-    .card p {
-        font-size: 20px;
-        margin: 0;
-        font-weight: bold;
-        color: #000000;
-    }
-    .card span {
-        font-size: 14px;
-        color: #000000;
-        font-weight: bold;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-    def render_card(title, amount, percent, color):
-        st.markdown(f"""
-        <div class='card'>
-            <h3 style='color: {color}; font-weight: bold;'>{title}</h3>
-            <p>{amount}</p>
-            <span>{percent}</span>
-        </div>
-        """, unsafe_allow_html=True)
-
-    # Cards layout with updated colors
-    col1, col2, col3 = st.columns(3)
-    with col1: render_card("Revenue", format_currency(revenue), pct(revenue), "#008000")  # Green
-    with col2: render_card("Expenses", format_currency(expense), pct(expense), "#FF0000")  # Red
-    with col3: render_card("Food Cost", format_currency(food_cost), pct(food_cost), "#FF0000")  # Red
-
-    col4, col5, col6 = st.columns(3)
-    with col4: render_card("Operating Cost", format_currency(operating_cost), pct(operating_cost), "#FF0000")  # Red
-    with col5: render_card("Gross Profit", format_currency(gross_profit), pct(gross_profit), "#008000")  # Green
-    with col6: render_card("Net Profit", format_currency(net_profit), pct(net_profit), "#008000")  # Green
-
-    # === Bottom Table ===
-    st.markdown("---")
-    st.subheader("📋 P&L Report")
-
     # Define Particulars
     particulars_list = [
         'Non AC', 'AC', 'Swiggy', 'Zomato', 'Takeaway',
@@ -193,7 +117,8 @@ def main():
 
     # Build data
     rows = []
-    rows.append({'Particulars': 'Revenue', 'Amount': '', 'Percentage': '', 'Previous Period': '', '% (Prev)': ''})
+    # Header row: amounts left blank as NaN so the amount columns stay numeric in every export
+    rows.append({'Particulars': 'Revenue', 'Amount': float('nan'), 'Percentage': '', 'Previous Period': float('nan'), '% (Prev)': ''})
 
     for name in particulars_list:
         amt = get_amount(name, df_filtered)
@@ -271,75 +196,151 @@ def main():
     rows.append({'Particulars': 'Net Profit', 'Amount': net_profit, 'Percentage': net_profit_percent,
                  'Previous Period': net_profit_prev, '% (Prev)': net_profit_prev_percent})
 
-    # === Render as HTML table ===
-    table_html = """
-    <style>
-    table.custom {
-        width: 100%;
-        border-collapse: collapse;
-        font-size: 18px;
+    # Everything above is summed in paise (money.py); rupees from here on
+    for row in rows:
+        for col in ('Amount', 'Previous Period'):
+            row[col] = to_rupees(row[col])
+
+    cards = {
+        'revenue': revenue, 'food_cost': food_cost, 'operating_cost': operating_cost,
+        'expense': expense, 'gross_profit': gross_profit, 'net_profit': net_profit,
     }
-    table.custom th, table.custom td {
+    return {name: to_rupees(value) for name, value in cards.items()}, rows
+
+# --- Statement rows as an export frame (rounded amounts, no currency symbol) ---
+def statement_export(rows):
+    # Convert rows to DataFrame for download
+    download_df = pd.DataFrame(rows)
+
+    # Format numeric columns for download (remove currency symbol; blank header rows stay NaN)
+    download_df[['Amount', 'Previous Period']] = download_df[['Amount', 'Previous Period']].astype('float64').round(0)
+    return download_df
+
+@memoize('pnl', datasets=['pnl'])
+def pnl_report(year, month, location):
+    return pnl_statement(get_dataset('pnl'), year, month, location)
+
+@instrument('pnl_dashboard')
+def main():
+    st.title("📈 Profit & Loss Summary")
+
+    # File check
+    stage('load')
+    try:
+        get_dataset('pnl')
+    except FileNotFoundError as e:
+        st.error(f"❌ File not found: {e}")
+        st.stop()
+
+    # Sidebar Filters (cascading; options from the 'pnl' facet index)
+    stage('filter')
+    st.sidebar.markdown("### 🔍 Filter Data")
+
+    years = facet_values('pnl', 'Year')
+    keep_valid("pnl_year", ["Select All"] + years)
+    year = st.sidebar.multiselect("Select Year", ["Select All"] + years, key="pnl_year")
+    if "Select All" in year or not year:
+        year = years
+
+    months = facet_values('pnl', 'Month', {'Year': year})
+    keep_valid("pnl_month", ["Select All"] + months)
+    month = st.sidebar.multiselect("Select Month", ["Select All"] + months, key="pnl_month")
+    if "Select All" in month or not month:
+        month = months
+
+    locations = facet_values('pnl', 'Location', {'Year': year, 'Month': month})
+    keep_valid("pnl_location", ["Select All"] + locations)
+    location = st.sidebar.multiselect("Select Location", ["Select All"] + locations, key="pnl_location")
+    if "Select All" in location or not location:
+        location = locations
+
+    # Cards and statement for the selection (memoized)
+    stage('aggregate')
+    cards, rows = pnl_report(tuple(year), tuple(month), tuple(location))
+    revenue = cards['revenue']
+    food_cost = cards['food_cost']
+    operating_cost = cards['operating_cost']
+    expense = cards['expense']
+    gross_profit = cards['gross_profit']
+    net_profit = cards['net_profit']
+
+    def format_currency(amount):
+        return f"₹ {amount:,.0f}"
+
+    pct = lambda x: f"{(x / revenue * 100):.2f}%" if revenue else "0.00%"
+
+    # CSS (cards style)
+    stage('render')
+    st.markdown("""
+    <style>
+    .card {
+        background-color: #ffffff;
+        border-radius: 15px;
+        padding: 20px;
+        margin: 10px 5px;
+        box-shadow: 2px 2px 8px rgba(0,0,0,0.08);
         border: 1px solid #ccc;
-        padding: 10px;
-        text-align: left;
+        text-align: center;
     }
-    table.custom th {
-        background-color: #f2f2f2;
+    .card p {
+        font-size: 20px;
+        margin: 0;
         font-weight: bold;
+        color: #000000;
     }
-    .bold-row {
+    .card span {
+        font-size: 14px;
+        color: #000000;
         font-weight: bold;
     }
     </style>
-    <table class="custom">
-        <tr>
-            <th>Particulars</th>
-            <th>Amount</th>
-            <th>%</th>
-            <th>Previous Period</th>
-            <th>% (Prev)</th>
-        </tr>
-    """
+    """, unsafe_allow_html=True)
 
-    for row in rows:
-        bold_class = "bold-row" if row['Particulars'] in [
-            'Revenue', 'Total Sales', 'Total Food Cost', 'Gross Profit', 'Operating Cost', 'Net Profit'
-        ] else ""
-        amt_display = f"₹ {row['Amount']:,.0f}" if isinstance(row['Amount'], (int, float)) else ""
-        prev_display = f"₹ {row['Previous Period']:,.0f}" if isinstance(row['Previous Period'], (int, float)) else ""
-        perc_display = row.get('Percentage', '')
-        prev_perc_display = row.get('% (Prev)', '')
-
-        table_html += f"<tr class='{bold_class}'>" \
-                      f"<td>{row['Particulars']}</td>" \
-                      f"<td>{amt_display}</td>" \
-                      f"<td>{perc_display}</td>" \
-                      f"<td>{prev_display}</td>" \
-                      f"<td>{prev_perc_display}</td>" \
-                      f"</tr>"
-
-    table_html += "</table>"
-
-    st.markdown(table_html, unsafe_allow_html=True)
-
-    # === Add CSV Download Button ===
-    st.markdown("---")
-    st.markdown("### 📥 Download P&L Report as CSV")
+    def render_card(title, amount, percent, color):
+        st.markdown(f"""
+        <div class='card'>
+            <h3 style='color: {color}; font-weight: bold;'>{title}</h3>
+            <p>{amount}</p>
+            <span>{percent}</span>
+        </div>
+        """, unsafe_allow_html=True)
 
-    # Convert rows to DataFrame for download
-    download_df = pd.DataFrame(rows)
+    # Cards layout with updated colors
+    col1, col2, col3 = st.columns(3)
+    with col1: render_card("Revenue", format_currency(revenue), pct(revenue), "#008000")  # Green
+    with col2: render_card("Expenses", format_currency(expense), pct(expense), "#FF0000")  # Red
+    with col3: render_card("Food Cost", format_currency(food_cost), pct(food_cost), "#FF0000")  # Red
 
-    # Format numeric columns for download (remove currency symbol for csv)
-    download_df['Amount'] = download_df['Amount'].apply(lambda x: round(x,0) if isinstance(x, (int,float)) else "")
-    download_df['Previous Period'] = download_df['Previous Period'].apply(lambda x: round(x,0) if isinstance(x, (int,float)) else "")
+    col4, col5, col6 = st.columns(3)
+    with col4: render_card("Operating Cost", format_currency(operating_cost), pct(operating_cost), "#FF0000")  # Red
+    with col5: render_card("Gross Profit", format_currency(gross_profit), pct(gross_profit), "#008000")  # Green
+    with col6: render_card("Net Profit", format_currency(net_profit), pct(net_profit), "#008000")  # Green
 
-    csv = download_df.to_csv(index=False).encode('utf-8')
-    st.download_button(
-        label="⬇️ Download CSV",
-        data=csv,
-        file_name='PnL_Report.csv',
-        mime='text/csv'
+    # === Bottom Table ===
+    st.markdown("---")
+    st.subheader("📋 P&L Report")
+
+    # === Render statement table (fixed order, formatted server-side) ===
+    stage('table')
+    render_table(
+        pd.DataFrame(rows).rename(columns={'Percentage': '%'}),
+        key="pnl",
+        formats={'Amount': '₹ {:,.0f}', 'Previous Period': '₹ {:,.0f}'},
+        sortable=False,
+        bold_rows=['Revenue', 'Total Sales', 'Total Food Cost', 'Gross Profit', 'Operating Cost', 'Net Profit'],
+        bold_column='Particulars'
+    )
+
+    # === Add Download Button (generated on click) ===
+    st.markdown("---")
+    st.markdown("### 📥 Download P&L Report")
+
+    download_button(
+        "Download P&L Report",
+        lambda: statement_export(rows),
+        "PnL_Report",
+        fingerprint=("pnl", dataset_version('pnl'), tuple(year), tuple(month), tuple(location)),
+        key="pnl_download"
     )
 
 
@@ -0,0 +1,70 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datasets import DATASETS, get_dataset, dataset_version, is_loaded
+
+# === Background warm-up of every registered dataset ===
+# Runs in a process-wide thread pool so sessions never wait on datasets they
+# have not opened; a report that needs a dataset still loading waits only on it.
+
+PREWARM_WORKERS = int(os.environ.get('PREWARM_WORKERS', 4))
+
+_executor = ThreadPoolExecutor(max_workers=PREWARM_WORKERS, thread_name_prefix='prewarm')
+_futures = {}
+_versions = {}
+_lock = threading.Lock()
+
+
+def _safe_version(name):
+    try:
+        return dataset_version(name)
+    except FileNotFoundError:
+        return None
+
+
+def _warm(name):
+    get_dataset(name)
+    return name
+
+
+# --- Submit every dataset that is not loaded and not already being loaded ---
+def start_prewarm(names=None):
+    names = list(names or DATASETS)
+    # Base datasets first, so derived ones mostly find their parents ready
+    names.sort(key=lambda name: bool(DATASETS[name]['depends_on']))
+    with _lock:
+        for name in names:
+            future = _futures.get(name)
+            if future is not None and not future.done():
+                continue
+            if future is not None and is_loaded(name):
+                continue
+            # A failed load is retried only once its source files change
+            version = _safe_version(name)
+            if future is not None and future.exception() is not None and _versions.get(name) == version:
+                continue
+            _versions[name] = version
+            _futures[name] = _executor.submit(_warm, name)
+
+
+def prewarm_status():
+    with _lock:
+        futures = dict(_futures)
+    status = {}
+    for name in DATASETS:
+        future = futures.get(name)
+        if future is None:
+            status[name] = 'ready' if is_loaded(name) else 'pending'
+        elif not future.done():
+            status[name] = 'loading'
+        elif future.exception() is not None:
+            status[name] = f"failed: {future.exception()}"
+        else:
+            status[name] = 'ready'
+    return status
+
+
+def prewarm_progress():
+    status = prewarm_status()
+    finished = sum(1 for state in status.values() if state == 'ready' or state.startswith('failed'))
+    return finished, len(status), status
@@ -0,0 +1,124 @@
+import importlib
+import threading
+
+# === Report registry ===
+# Every page of the dashboard is declared here with its menu location, the
+# datasets it reads and an entry point given as "module:function". The entry
+# module is imported the first time the report is opened and then stays
+# resident, so server start only pays for the menu and a rerun only for the
+# report on screen. Adding a report is one register_report() call.
+
+REPORTS = {}
+MENU = {}
+LEAVES = {}
+HEADINGS = {}
+PROMPTS = {}
+
+_entries = {}
+_lock = threading.Lock()
+
+
+# --- Declaration ---
+def register_report(report_id, menu, entry=None, datasets=(), title=None):
+    # menu: labels from the section down to the report, e.g. ("Financial Reporting", "P&L Report");
+    #       the first two levels are sidebar radios, deeper levels radios on the page
+    # entry: "module:function" run to render the report; None shows "Coming Soon"
+    # datasets: registry datasets the report reads, warmed first when it is opened
+    # title: name used in the error message when the report fails
+    menu = tuple(menu)
+    REPORTS[report_id] = {
+        'menu': menu,
+        'entry': entry,
+        'datasets': list(datasets),
+        'title': title or menu[-1],
+    }
+    for depth in range(len(menu)):
+        options = MENU.setdefault(menu[:depth], [])
+        if menu[depth] not in options:
+            options.append(menu[depth])
+    LEAVES[menu] = report_id
+
+
+def menu_heading(path, heading):
+    HEADINGS[tuple(path)] = heading
+
+
+def menu_prompt(path, prompt):
+    PROMPTS[tuple(path)] = prompt
+
+
+# --- Labels one level below a menu path ---
+def menu_options(path):
+    return MENU[tuple(path)]
+
+
+# --- Report at a full menu path, None while the path is a submenu ---
+def report_at(path):
+    return LEAVES.get(tuple(path))
+
+
+# --- Import the entry point on first use; later calls reuse it ---
+def report_entry(report_id):
+    entry = _entries.get(report_id)
+    if entry is not None:
+        return entry
+    with _lock:
+        if report_id not in _entries:
+            module_name, func_name = REPORTS[report_id]['entry'].split(':')
+            _entries[report_id] = getattr(importlib.import_module(module_name), func_name)
+        return _entries[report_id]
+
+
+# === Registrations ===
+menu_prompt((), "Select Section")
+menu_prompt(("Sales Performance Analysis",), "Select a Report")
+menu_prompt(("Food Cost Analysis",), "Select a Report")
+menu_prompt(("Financial Reporting",), "Select a Report")
+menu_prompt(("Sales Performance Analysis", "Reconciliations"), "Choose Platform")
+menu_prompt(("Sales Performance Analysis", "Reconciliations", "Swiggy"), "Select Swiggy Report")
+
+menu_heading(("Sales Performance Analysis",), "📊 Sales Performance Analysis")
+menu_heading(("Sales Performance Analysis", "Reconciliations"), "🔄 Reconciliations")
+menu_heading(("Sales Performance Analysis", "Cash Variance"), "💰 Cash Variance")
+menu_heading(("Food Cost Analysis",), "🍽️ Food Cost Analysis")
+menu_heading(("Financial Reporting",), "📑 Financial Reporting")
+
+register_report(
+    'web_sales', ("Sales Performance Analysis", "Sales Growth"),
+    entry='web_sales:main', datasets=['sales', 'sales_facets', 'sales_daily', 'sales_forecast'], title="Sales Growth Report"
+)
+register_report(
+    'swiggy_reconciliation',
+    ("Sales Performance Analysis", "Reconciliations", "Swiggy", "Sales Reconciliation"),
+    entry='swiggy_reconciliation:main',
+    datasets=['swiggy_weekly', 'swiggy_weekly_facets'], title="Swiggy Sales Reconciliation"
+)
+register_report(
+    'swiggy_orders', ("Sales Performance Analysis", "Reconciliations", "Swiggy", "Order Level Reconciliation")
+)
+register_report('zomato', ("Sales Performance Analysis", "Reconciliations", "Zomato"), title="Zomato Reports")
+register_report(
+    'cvr', ("Sales Performance Analysis", "Cash Variance"),
+    entry='CVR:main', datasets=['cvr', 'cvr_facets'], title="Cash Variance Report"
+)
+register_report(
+    'ideal_vs_actual', ("Food Cost Analysis", "Ideal Vs Actual Food Cost"),
+    entry='ideal_vs_actual:main', datasets=['foodcost_cube', 'foodcost_cube_facets']
+)
+register_report(
+    'inventory_consumption', ("Food Cost Analysis", "Inventory Consumption Report"),
+    entry='inventory_consumption:main', datasets=['inventory_agg', 'inventory_agg_facets']
+)
+register_report(
+    'inventory_loss', ("Food Cost Analysis", "Inventory Loss Report"),
+    entry='inventory_loss:main', datasets=['inventory_agg', 'inventory_agg_facets', 'inventory_ledger']
+)
+register_report(
+    'dish_level', ("Food Cost Analysis", "Dish Level Costing Report"),
+    entry='dish_level:main', datasets=['dish', 'dish_facets']
+)
+register_report(
+    'pnl_dashboard', ("Financial Reporting", "P&L Report"),
+    entry='pnl_dashboard:main', datasets=['pnl', 'pnl_facets']
+)
+register_report('cash_flow', ("Financial Reporting", "Cash Flow Statement"))
@@ -0,0 +1,153 @@
+import os
+import sys
+import time
+import threading
+import datetime
+import functools
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from datasets import dataset_version
+from metrics import inc, gauge_callback
+from disk_cache import MIN_SECONDS, disk_get, disk_put
+
+# === Memoized report results ===
+# Keyed by (report, dataset versions, normalized filter tuple) and bounded by a
+# global byte budget; least recently used entries are evicted first. Results
+# that took a while to compute are also written to the on-disk cache, so a
+# restarted server answers them without recomputing.
+
+MAX_BYTES = int(float(os.environ.get('REPORT_CACHE_MB', 256)) * 1024 * 1024)
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+_report_stats = {}
+
+
+# --- Key normalization: widget values become hashable, order-stable tuples ---
+def normalize(value):
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), normalize(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((normalize(v) for v in value), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+# --- One filter value: a list/tuple is a selection (multiselect, date range), whose
+# order does not change the result, so its items are sorted like a set's ---
+def normalize_selection(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(sorted((normalize(v) for v in value), key=repr))
+    return normalize(value)
+
+
+# --- Size estimate used against the byte budget ---
+def estimate_bytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+# --- Results are shared between sessions; hand out shallow (copy-on-write) copies ---
+def _share(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_share(v) for v in value)
+    if isinstance(value, list):
+        return [_share(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _share(v) for k, v in value.items()}
+    return value
+
+
+def _record(report, outcome):
+    _stats[outcome] += 1
+    counts = _report_stats.setdefault(report, {'hits': 0, 'misses': 0})
+    counts[outcome] += 1
+    inc('dashboard_report_cache_requests_total', {'report': report, 'result': {'hits': 'hit', 'misses': 'miss'}[outcome]})
+
+
+def cached_result(report, datasets, filters, compute):
+    key = (report, tuple(dataset_version(name) for name in datasets), normalize(filters))
+
+    with _lock:
+        if key in _entries:
+            _entries.move_to_end(key)
+            _record(report, 'hits')
+            return _share(_entries[key][0])
+        _record(report, 'misses')
+
+    found, value = disk_get('results', key)
+    if not found:
+        started = time.perf_counter()
+        value = compute()
+        if time.perf_counter() - started >= MIN_SECONDS:
+            disk_put('results', key, value)
+    size = estimate_bytes(value)
+
+    with _lock:
+        if size <= MAX_BYTES and key not in _entries:
+            _entries[key] = (value, size)
+            _stats['bytes'] += size
+            while _stats['bytes'] > MAX_BYTES:
+                _, (_, evicted_size) = _entries.popitem(last=False)
+                _stats['bytes'] -= evicted_size
+                _stats['evictions'] += 1
+    return _share(value)
+
+
+# --- Decorator: every argument is treated as a filter value ---
+def memoize(report, datasets):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Positional order is kept; each argument's own items are not
+            filters = (
+                func.__name__, tuple(normalize_selection(arg) for arg in args),
+                {name: normalize_selection(arg) for name, arg in kwargs.items()}
+            )
+            return cached_result(report, datasets, filters, lambda: func(*args, **kwargs))
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _stats['bytes'] = 0
+
+
+def cache_stats():
+    with _lock:
+        lookups = _stats['hits'] + _stats['misses']
+        return {
+            'hits': _stats['hits'],
+            'misses': _stats['misses'],
+            'hit_rate': _stats['hits'] / lookups if lookups else 0.0,
+            'evictions': _stats['evictions'],
+            'entries': len(_entries),
+            'bytes': _stats['bytes'],
+            'max_bytes': MAX_BYTES,
+            'reports': {name: dict(counts) for name, counts in _report_stats.items()},
+        }
+
+
+gauge_callback('dashboard_report_cache_bytes', lambda: _stats['bytes'], 'Bytes held by the report result cache.')
+gauge_callback('dashboard_report_cache_entries', lambda: len(_entries), 'Entries in the report result cache.')
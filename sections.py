@@ -0,0 +1,25 @@
+import functools
+import streamlit as st
+from perf import current_report, instrument, stage
+
+# === Report sections as fragments ===
+# A section's parameters are the filter values it depends on. Widgets inside a
+# section rerun only that section (st.fragment); a sidebar filter change still
+# reruns the page and hands every section its new inputs, and the memoized
+# compute behind each section only recomputes when its own inputs changed.
+# Full-page runs time the section as a stage of the report; section-only
+# reruns are logged as their own run, "<report>/<section>".
+
+def section(report, name):
+    def decorator(func):
+        timed = instrument(f"{report}/{name}")(func)
+
+        @st.fragment
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_report() is None:
+                return timed(*args, **kwargs)
+            stage(name)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,71 @@
+import os
+import glob
+import hashlib
+import importlib.util
+from disk_cache import CODE_VERSION
+
+# === Processed datasets shared between server processes ===
+# With DATASET_SHARE_DIR set, every dataset the registry builds is also written
+# there as an uncompressed Arrow IPC (Feather v2) file named after the dataset,
+# its source fingerprint and the code version. Another worker that needs the
+# same version maps the file instead of re-reading Input files/: numeric and
+# string columns stay views on the mapped pages, which the OS keeps once for
+# all workers.
+# Needs pyarrow; without it, or without the setting, nothing is shared.
+
+SHARE_DIR = os.environ.get('DATASET_SHARE_DIR')
+ENABLED = bool(SHARE_DIR) and importlib.util.find_spec('pyarrow') is not None
+
+
+def _path(name, version):
+    digest = hashlib.sha1(repr((CODE_VERSION, version)).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(SHARE_DIR, f'{name}-{digest}.arrow')
+
+
+# --- The frame for (name, version) if some process already wrote it, else None ---
+def load_shared(name, version):
+    if not ENABLED:
+        return None
+    path = _path(name, version)
+    if not os.path.exists(path):
+        return None
+
+    import pyarrow as pa
+
+    try:
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    except (OSError, pa.ArrowException):
+        return None
+    return table.to_pandas(split_blocks=True)
+
+
+# --- Write (name, version) for the other workers; older versions are removed ---
+def store_shared(name, version, df):
+    if not ENABLED:
+        return False
+
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    path = _path(name, version)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(SHARE_DIR, exist_ok=True)
+        # Uncompressed, or the readers would have to decompress into private memory
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError, pa.ArrowException):
+        # Columns Arrow cannot hold (mixed Python objects) keep the dataset per-process
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+    # Processes still mapping an old file keep their pages until they let go of them
+    for old in glob.glob(os.path.join(SHARE_DIR, f'{glob.escape(name)}-*.arrow')):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+    return True
+
@@ -1,33 +1,10 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-
-# === FILE PATHS ===
-input_path = r"output files"
-pos_file = f"{input_path}\\swiggy_pos.xlsx"
-mapping_file = f"{input_path}\\swiggy_mapping_table.xlsx"
-
-@st.cache_data
-def load_data():
-    pos_df = pd.read_excel(pos_file, usecols=['Deployment', 'Order Id', 'Bill Date', 'Gross Bill Amount', 'Source'], parse_dates=['Bill Date'])
-    map_df = pd.read_excel(mapping_file, usecols=['Restaurant ID', 'Deployment'])
-
-    pos_df['Deployment'] = pos_df['Deployment'].astype(str).str.strip()
-    map_df['Deployment'] = map_df['Deployment'].astype(str).str.strip()
-    map_df['Restaurant ID'] = map_df['Restaurant ID'].astype(str).str.strip()
-
-    merged_df = pos_df.merge(
-        map_df[['Restaurant ID', 'Deployment']],
-        how='left',
-        on='Deployment'
-    )
-    merged_df.rename(columns={'Deployment': 'Location'}, inplace=True)
-
-    merged_df['Year'] = merged_df['Bill Date'].dt.year
-    merged_df['Month'] = merged_df['Bill Date'].dt.month
-    merged_df['MonthName'] = merged_df['Bill Date'].dt.strftime('%B')
-
-    return merged_df
+from datasets import get_dataset
+from perf import instrument, stage
+from result_cache import memoize
+from facets import facet_values, keep_valid
 
 def generate_weeks(year, month):
     start_date = datetime(year, month, 1)
@@ -80,39 +57,8 @@ def assign_week_label(df):
     df['WeekLabel'] = df['SwiggyWeekStart'].dt.strftime('%Y-%m-%d') + ' - ' + df['SwiggyWeekEnd'].dt.strftime('%Y-%m-%d')
     return df
 
-# === MAIN FUNCTION ===
-def main():
-    df = load_data()
-    df = assign_week_label(df)
-
-    st.title("Swiggy POS Sales Dashboard")
-
-    with st.sidebar:
-        year_options = sorted(df['Year'].dropna().unique())
-        selected_year = st.selectbox("Select Year (optional)", options=[None] + year_options, index=0)
-
-        if selected_year:
-            month_options = sorted(
-                df[df['Year'] == selected_year]['MonthName'].dropna().unique(),
-                key=lambda x: datetime.strptime(x, '%B').month
-            )
-        else:
-            month_options = sorted(df['MonthName'].dropna().unique(), key=lambda x: datetime.strptime(x, '%B').month)
-        selected_month = st.selectbox("Select Month (optional)", options=[None] + month_options, index=0)
-
-        if selected_year and selected_month:
-            week_options = sorted(
-                df[(df['Year'] == selected_year) & (df['MonthName'] == selected_month)]['WeekLabel'].dropna().unique()
-            )
-        else:
-            week_options = sorted(df['WeekLabel'].dropna().unique())
-        selected_week = st.selectbox("Select Week (optional)", options=[None] + week_options, index=0)
-
-        location_options = sorted(df['Location'].dropna().unique())
-        selected_locations = st.multiselect("Select Location(s)", options=location_options, default=location_options)
-
-    # Apply filters
-    filtered_df = df.copy()
+def apply_filters(df, selected_year, selected_month, selected_week, selected_locations):
+    filtered_df = df
     if selected_year:
         filtered_df = filtered_df[filtered_df['Year'] == selected_year]
     if selected_month:
@@ -121,8 +67,48 @@ def main():
         filtered_df = filtered_df[filtered_df['WeekLabel'] == selected_week]
     if selected_locations:
         filtered_df = filtered_df[filtered_df['Location'].isin(selected_locations)]
+    return filtered_df
+
+# --- Totals for one selection (no widgets) ---
+def pos_total(df, selected_year, selected_month, selected_week, selected_locations):
+    return apply_filters(df, selected_year, selected_month, selected_week, selected_locations)['Gross Bill Amount'].sum()
+
+@memoize('swiggy_reconciliation', datasets=['swiggy_weekly'])
+def pos_sales(selected_year, selected_month, selected_week, selected_locations):
+    return pos_total(get_dataset('swiggy_weekly'), selected_year, selected_month, selected_week, selected_locations)
+
+# === MAIN FUNCTION ===
+@instrument('swiggy_reconciliation')
+def main():
+    st.title("Swiggy POS Sales Dashboard")
 
-    total_sales = filtered_df['Gross Bill Amount'].sum()
+    # Cascading filters from the 'swiggy_weekly' facet index (month names in calendar order);
+    # the first lookup loads the dataset, with week labels already assigned
+    stage('filter')
+    with st.sidebar:
+        year_options = [None] + facet_values('swiggy_weekly', 'Year')
+        keep_valid("swiggy_year", year_options)
+        selected_year = st.selectbox("Select Year (optional)", options=year_options, index=0, key="swiggy_year")
+
+        month_options = [None] + facet_values('swiggy_weekly', 'MonthName', {'Year': selected_year})
+        keep_valid("swiggy_month", month_options)
+        selected_month = st.selectbox("Select Month (optional)", options=month_options, index=0, key="swiggy_month")
+
+        week_options = [None] + facet_values('swiggy_weekly', 'WeekLabel', {'Year': selected_year, 'MonthName': selected_month})
+        keep_valid("swiggy_week", week_options)
+        selected_week = st.selectbox("Select Week (optional)", options=week_options, index=0, key="swiggy_week")
+
+        location_options = facet_values(
+            'swiggy_weekly', 'Location', {'Year': selected_year, 'MonthName': selected_month, 'WeekLabel': selected_week}
+        )
+        # All locations at first, and again once none of the chosen ones is offered
+        keep_valid("swiggy_locations", location_options, default=location_options)
+        selected_locations = st.multiselect("Select Location(s)", options=location_options, key="swiggy_locations")
+
+    # Apply filters
+    stage('aggregate')
+    total_sales = pos_sales(selected_year, selected_month, selected_week, tuple(selected_locations))
 
+    stage('render')
     st.header("Sales as per POS (Swiggy)")
     st.metric("Gross Bill Amount (₹)", f"{total_sales:,.0f}")
@@ -0,0 +1,74 @@
+import math
+import numbers
+import streamlit as st
+import pandas as pd
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# --- Format only the visible rows; non-numeric cells (labels, blanks) pass through ---
+def format_page(page, formats):
+    page = page.copy()
+    for col, fmt in (formats or {}).items():
+        if col not in page.columns:
+            continue
+        formatter = fmt if callable(fmt) else fmt.format
+        page[col] = [
+            formatter(v) if isinstance(v, (numbers.Number, pd.Timestamp)) and not pd.isna(v) else ('' if pd.isna(v) else v)
+            for v in page[col]
+        ]
+    return page
+
+# --- Server-side paginated, sorted table: only the visible page is styled and sent ---
+# A fragment: sorting and paging rerun just the table, not the page
+@st.fragment
+def render_table(df, key, formats=None, page_size=50, sortable=True, default_sort=None,
+                 ascending=True, footer=None, bold_rows=None, bold_column=None):
+    total_rows = len(df)
+
+    if sortable and total_rows:
+        col_sort, col_order = st.columns([3, 1])
+        columns = list(df.columns)
+        sort_col = col_sort.selectbox(
+            "Sort by", columns,
+            index=columns.index(default_sort) if default_sort in columns else 0,
+            key=f"{key}_sort"
+        )
+        order = col_order.radio(
+            "Order", ["Ascending", "Descending"],
+            index=0 if ascending else 1, horizontal=True, key=f"{key}_order"
+        )
+        df = df.sort_values(sort_col, ascending=(order == "Ascending"), kind="stable")
+
+    if total_rows > page_size:
+        col_page, col_size = st.columns([3, 1])
+        size = col_size.selectbox(
+            "Rows per page", PAGE_SIZES,
+            index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 0,
+            key=f"{key}_size"
+        )
+        n_pages = max(1, math.ceil(total_rows / size))
+        page_key = f"{key}_page"
+        if st.session_state.get(page_key, 1) > n_pages:
+            st.session_state[page_key] = 1
+        # No value=: the keyed session state holds the page (min_value on first draw)
+        page_num = col_page.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key)
+    else:
+        size, page_num = max(total_rows, 1), 1
+
+    start = (page_num - 1) * size
+    page = df.iloc[start:start + size]
+    if footer is not None:
+        page = pd.concat([page, footer], ignore_index=True)
+    page = format_page(page, formats)
+
+    if bold_rows and bold_column:
+        styled = page.style.apply(
+            lambda row: ['font-weight: bold' if row[bold_column] in bold_rows else '' for _ in row],
+            axis=1
+        )
+        st.dataframe(styled, use_container_width=True, hide_index=True)
+    else:
+        st.dataframe(page, use_container_width=True, hide_index=True)
+
+    if total_rows > size:
+        st.caption(f"Rows {start + 1:,}–{min(start + size, total_rows):,} of {total_rows:,}")
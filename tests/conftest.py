@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# The dashboard modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the on-disk result cache and the forecast state out of the real ones
+os.environ.setdefault('RESULT_CACHE_DIR', tempfile.mkdtemp(prefix='dashboard_tests_'))
+os.environ.setdefault('FORECAST_STATE', '')
@@ -0,0 +1,56 @@
+import math
+import numpy as np
+import pandas as pd
+from charts import downsample_series, lttb
+
+
+# Point-by-point LTTB as in Steinarsson's reference implementation
+def reference_lttb(x, y, threshold):
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    keep, a = [0], 0
+    for i in range(threshold - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        keep.append(best)
+        a = best
+    return keep + [n - 1]
+
+
+def test_matches_the_reference_implementation():
+    rng = np.random.default_rng(7)
+    for n, threshold in [(100, 10), (1000, 97), (5000, 1000), (37, 36)]:
+        x = np.cumsum(rng.uniform(0.5, 1.5, n))
+        y = rng.normal(size=n).cumsum()
+        assert lttb(x, y, threshold).tolist() == reference_lttb(x.tolist(), y.tolist(), threshold)
+
+
+def test_short_series_are_kept_whole():
+    assert lttb(np.arange(5), np.ones(5), 10).tolist() == [0, 1, 2, 3, 4]
+    assert lttb(np.arange(5), np.ones(5), 2).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_keeps_endpoints_and_a_spike():
+    y = np.zeros(1000)
+    y[437] = 50.0
+    keep = lttb(np.arange(1000), y, 20)
+    assert len(keep) == 20 and keep[0] == 0 and keep[-1] == 999
+    assert 437 in keep
+    assert (np.diff(keep) > 0).all()
+
+
+def test_downsample_series_long_frame():
+    dates = pd.date_range('2024-01-01', periods=400, freq='D', name='Date')
+    wide = pd.DataFrame({'Baga': np.arange(400.0), 'Anjuna': np.ones(400)}, index=dates)
+    points = downsample_series(wide, max_points=50, series_name='Outlet Name')
+    assert points.columns.tolist() == ['Date', 'Outlet Name', 'Sales Value']
+    assert points.groupby('Outlet Name').size().to_dict() == {'Anjuna': 50, 'Baga': 50}
+    baga = points[points['Outlet Name'] == 'Baga']
+    assert baga['Date'].iloc[0] == dates[0] and baga['Date'].iloc[-1] == dates[-1]
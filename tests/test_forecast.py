@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+import forecast
+from forecast import DECAY, RIDGE, SERIES_KEYS, design, forecast_frame, solve, update_state
+
+STATISTICS = ['A', 'b', 'c', 'n', 'n2', 'L', 'bx', 'by', 'cl', 'nl', 'sx', 'sy', 'sn', 'sn2', 'days', 'first', 'last']
+
+
+def _daily():
+    # Two years of weekly-patterned sales; 'Candolim' opens only in the last month
+    rng = np.random.default_rng(5)
+    dates = pd.date_range('2023-01-01', '2024-12-31', freq='D')
+    frames = []
+    for outlet, tab, level, opened in [
+        ('Baga', 'AC', 40000, '2023-01-01'), ('Baga', 'Bar', 15000, '2023-03-10'),
+        ('Anjuna', 'AC', 25000, '2023-01-01'), ('Candolim', 'AC', 30000, '2024-12-05'),
+    ]:
+        days = dates[dates >= opened]
+        rupees = level * (1 + 0.3 * (days.dayofweek >= 5)) + rng.normal(0, level * 0.1, len(days))
+        frames.append(pd.DataFrame({
+            'Date': days, 'Outlet Name': outlet, 'Tabs': tab, 'Sales Value': (rupees * 100).round().astype('int64')
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _by_series(state):
+    return {series: i for i, series in enumerate(state['series'])}
+
+
+def test_incremental_refit_matches_full_refit():
+    daily = _daily()
+    cut = pd.Timestamp('2024-11-20')
+    full = update_state(None, daily)
+    earlier = update_state(None, daily[daily['Date'] <= cut])
+    incremental = update_state(earlier, daily)
+    assert (full['refit'], incremental['refit']) == ('full refit', 'incremental refit')
+
+    order = [_by_series(incremental)[series] for series in full['series']]
+    for key in STATISTICS:
+        expected, actual = full[key], incremental[key][order]
+        scale = max(1.0, np.abs(expected).max())
+        # Differences are floating-point rounding only (about 1e-15 relative)
+        assert np.abs(expected - actual).max() / scale < 1e-12, key
+
+    frame_full = forecast_frame(full)
+    frame_incremental = forecast_frame(incremental).set_index(SERIES_KEYS + ['Week_Start'])
+    frame_incremental = frame_incremental.loc[frame_full.set_index(SERIES_KEYS + ['Week_Start']).index]
+    np.testing.assert_allclose(frame_incremental['Forecast'], frame_full['Forecast'], rtol=1e-9)
+
+
+def test_coefficients_match_a_direct_weighted_least_squares_fit():
+    daily = _daily()
+    state = update_state(None, daily)
+    beta = solve(state)[0][_by_series(state)[('Baga', 'Bar')]]
+
+    rows = daily[(daily['Outlet Name'] == 'Baga') & (daily['Tabs'] == 'Bar')]
+    days = (rows['Date'] - forecast.ORIGIN).dt.days.to_numpy()
+    grid = np.arange(days.min(), state['through'] + 1)
+    y = np.zeros(len(grid))
+    y[days - days.min()] = rows['Sales Value'] / 100
+    w = DECAY ** (state['through'] - grid)
+    X = design(grid)
+    penalty = np.diag(np.r_[0.0, np.full(X.shape[1] - 1, RIDGE)])
+    expected = np.linalg.solve(X.T @ (w[:, None] * X) + penalty, X.T @ (w * y))
+    np.testing.assert_allclose(beta, expected, rtol=1e-8, atol=1e-6)
+
+
+def test_changed_history_or_no_new_days():
+    daily = _daily()
+    state = update_state(None, daily[daily['Date'] <= '2024-11-30'])
+    assert update_state(state, daily[daily['Date'] <= '2024-11-30'])['refit'] == 'already up to date'
+
+    # A re-exported day already fitted forces a full refit
+    changed = daily.copy()
+    changed.loc[0, 'Sales Value'] += 100
+    assert update_state(state, changed)['refit'] == 'full refit'
+
+
+def test_forecast_frame_weeks_and_intervals():
+    state = update_state(None, _daily())
+    frame = forecast_frame(state, weeks=4)
+    # Candolim has under MIN_DAYS of history, so it is not forecast
+    assert set(map(tuple, frame[SERIES_KEYS].drop_duplicates().to_numpy())) == {
+        ('Baga', 'AC'), ('Baga', 'Bar'), ('Anjuna', 'AC')
+    }
+    assert frame.groupby(SERIES_KEYS).size().eq(4).all()
+    assert (frame['Week_Start'].dt.dayofweek == 0).all()
+    assert frame['Week_Start'].min() == pd.Timestamp('2025-01-06')
+    # A steady Baga AC week is about 7 × 40000 × (1 + 0.3 × 2/7)
+    baga = frame[(frame['Outlet Name'] == 'Baga') & (frame['Tabs'] == 'AC')]
+    assert baga['Forecast'].iloc[0] == pytest.approx(7 * 40000 * (1 + 0.3 * 2 / 7), rel=0.05)
+    assert (baga['Cumulative Std Error'].diff().dropna() > 0).all()
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from inventory_ledger import build_ledger, ledger_breaks, shrinkage_by_item, shrinkage_trend
+
+
+def _agg(rows):
+    columns = [
+        'Location', 'Item', 'UOM', 'Year', 'Month', 'Opening Stock (Qty)', 'Purchases (Qty)',
+        'Consumption (Qty)', 'Ideal Closing Stock', 'Actual Closing Stock', 'Variance'
+    ]
+    return pd.DataFrame(rows, columns=columns)
+
+
+# Oil at Baga over three months, Jam over two with March missing; rows out of order
+AGG = _agg([
+    ('Baga', 'Oil', 'L', 2024, 'March', 9, 10, 6, 13, 13, 0),
+    ('Baga', 'Oil', 'L', 2024, 'January', 10, 5, 4, 11, 10, -4500),
+    ('Baga', 'Oil', 'L', 2024, 'February', 10, 2, 3, 9, 9, 0),
+    ('Baga', 'Jam', 'Kg', 2024, 'April', 5, 0, 1, 4, 3, -20000),
+    ('Baga', 'Jam', 'Kg', 2024, 'February', 6, 0, 1, 5, 5, 0),
+])
+
+
+def test_book_and_carry_forward_identities():
+    ledger = build_ledger(AGG)
+    # opening + purchases - consumption = ideal closing on every row
+    assert ledger['Book Gap'].tolist() == [0] * len(AGG)
+    assert not ledger['Book Break'].any()
+
+    # Sorted by series and month; opening stock follows the previous actual closing
+    oil = ledger[ledger['Item'] == 'Oil']
+    assert oil['Month'].tolist() == ['January', 'February', 'March']
+    assert np.isnan(oil['Prev Actual Closing'].iloc[0])
+    assert oil['Prev Actual Closing'].iloc[1:].tolist() == [10, 9]
+    assert oil['Carry-forward Gap'].tolist() == [0, 0, 0]
+
+
+def test_identity_breaks_are_flagged():
+    broken = AGG.copy()
+    broken.loc[2, 'Opening Stock (Qty)'] = 12
+    ledger = build_ledger(broken)
+    feb = ledger[(ledger['Item'] == 'Oil') & (ledger['Month'] == 'February')].iloc[0]
+    assert feb['Carry-forward Gap'] == 2 and feb['Carry-forward Break']
+    assert feb['Book Gap'] == 2 and feb['Book Break']
+
+
+def test_breaks_and_missing_months():
+    ledger = build_ledger(AGG)
+    breaks = ledger_breaks(ledger)
+    jam_april = breaks[(breaks['Item'] == 'Jam') & (breaks['Month'] == 'April')]
+    assert len(breaks) == 1 and len(jam_april) == 1
+    assert bool(jam_april['Missing Month'].iloc[0])
+    assert not bool(jam_april['Carry-forward Break'].iloc[0])
+
+
+def test_cumulative_shrinkage_restarts_per_series():
+    ledger = build_ledger(AGG)
+    oil = ledger[ledger['Item'] == 'Oil']
+    jam = ledger[ledger['Item'] == 'Jam']
+    assert oil['Shrinkage (Qty)'].tolist() == [-1, 0, 0]
+    assert oil['Cumulative Shrinkage (Value)'].tolist() == [-4500, -4500, -4500]
+    assert jam['Cumulative Shrinkage (Value)'].tolist() == [0, -20000]
+    # Paise stay integers through the running totals
+    assert ledger['Cumulative Shrinkage (Value)'].dtype.kind == 'i'
+
+    summary = shrinkage_by_item(ledger).set_index('Item')
+    assert summary.loc['Jam', 'Shrinkage (Value)'] == -20000
+    assert summary.loc['Oil', 'Months'] == 3
+
+    trend = shrinkage_trend(ledger, 'Oil', 'L')
+    assert trend.index.tolist() == ['Jan 2024', 'Feb 2024', 'Mar 2024']
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from money import downcast, money_columns, parse_amount, percent_of, rupee_columns, to_paise, to_rupees
+
+
+def test_to_paise_parses_text_and_rounds():
+    paise = to_paise(['₹1,234.50', ' 12 ', '-0.07', '', None, 'n/a', '0.005'])
+    assert paise.dtype == 'int64'
+    # Blanks and unparseable text count as 0; half a paisa rounds to even
+    assert paise.tolist() == [123450, 1200, -7, 0, 0, 0, 0]
+    assert to_paise([19.99, 0.1 + 0.2]).tolist() == [1999, 30]
+
+
+def test_parse_amount_keeps_blanks_as_nan():
+    assert np.isnan(parse_amount(['₹ 5', 'abc'])[1])
+    assert parse_amount(pd.Series([1.5, 2.0])).tolist() == [1.5, 2.0]
+
+
+def test_downcast_only_when_the_range_fits():
+    assert downcast(pd.Series([0, 2**31 - 1, -2**31], dtype='int64')).dtype == 'int32'
+    assert downcast(pd.Series([2**31], dtype='int64')).dtype == 'int64'
+    assert downcast(pd.Series([], dtype='int64')).dtype == 'int64'
+
+
+def test_sums_are_exact():
+    # A float sum of 0.10 a million times drifts; paise do not
+    paise = downcast(to_paise(np.full(1_000_000, 0.1)))
+    assert paise.dtype == 'int32'
+    assert paise.sum() == 10_000_000
+    assert to_rupees(paise.sum()) == 100000.0
+
+
+def test_money_and_rupee_columns_round_trip():
+    df = money_columns(pd.DataFrame({'Amount': ['₹10.25', '3'], 'Qty': [1, 2]}), ['Amount'])
+    assert df['Amount'].tolist() == [1025, 300] and df['Amount'].dtype == 'int32'
+    shown = rupee_columns(df, ['Amount'])
+    assert shown['Amount'].tolist() == [10.25, 3.0]
+    # The input frame keeps its paise
+    assert df['Amount'].tolist() == [1025, 300]
+
+
+def test_percent_of_uses_exact_totals():
+    assert percent_of(np.array([25, 1]), np.array([100, 3])).tolist() == [25.0, 100 / 3]
+    with np.errstate(all='raise'):
+        assert np.isnan(percent_of(0, 0))
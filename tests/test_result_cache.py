@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import result_cache
+from result_cache import cache_stats, cached_result, memoize
+
+
+@pytest.fixture(autouse=True)
+def small_cache(monkeypatch):
+    # Room for three 1 KB arrays; the on-disk layer always misses
+    monkeypatch.setattr(result_cache, 'MAX_BYTES', 3 * 1024)
+    monkeypatch.setattr(result_cache, 'disk_get', lambda kind, key: (False, None))
+    monkeypatch.setattr(result_cache, 'disk_put', lambda kind, key, value: None)
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+def _compute(calls, name, size=128):
+    def compute():
+        calls.append(name)
+        return np.zeros(size)
+    return compute
+
+
+def test_least_recently_used_entry_is_evicted():
+    calls = []
+    evictions = cache_stats()['evictions']
+    for name in 'abc':
+        cached_result('test', [], name, _compute(calls, name))
+    cached_result('test', [], 'a', _compute(calls, 'a'))
+    cached_result('test', [], 'd', _compute(calls, 'd'))
+
+    assert calls == ['a', 'b', 'c', 'd']
+    assert cache_stats()['evictions'] == evictions + 1
+    assert cache_stats()['bytes'] == 3 * 1024
+    # 'a' was used after 'b', so 'b' went
+    cached_result('test', [], 'a', _compute(calls, 'a'))
+    cached_result('test', [], 'b', _compute(calls, 'b'))
+    assert calls == ['a', 'b', 'c', 'd', 'b']
+
+
+def test_result_over_budget_is_not_kept():
+    calls = []
+    cached_result('test', [], 'big', _compute(calls, 'big', 1024))
+    cached_result('test', [], 'big', _compute(calls, 'big', 1024))
+    assert calls == ['big', 'big']
+    assert cache_stats()['entries'] == 0
+
+
+def test_selection_order_does_not_change_the_key():
+    calls = []
+
+    @memoize('test', datasets=[])
+    def total(outlets, year):
+        calls.append((outlets, year))
+        return len(outlets)
+
+    assert total(['Baga', 'Anjuna'], 2024) == 2
+    assert total(['Anjuna', 'Baga'], 2024) == 2
+    assert total(['Anjuna', 'Baga'], 2025) == 2
+    assert len(calls) == 2
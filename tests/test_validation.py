@@ -0,0 +1,81 @@
+import pandas as pd
+import validation
+from validation import (
+    QUARANTINE_COL, SOURCE_COL, WARNING_COL, flag_rows, passed_rows, quarantine_summary, quarantined_rows,
+    sales_read_rules, sales_warnings, swiggy_sales_read_rules, swiggy_sales_rules, warned_rows
+)
+from web_sales import preprocess_data
+
+TOMORROW = (pd.Timestamp.today().normalize() + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+
+
+def _sales_export():
+    return pd.DataFrame({
+        'Date': ['2024-03-01', 'not a date', '2024-03-02', '2024-03-03', TOMORROW],
+        'Outlet Name': ['Baga Navtara', 'Baga', 'Baga', 'Anjuna', 'Baga'],
+        'Tabs': ['AC', 'AC', 'AC', 'AC', 'AC'],
+        'Sale': ['₹1,000.00', '10', '100', '100', '100'],
+        'Discount': [100, 0, 0, 0, 0],
+        # 100 - 0 = 100 within a paisa; 95 is off by five rupees
+        'Net Sale': [900, 10, 100.01, 95, 100],
+        'Charges': [0, 0, 0, 0, 0],
+        'Total Tax': [0, 0, 0, 0, 0],
+        'Total Amount': [900, 10, 100, 95, 100],
+        'Round Off': [0, 0, 0, 0, 0],
+        'Gross Amount': [900, 10, 100, 90, 100],
+        'No Of Bills': [1, 1, 1, -1, 1],
+    })
+
+
+def test_sales_rules_tag_every_failing_check():
+    df = preprocess_data(_sales_export(), 'export.csv')
+    assert df[QUARANTINE_COL].tolist() == [
+        '',
+        'missing or unreadable Date',
+        '',
+        'Net Sale ≠ Sale − Discount; Gross Amount ≠ Total Amount + Round Off; negative No Of Bills',
+        '',
+    ]
+    assert (df[SOURCE_COL] == 'export.csv').all()
+
+
+def test_future_dates_are_quarantined_at_read_time():
+    df = preprocess_data(_sales_export(), 'export.csv')
+    passed = passed_rows(df, sales_read_rules)
+    quarantine = quarantined_rows(df, sales_read_rules)
+    assert len(passed) + len(quarantine) == len(df)
+    assert QUARANTINE_COL not in passed.columns
+    assert quarantine[QUARANTINE_COL].iloc[-1] == 'Date in the future'
+    # Without the read-time rule the future row passes
+    assert len(passed_rows(df)) == len(passed) + 1
+
+    summary = quarantine_summary(quarantine).set_index('Reason')
+    assert summary.loc['Net Sale ≠ Sale − Discount', 'Rows'] == 1
+    assert summary['Files'].max() == 1
+
+
+def test_unknown_outlets_and_tabs_are_warnings(monkeypatch):
+    monkeypatch.setattr(validation, 'KNOWN_OUTLETS', {'Baga'})
+    monkeypatch.setattr(validation, 'KNOWN_TABS', {'AC'})
+    sales = pd.DataFrame({'Outlet Name': ['Baga', 'Anjuna', 'Baga'], 'Tabs': ['AC', 'AC', 'Bar']})
+    warned = warned_rows(sales, sales_warnings)
+    assert warned[WARNING_COL].tolist() == ['unknown outlet', 'unknown tab']
+
+
+def test_swiggy_sales_rules():
+    bills = pd.DataFrame({
+        'Location': ['Baga', None, '', 'Baga', 'Baga'],
+        'Order Id': ['A1', 'A2', None, 'A4', 'A5'],
+        'Bill Date': pd.to_datetime(['2024-03-01', '2024-03-01', 'bad', '2024-03-01', TOMORROW], errors='coerce'),
+        'Gross Bill Amount': [250.0, 100.0, 50.0, -20.0, 10.0],
+        'Source': ['pos.csv'] * 5,
+    })
+    bills = flag_rows(bills, swiggy_sales_rules(bills))
+    assert bills[QUARANTINE_COL].tolist() == [
+        '', 'missing Location', 'missing or unreadable Bill Date; missing Order Id; missing Location',
+        'negative Gross Bill Amount', ''
+    ]
+    # The POS export's own Source column is kept
+    assert (bills[SOURCE_COL] == 'pos.csv').all()
+    assert passed_rows(bills, swiggy_sales_read_rules)['Order Id'].tolist() == ['A1']
+    assert quarantined_rows(bills, swiggy_sales_read_rules)[QUARANTINE_COL].iloc[-1] == 'Bill Date in the future'
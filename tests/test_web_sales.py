@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from money import to_rupees
+from web_sales import growth_matrix, period_keys, sply_keys
+
+
+def _daily(rows):
+    # (date, outlet, tab, rupees) -> daily frame with Sales Value in paise
+    daily = pd.DataFrame(rows, columns=['Date', 'Outlet Name', 'Tabs', 'Sales Value'])
+    daily['Date'] = pd.to_datetime(daily['Date'])
+    daily['Sales Value'] = (daily['Sales Value'] * 100).astype('int64')
+    return daily
+
+
+def test_month_previous_and_sply():
+    daily = _daily([
+        ('2024-03-05', 'Baga', 'AC', 100), ('2024-03-20', 'Baga', 'AC', 50),
+        ('2024-02-10', 'Baga', 'AC', 120),
+        ('2023-03-15', 'Baga', 'AC', 75),
+        ('2024-03-01', 'Anjuna', 'AC', 10),
+    ])
+    matrix = growth_matrix(daily, 'Month', pd.Timestamp('2024-03-01'), pd.Timestamp('2024-03-31'), [])
+    row = matrix.set_index(['Outlet', 'Tab']).loc[('Baga', 'AC')]
+    assert row['Period'] == 'March 2024'
+    assert (row['Current'], row['Previous'], row['SPLY']) == (150, 120, 75)
+    assert row['Growth %'] == pytest.approx(25.0)
+    assert row['SPLY Growth %'] == pytest.approx(100.0)
+
+    # No sales a month or a year earlier: growth is blank, not infinite
+    anjuna = matrix.set_index(['Outlet', 'Tab']).loc[('Anjuna', 'AC')]
+    assert anjuna['Previous'] == 0 and np.isnan(anjuna['Growth %']) and np.isnan(anjuna['SPLY Growth %'])
+
+
+def test_outlet_filter_and_empty_grid_cells():
+    daily = _daily([
+        ('2024-03-05', 'Baga', 'AC', 100), ('2024-03-05', 'Baga', 'Bar', 40),
+        ('2024-03-05', 'Anjuna', 'AC', 10),
+    ])
+    matrix = growth_matrix(daily, 'Month', pd.Timestamp('2024-02-01'), pd.Timestamp('2024-03-31'), ['Baga'])
+    assert set(matrix['Outlet']) == {'Baga'}
+    # Outlet × tab × month, with February's cells present as zeros
+    assert len(matrix) == 4
+    assert matrix[matrix['Period'] == 'February 2024']['Current'].tolist() == [0, 0]
+
+
+def test_period_offsets():
+    # Monday-based weeks; SPLY is 52 weeks back
+    monday, sunday = period_keys(['2024-03-04', '2024-03-10'], 'Week')
+    assert monday == sunday
+    assert period_keys(['2024-03-11'], 'Week')[0] == monday + 1
+    assert sply_keys(np.array([monday]), 'Week')[0] == period_keys(['2023-03-06'], 'Week')[0]
+
+    # Fiscal years run April–March
+    assert period_keys(['2024-03-31', '2024-04-01'], 'Fiscal Year').tolist() == [2023, 2024]
+
+    # Same calendar date last year; 29 Feb falls back to 28 Feb
+    leap_day, march_first = period_keys(['2024-02-29', '2024-03-01'], 'Day')
+    assert sply_keys(np.array([leap_day, march_first]), 'Day').tolist() == period_keys(
+        ['2023-02-28', '2023-03-01'], 'Day'
+    ).tolist()
+
+
+@pytest.mark.parametrize('grain', ['Day', 'Week', 'Month', 'Fiscal Year'])
+def test_matches_a_per_cell_lookup(grain):
+    rng = np.random.default_rng(11)
+    dates = pd.date_range('2022-01-01', '2024-06-30', freq='D')
+    daily = pd.DataFrame({
+        'Date': rng.choice(dates, 3000),
+        'Outlet Name': rng.choice(['Baga', 'Anjuna', 'Candolim'], 3000),
+        'Tabs': rng.choice(['AC', 'Bar'], 3000),
+        'Sales Value': rng.integers(0, 500000, 3000),
+    })
+    start, end = pd.Timestamp('2024-01-01'), pd.Timestamp('2024-06-30')
+    matrix = growth_matrix(daily, grain, start, end, [])
+
+    # Straightforward recomputation, one cell at a time (rows run outlet × tab × period)
+    keys = period_keys(daily['Date'], grain)
+    first, last = period_keys([start, end], grain)
+    periods = last - first + 1
+    assert len(matrix) == 3 * 2 * periods
+    for i, row in matrix.iloc[::max(1, len(matrix) // 60)].iterrows():
+        key = first + i % periods
+        series = (daily['Outlet Name'] == row['Outlet']) & (daily['Tabs'] == row['Tab'])
+        sply_key = sply_keys(np.array([key]), grain)[0]
+        assert row['Current'] == to_rupees(daily.loc[series & (keys == key), 'Sales Value'].sum())
+        assert row['Previous'] == to_rupees(daily.loc[series & (keys == key - 1), 'Sales Value'].sum())
+        assert row['SPLY'] == to_rupees(daily.loc[series & (keys == sply_key), 'Sales Value'].sum())
@@ -0,0 +1,180 @@
+import os
+import numpy as np
+import pandas as pd
+from metrics import set_gauge
+
+# === Row-level data quality checks at ingest ===
+# Each incoming file (a dataset partition) is checked with vectorized rules:
+# every rule is a boolean mask of failing rows, so the cost is a few column
+# operations per file, not Python per row. Failing rows are not dropped: they
+# keep a QUARANTINE_COL with every reason they failed and the file they came
+# from, the report datasets take only the rows that passed, and the
+# '<dataset>_quarantine' datasets hold the rest for review.
+# Warnings (e.g. an outlet not seen before) do not hold rows back; they are
+# checked on the report dataset when the admin panel asks for them.
+# Rules that depend on the day they run (future dates) are not applied to the
+# partitions, which are cached per file; they are read-time rules, applied by
+# the derived datasets, which rebuild daily (invalidation='daily').
+
+QUARANTINE_COL = 'Quarantine Reasons'
+WARNING_COL = 'Warnings'
+SOURCE_COL = 'Source'
+
+# Ingested dataset -> its quarantine dataset
+QUARANTINES = {'sales_ingest': 'sales_quarantine', 'swiggy_sales_ingest': 'swiggy_sales_quarantine'}
+
+# Identities hold to the paisa; the exports round each column separately
+TOLERANCE_PAISE = 1
+
+# Outlets and POS tabs seen so far; others are kept in the reports and listed as
+# warnings until added here. Override with comma-separated lists
+KNOWN_OUTLETS = {name.strip() for name in os.environ.get(
+    'KNOWN_OUTLETS', 'Baga,Calangute,KTC,Khorlim,Mapusa,Margao,Panaji,Patto,Porvorim,Siolim'
+).split(',') if name.strip()}
+KNOWN_TABS = {name.strip() for name in os.environ.get(
+    'KNOWN_TABS', 'AC,NON AC,SWIGGY,ZOMATO,TAKE AWAY,DINE OUT,DELIVERY,NON FOOD'
+).split(',') if name.strip()}
+
+
+# --- "; "-joined reasons per row ("" when no rule failed) ---
+def _reasons(n, rules):
+    # rules: [(reason, mask)] where mask is True for failing rows
+    failing = np.zeros(n, dtype=bool)
+    for _, mask in rules:
+        failing |= np.asarray(mask, dtype=bool)
+
+    reasons = np.full(n, '', dtype=object)
+    if failing.any():
+        # Reason strings are built for the failing rows only, one rule at a time
+        tagged = pd.Series('', index=np.arange(failing.sum()), dtype=object)
+        for reason, mask in rules:
+            hit = np.asarray(mask, dtype=bool)[failing]
+            tagged[hit] = tagged[hit] + reason + '; '
+        reasons[failing] = tagged.str[:-2].to_numpy()
+    return reasons
+
+
+# --- Tag each row with the reasons it failed ("" when it passed) ---
+def flag_rows(df, rules, source=None):
+    # source: file name for every row; None keeps a SOURCE_COL the input already has
+    df[QUARANTINE_COL] = _reasons(len(df), rules)
+    if source is not None or SOURCE_COL not in df.columns:
+        df[SOURCE_COL] = source or ''
+    return df
+
+
+# --- Add the reasons from read-time rules to the ones tagged at ingest ---
+def _apply_read_rules(df, read_rules):
+    if read_rules is None or df.empty:
+        return df
+    extra = _reasons(len(df), read_rules(df))
+    if not (extra != '').any():
+        return df
+    current = df[QUARANTINE_COL].to_numpy(dtype=object)
+    both = (current != '') & (extra != '')
+    combined = np.where(both, current + '; ' + extra, current + extra)
+    return df.assign(**{QUARANTINE_COL: combined})
+
+
+def _over_tolerance(left, right):
+    # int64 first: the paise columns may be int32 and a difference can overflow it
+    return (left.astype('int64') - right.astype('int64')).abs() > TOLERANCE_PAISE
+
+
+def _future(dates):
+    return dates > pd.Timestamp.today().normalize()
+
+
+# --- Sales rows (one tabwise export, amounts already in paise) ---
+def sales_rules(df):
+    rules = [
+        ('missing or unreadable Date', df['Date'].isna()),
+        ('Net Sale ≠ Sale − Discount', _over_tolerance(df['Sale'] - df['Discount'].astype('int64'), df['Net Sale'])),
+    ]
+    if 'Total Amount' in df.columns and 'Round Off' in df.columns:
+        rules.append((
+            'Gross Amount ≠ Total Amount + Round Off',
+            _over_tolerance(df['Total Amount'].astype('int64') + df['Round Off'], df['Gross Amount'])
+        ))
+    for count_col in ('No Of Items', 'No Of Bills'):
+        if count_col in df.columns:
+            rules.append((f'negative {count_col}', pd.to_numeric(df[count_col], errors='coerce') < 0))
+    return rules
+
+
+# --- Sales rows kept but worth a look ---
+def sales_warnings(df):
+    return [
+        ('unknown outlet', ~df['Outlet Name'].isin(KNOWN_OUTLETS)),
+        ('unknown tab', ~df['Tabs'].isin(KNOWN_TABS)),
+    ]
+
+
+# --- Swiggy POS bills (swiggy_pos.xlsx with the outlet mapping applied) ---
+def swiggy_sales_rules(df):
+    location = df['Location']
+    return [
+        ('missing or unreadable Bill Date', df['Bill Date'].isna()),
+        ('missing Order Id', df['Order Id'].isna()),
+        ('missing Location', location.isna() | (location == '')),
+        ('negative Gross Bill Amount', df['Gross Bill Amount'] < 0),
+    ]
+
+
+# --- Read-time rules (relative to today) ---
+def sales_read_rules(df):
+    return [('Date in the future', _future(df['Date']))]
+
+
+def swiggy_sales_read_rules(df):
+    return [('Bill Date in the future', _future(df['Bill Date']))]
+
+
+# --- Derived dataset loaders: passed rows (without the reasons) and quarantined rows ---
+def passed_rows(df, read_rules=None):
+    df = _apply_read_rules(df, read_rules)
+    passed = df[df[QUARANTINE_COL] == '']
+    return passed.drop(columns=[QUARANTINE_COL]).reset_index(drop=True)
+
+
+def quarantined_rows(df, read_rules=None):
+    df = _apply_read_rules(df, read_rules)
+    return df[df[QUARANTINE_COL] != ''].reset_index(drop=True)
+
+
+# --- Loader for a report dataset built from the rows that pass ---
+def passed_loader(read_rules=None):
+    def load(df):
+        return passed_rows(df, read_rules)
+    return load
+
+
+# --- Quarantined (or warned) row counts by reason (a row can count under several) ---
+def quarantine_summary(quarantine, column=QUARANTINE_COL):
+    if quarantine.empty:
+        return pd.DataFrame(columns=['Reason', 'Rows', 'Files'])
+    reasons = quarantine[[column, SOURCE_COL]].assign(
+        Reason=quarantine[column].str.split('; ')
+    ).explode('Reason')
+    summary = reasons.groupby('Reason').agg(Rows=('Reason', 'size'), Files=(SOURCE_COL, 'nunique'))
+    return summary.sort_values('Rows', ascending=False).reset_index()
+
+
+# --- Loader for a '<dataset>_quarantine' dataset; also exported as a gauge ---
+def quarantine_loader(dataset, read_rules=None):
+    def load(df):
+        quarantine = quarantined_rows(df, read_rules)
+        set_gauge('dashboard_quarantined_rows', {'dataset': dataset}, len(quarantine))
+        return quarantine
+    return load
+
+
+# --- Rows of a report dataset with warnings, tagged in WARNING_COL ---
+def warned_rows(df, warnings):
+    reasons = _reasons(len(df), warnings(df))
+    flagged = reasons != ''
+    return df[flagged].assign(**{WARNING_COL: reasons[flagged]}).reset_index(drop=True)
+
+
+# Ingested dataset -> (report dataset, its warnings)
+WARNINGS = {'sales_ingest': ('sales', sales_warnings)}
@@ -3,62 +3,167 @@ import pandas as pd
 import numpy as np
 import os
 from datetime import datetime, timedelta
-import plotly.express as px
-
-# --- Load CSV files from a given folder ---
-@st.cache_data(show_spinner=False)
-def load_sales_data(folder_path):
-    all_files = []
-    for root, dirs, files in os.walk(folder_path):
-        for file in files:
-            if file.endswith('.csv'):
-                all_files.append(os.path.join(root, file))
-    if not all_files:
-        return pd.DataFrame()
-
-    df_list = []
-    for file in all_files:
-        try:
-            df = pd.read_csv(file, encoding='utf-8')
-            df_list.append(df)
-        except Exception:
-            continue
-
-    if not df_list:
-        return pd.DataFrame()
-
-    data = pd.concat(df_list, ignore_index=True)
-    return data
-
-# --- Preprocess the sales data ---
-@st.cache_data(show_spinner=False)
-def preprocess_data(df):
+from datasets import get_dataset
+from perf import instrument, stage
+from result_cache import memoize
+from sections import section
+from charts import CHART_POINTS, downsample_series
+from table_view import render_table
+from downloads import download_button
+from datasets import dataset_version
+from money import downcast, percent_of, to_paise, to_rupees
+from validation import flag_rows, sales_rules
+from forecast import INTERVAL, SERIES_KEYS, WEEK_RANGE, Z
+from facets import facet_values, keep_valid
+
+# --- Load one tabwise export (a partition of the 'sales_ingest' dataset) ---
+def load_sales_file(path):
+    return preprocess_data(pd.read_csv(path, encoding='utf-8'), os.path.basename(path))
+
+# Total Amount and Round Off are optional in older exports
+MONEY_COLS = ['Sale', 'Discount', 'Net Sale', 'Charges', 'Total Tax', 'Total Amount', 'Round Off', 'Gross Amount']
+
+# --- Preprocess the sales data; rows failing validation.py's checks are tagged, not dropped ---
+def preprocess_data(df, source=''):
     required_cols = ['Date', 'Tabs', 'Sale', 'Discount', 'Net Sale', 'Charges', 'Total Tax', 'Gross Amount', 'Outlet Name']
     missing_cols = [c for c in required_cols if c not in df.columns]
     if missing_cols:
-        return pd.DataFrame()
+        # Recorded against the file in partition_status() and shown with the quarantine
+        raise ValueError(f"missing columns {missing_cols}")
 
     df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    df = df.dropna(subset=['Date'])
-
-    df['Year'] = df['Date'].dt.year.astype(str)
-    df['Month_Num'] = df['Date'].dt.month
-    df['Month'] = df['Date'].dt.month_name()
-    df['Week'] = df['Date'].dt.to_period('W').apply(
-        lambda r: f"{r.start_time.strftime('%d %b')} - {r.end_time.strftime('%d %b')}"
-    )
-    df['Week_Start'] = df['Date'].dt.to_period('W').apply(lambda r: r.start_time)
-    df['Day'] = df['Date'].dt.strftime('%d-%b-%Y')
 
-    df['Net Sale'] = pd.to_numeric(df['Net Sale'], errors='coerce').fillna(0)
-    df['Charges'] = pd.to_numeric(df['Charges'], errors='coerce').fillna(0)
+    # Amounts as integer paise (money.py); Sales Value is added up before the int32 downcast
+    money_cols = [col for col in MONEY_COLS if col in df.columns]
+    for col in money_cols:
+        df[col] = to_paise(df[col])
     df['Sales Value'] = df['Net Sale'] + df['Charges']
+    for col in money_cols + ['Sales Value']:
+        df[col] = downcast(df[col])
 
     df['Outlet Name'] = df['Outlet Name'].fillna('Unknown')
     df['Outlet Name'] = df['Outlet Name'].str.replace(r'\bNavtara\b', '', case=False, regex=True).str.strip()
     df['Tabs'] = df['Tabs'].fillna('Unknown')
+
+    df = flag_rows(df, sales_rules(df), source)
+    return add_calendar_columns(df)
+
+# --- Year / month / week / day labels used by the filters (vectorized; NaT stays blank) ---
+def add_calendar_columns(df):
+    dates = df['Date']
+    week_start = dates - pd.to_timedelta(dates.dt.dayofweek, unit='D')
+    df['Year'] = dates.dt.year.astype('Int64').astype(str)
+    df['Month_Num'] = dates.dt.month.astype('Int64')
+    df['Month'] = dates.dt.month_name()
+    df['Week'] = week_start.dt.strftime('%d %b') + ' - ' + (week_start + pd.Timedelta(days=6)).dt.strftime('%d %b')
+    df['Week_Start'] = week_start
+    df['Day'] = dates.dt.strftime('%d-%b-%Y')
     return df
 
+# --- Daily sales per outlet and tab: the pre-aggregated base of the trend charts ---
+def daily_sales(df):
+    daily = df.groupby(['Date', 'Outlet Name', 'Tabs'], as_index=False)['Sales Value'].sum()
+    daily['Sales Value'] = downcast(daily['Sales Value'])
+    return daily
+
+# --- Daily or weekly series, one column per outlet or tab (missing days are 0) ---
+def trend_frame(daily, grain, split_by, selected_outlets):
+    if selected_outlets:
+        daily = daily[daily['Outlet Name'].isin(selected_outlets)]
+    if daily.empty:
+        return pd.DataFrame()
+
+    dates = daily['Date']
+    if grain == 'Weekly':
+        # Weeks start on Monday, as in the 'Week' filter
+        dates = dates - pd.to_timedelta(dates.dt.dayofweek, unit='D')
+    wide = daily.pivot_table(index=dates, columns=split_by, values='Sales Value', aggfunc='sum', fill_value=0)
+    freq = 'W-MON' if grain == 'Weekly' else 'D'
+    wide = wide.reindex(pd.date_range(wide.index.min(), wide.index.max(), freq=freq), fill_value=0)
+    wide.index.name = 'Date'
+    return wide
+
+# === Growth matrix: outlet × tab × period ===
+# Every period gets an integer key so that "previous" is key - 1 and "same period
+# LY" is key - SPLY_LAG; both are looked up with one reindex of the aggregated
+# series on a shifted index instead of a loop per cell.
+GROWTH_GRAINS = ['Day', 'Week', 'Month', 'Fiscal Year']
+SPLY_LAG = {'Week': 52, 'Month': 12, 'Fiscal Year': 1}
+EPOCH = pd.Timestamp('1970-01-01')
+
+def period_keys(dates, grain):
+    dates = pd.DatetimeIndex(dates)
+    if grain == 'Day':
+        return (dates - EPOCH).days.to_numpy()
+    if grain == 'Week':
+        # Monday-based weeks, as in the 'Week' filter (1970-01-01 was a Thursday)
+        return ((dates - EPOCH).days.to_numpy() + 3) // 7
+    if grain == 'Month':
+        return dates.year.to_numpy() * 12 + dates.month.to_numpy() - 1
+    # Fiscal year April–March, keyed by its starting year
+    return dates.year.to_numpy() - (dates.month.to_numpy() < 4)
+
+def period_labels(keys, grain):
+    if grain == 'Day':
+        return (EPOCH + pd.to_timedelta(keys, unit='D')).strftime('%d-%b-%Y')
+    if grain == 'Week':
+        return 'Week of ' + (EPOCH + pd.to_timedelta(keys * 7 - 3, unit='D')).strftime('%d %b %Y')
+    if grain == 'Month':
+        return pd.to_datetime({'year': keys // 12, 'month': keys % 12 + 1, 'day': 1}).dt.strftime('%B %Y').to_numpy()
+    return [f"{key}-{(key + 1) % 100:02d}" for key in keys]
+
+def sply_keys(keys, grain):
+    if grain == 'Day':
+        # Same calendar date last year (29 Feb falls back to 28 Feb)
+        dates = EPOCH + pd.to_timedelta(keys, unit='D')
+        return period_keys(dates - pd.DateOffset(years=1), 'Day')
+    return keys - SPLY_LAG[grain]
+
+def growth_matrix(daily, grain, start_date, end_date, selected_outlets):
+    if selected_outlets:
+        daily = daily[daily['Outlet Name'].isin(selected_outlets)]
+    first, last = period_keys([start_date, end_date], grain)
+    keys = np.arange(first, last + 1)
+    lookback = min(keys.min() - 1, sply_keys(keys, grain).min())
+
+    daily_keys = period_keys(daily['Date'], grain)
+    in_range = (daily_keys >= lookback) & (daily_keys <= last)
+    daily = daily[in_range]
+    if daily.empty:
+        return pd.DataFrame()
+    sales = daily.groupby(['Outlet Name', 'Tabs', daily_keys[in_range]])['Sales Value'].sum()
+
+    # Full outlet × tab × period grid, so periods without sales show as 0
+    outlets = sorted(daily['Outlet Name'].unique())
+    tabs = sorted(daily['Tabs'].unique())
+    grid = pd.MultiIndex.from_product([outlets, tabs, keys], names=['Outlet', 'Tab', 'Key'])
+    cell_outlets = grid.get_level_values(0)
+    cell_tabs = grid.get_level_values(1)
+    cell_keys = grid.get_level_values(2).to_numpy()
+
+    def shifted(shifted_keys):
+        index = pd.MultiIndex.from_arrays([cell_outlets, cell_tabs, shifted_keys])
+        return sales.reindex(index, fill_value=0).to_numpy()
+
+    current = shifted(cell_keys)
+    previous = shifted(cell_keys - 1)
+    sply = shifted(sply_keys(cell_keys, grain))
+
+    growth = np.where(previous > 0, percent_of(current - previous, previous), np.nan)
+    sply_growth = np.where(sply > 0, percent_of(current - sply, sply), np.nan)
+
+    labels = pd.Series(period_labels(keys, grain), index=keys)
+    return pd.DataFrame({
+        'Outlet': cell_outlets,
+        'Tab': cell_tabs,
+        'Period': labels.reindex(cell_keys).to_numpy(),
+        'Current': to_rupees(current),
+        'Previous': to_rupees(previous),
+        'Growth %': growth,
+        'SPLY': to_rupees(sply),
+        'SPLY Growth %': sply_growth,
+    })
+
 # --- Get current period date range from filters ---
 def get_current_period(df, selected_years, selected_months, selected_weeks, selected_days):
     df_temp = df.copy()
@@ -75,56 +180,11 @@ def get_current_period(df, selected_years, selected_months, selected_weeks, sele
         return None, None
     return df_temp['Date'].min(), df_temp['Date'].max()
 
-# --- Main App ---
-def main():
-    st.title("📈 Sales Trends")
-
-    folder_path = "Input files"  # Change this path as needed
-
-    with st.spinner("Loading data..."):
-        df = load_sales_data(folder_path)
-    if df.empty:
-        st.error("No CSV files found or data could not be loaded.")
-        return
-
-    with st.spinner("Processing data..."):
-        df = preprocess_data(df)
-    if df.empty:
-        st.error("Required columns missing in CSV files.")
-        return
-
-    # --- Sidebar Filters ---
-    st.sidebar.header("📂 Filter Data")
-
-    years = sorted(df['Year'].unique())
-    months = list(df['Month'].unique())
-    outlets = sorted(df['Outlet Name'].unique())
-
-    select_all_years = st.sidebar.checkbox("Select All Years")
-    selected_years = st.sidebar.multiselect("Select Year(s):", options=years, default=years if select_all_years else [])
-
-    select_all_months = st.sidebar.checkbox("Select All Months")
-    selected_months = st.sidebar.multiselect("Select Month(s):", options=months, default=months if select_all_months else [])
-
-    select_all_outlets = st.sidebar.checkbox("Select All Outlets")
-    selected_outlets = st.sidebar.multiselect("Select Outlet(s):", options=outlets, default=outlets if select_all_outlets else [])
-
-    df_month_filtered = df.copy()
-    if selected_years:
-        df_month_filtered = df_month_filtered[df_month_filtered['Year'].isin(selected_years)]
-    if selected_months:
-        df_month_filtered = df_month_filtered[df_month_filtered['Month'].isin(selected_months)]
-
-    week_options = sorted(df_month_filtered['Week'].unique())
-    day_options = sorted(df_month_filtered['Day'].unique())
-
-    selected_weeks = st.sidebar.multiselect("Select Week(s):", week_options)
-    selected_days = st.sidebar.multiselect("Select Date(s):", day_options)
-
+# --- Current vs previous period vs same period LY for one selection (no widgets) ---
+def sales_comparison(df, selected_years, selected_months, selected_weeks, selected_days, selected_outlets):
     start_date, end_date = get_current_period(df, selected_years, selected_months, selected_weeks, selected_days)
     if start_date is None or end_date is None:
-        st.warning("No data found for current filter selection.")
-        return
+        return None
 
     df_current = df[(df['Date'] >= start_date) & (df['Date'] <= end_date)]
     if selected_outlets:
@@ -155,18 +215,126 @@ def main():
     if selected_outlets:
         df_previous = df_previous[df_previous['Outlet Name'].isin(selected_outlets)]
 
-    # --- KPI Cards ---
-    col1, col2, col3 = st.columns(3)
-
-    total_sales = df_current['Sales Value'].sum()
-    prev_sales = df_previous['Sales Value'].sum()
     sply_start = start_date - pd.DateOffset(years=1)
     sply_end = end_date - pd.DateOffset(years=1)
     df_sply = df[(df['Date'] >= sply_start) & (df['Date'] <= sply_end)]
     if selected_outlets:
         df_sply = df_sply[df_sply['Outlet Name'].isin(selected_outlets)]
+
+    total_sales = df_current['Sales Value'].sum()
+    prev_sales = df_previous['Sales Value'].sum()
     sply_sales = df_sply['Sales Value'].sum()
 
+    # Growth % vs previous and vs LY (0 when there is nothing to compare against)
+    growth = percent_of(total_sales - prev_sales, prev_sales) if prev_sales > 0 else 0
+    sply_growth = percent_of(total_sales - sply_sales, sply_sales) if sply_sales > 0 else 0
+
+    return {
+        'start': start_date,
+        'end': end_date,
+        'current': total_sales,
+        'previous': prev_sales,
+        'sply': sply_sales,
+        'growth': growth,
+        'sply_growth': sply_growth,
+        'tab_sales': df_current.groupby('Tabs')['Sales Value'].sum().reset_index(),
+        'outlet_sales': df_current.groupby('Outlet Name')['Sales Value'].sum().reset_index(),
+    }
+
+@memoize('web_sales', datasets=['sales'])
+def sales_report(selected_years, selected_months, selected_weeks, selected_days, selected_outlets):
+    return sales_comparison(get_dataset('sales'), selected_years, selected_months, selected_weeks, selected_days, selected_outlets)
+
+# --- Figures are cached as plain dicts per filter selection; a rerun with the
+# same filters skips the groupbys and the plotly figure build ---
+@memoize('web_sales', datasets=['sales'])
+def period_figures(selected_years, selected_months, selected_weeks, selected_days, selected_outlets):
+    import plotly.express as px
+
+    report = sales_report(selected_years, selected_months, selected_weeks, selected_days, selected_outlets)
+    if report is None:
+        return None
+    tab_sales = report['tab_sales'].assign(**{'Sales Value': to_rupees(report['tab_sales']['Sales Value'])})
+    outlet_sales = report['outlet_sales'].assign(**{'Sales Value': to_rupees(report['outlet_sales']['Sales Value'])})
+    fig_tabs = px.area(tab_sales, x='Tabs', y='Sales Value', title="Sales by Tab", labels={'Tabs': 'Tab'})
+    fig_outlets = px.bar(outlet_sales, x='Outlet Name', y='Sales Value', title="Sales by Outlet", labels={'Outlet Name': 'Outlet'})
+    return fig_tabs.to_dict(), fig_outlets.to_dict()
+
+@memoize('web_sales', datasets=['sales_daily'])
+def trend_figure(grain, split_by, selected_outlets, max_points):
+    import plotly.express as px
+
+    wide = trend_frame(get_dataset('sales_daily'), grain, split_by, selected_outlets)
+    if wide.empty:
+        return None
+    points = downsample_series(to_rupees(wide), max_points, series_name=split_by)
+    fig = px.line(points, x='Date', y='Sales Value', color=split_by, title=f"{grain} Sales by {split_by}")
+    fig.update_layout(hovermode='x unified')
+    return fig.to_dict()
+
+@memoize('web_sales', datasets=['sales_daily'])
+def growth_table(grain, start_date, end_date, selected_outlets):
+    return growth_matrix(get_dataset('sales_daily'), grain, start_date, end_date, selected_outlets)
+
+# --- Forecast chart and per outlet × tab table for the next `weeks` weeks ---
+# Errors of outlets and tabs move together (season, weather, holidays), so the
+# standard errors of a total are added rather than combined as independent.
+@memoize('web_sales', datasets=['sales_daily', 'sales_forecast'])
+def forecast_view(weeks, selected_outlets):
+    import plotly.graph_objects as go
+
+    forecast = get_dataset('sales_forecast')
+    daily = get_dataset('sales_daily')
+    if selected_outlets:
+        forecast = forecast[forecast['Outlet Name'].isin(selected_outlets)]
+    if forecast.empty:
+        return None
+    week_starts = np.sort(forecast['Week_Start'].unique())[:weeks]
+    forecast = forecast[forecast['Week_Start'].isin(week_starts)]
+    first_week = pd.Timestamp(week_starts[0])
+
+    # Full weeks of history before the forecast starts; the same number of weeks is the baseline
+    recent = trend_frame(daily, 'Weekly', 'Outlet Name', selected_outlets).sum(axis=1)
+    recent = to_rupees(recent[recent.index + pd.Timedelta(days=6) <= daily['Date'].max()])
+    baseline_start = first_week - pd.Timedelta(weeks=weeks)
+    baseline = daily[(daily['Date'] >= baseline_start) & (daily['Date'] < first_week)]
+    if selected_outlets:
+        baseline = baseline[baseline['Outlet Name'].isin(selected_outlets)]
+    baseline = to_rupees(baseline.groupby(SERIES_KEYS)['Sales Value'].sum())
+
+    total = forecast.groupby('Week_Start')[['Forecast', 'Std Error']].sum()
+    upper = total['Forecast'] + Z * total['Std Error']
+    lower = (total['Forecast'] - Z * total['Std Error']).clip(lower=0)
+    history = recent.iloc[-26:]
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=list(total.index) + list(total.index[::-1]), y=list(upper) + list(lower[::-1]),
+        fill='toself', fillcolor='rgba(99,110,250,0.2)', line={'width': 0},
+        name=f"{INTERVAL:.0%} interval", hoverinfo='skip'
+    ))
+    fig.add_trace(go.Scatter(x=history.index, y=history.to_numpy(), mode='lines+markers', name="Actual"))
+    fig.add_trace(go.Scatter(x=total.index, y=total['Forecast'], mode='lines+markers', name="Forecast", line={'dash': 'dash'}))
+    fig.update_layout(title=f"Weekly Sales: last {len(history)} weeks and next {weeks}", hovermode='x unified')
+
+    last = forecast[forecast['Week_Start'] == week_starts[-1]].set_index(SERIES_KEYS)['Cumulative Std Error']
+    table = forecast.groupby(SERIES_KEYS)['Forecast'].sum().to_frame()
+    table['Low'] = (table['Forecast'] - Z * last).clip(lower=0)
+    table['High'] = table['Forecast'] + Z * last
+    table[f'Last {weeks} Weeks'] = baseline.reindex(table.index, fill_value=0)
+    previous = table[f'Last {weeks} Weeks']
+    table['Change %'] = np.where(previous > 0, (table['Forecast'] - previous) * 100 / previous.where(previous > 0), np.nan)
+    table = table.reset_index().rename(columns={'Outlet Name': 'Outlet', 'Tabs': 'Tab'})
+    return fig.to_dict(), table
+
+# --- KPI cards: current, previous and same period LY with growth arrows (no widgets, so not a fragment) ---
+def kpi_cards(report):
+    total_sales = to_rupees(report['current'])
+    prev_sales = to_rupees(report['previous'])
+    sply_sales = to_rupees(report['sply'])
+    growth = report['growth']
+    sply_growth = report['sply_growth']
+
+    col1, col2, col3 = st.columns(3)
     with col1:
         st.markdown("### 🟢 Current Period Sales")
         st.markdown(
@@ -178,19 +346,8 @@ def main():
             unsafe_allow_html=True
         )
 
-        # Calculate growth % vs previous
-        if prev_sales > 0:
-            growth = ((total_sales - prev_sales) / prev_sales) * 100
-        else:
-            growth = 0
         growth_arrow = "&#9650;" if growth > 0 else "&#9660;" if growth < 0 else ""
         growth_color = "green" if growth > 0 else "red" if growth < 0 else "gray"
-
-        # Calculate growth % vs LY
-        if sply_sales > 0:
-            sply_growth = ((total_sales - sply_sales) / sply_sales) * 100
-        else:
-            sply_growth = 0
         sply_arrow = "&#9650;" if sply_growth > 0 else "&#9660;" if sply_growth < 0 else ""
         sply_color = "green" if sply_growth > 0 else "red" if sply_growth < 0 else "gray"
 
@@ -224,15 +381,152 @@ def main():
             unsafe_allow_html=True
         )
 
-    # --- Charts ---
-    tab_sales = df_current.groupby('Tabs')['Sales Value'].sum().reset_index()
-    fig_tabs = px.area(tab_sales, x='Tabs', y='Sales Value', title="Sales by Tab", labels={'Tabs': 'Tab'})
+# --- Charts: sales by tab and by outlet for the current period ---
+# (plotly is imported on first draw, not when the dataset loader imports this module; no widgets, so not a fragment)
+def sales_charts(selected_years, selected_months, selected_weeks, selected_days, selected_outlets):
+    fig_tabs, fig_outlets = period_figures(selected_years, selected_months, selected_weeks, selected_days, selected_outlets)
     st.plotly_chart(fig_tabs, use_container_width=True)
-
-    outlet_sales = df_current.groupby('Outlet Name')['Sales Value'].sum().reset_index()
-    fig_outlets = px.bar(outlet_sales, x='Outlet Name', y='Sales Value', title="Sales by Outlet", labels={'Outlet Name': 'Outlet'})
     st.plotly_chart(fig_outlets, use_container_width=True)
 
+# --- Growth by outlet, tab and period over the selected date range ---
+@section('web_sales', 'growth')
+def growth_section(start_date, end_date, selected_outlets):
+    st.subheader("📊 Growth by Outlet, Tab and Period")
+    grain = st.radio("Period", GROWTH_GRAINS, index=2, horizontal=True)
+    table = growth_table(grain, start_date, end_date, selected_outlets)
+    if table.empty:
+        st.info("No sales in the selected range.")
+        return
+
+    money = '₹ {:,.0f}'.format
+    percent = '{:+.1f}%'.format
+    render_table(
+        table, key="sales_growth",
+        formats={'Current': money, 'Previous': money, 'SPLY': money, 'Growth %': percent, 'SPLY Growth %': percent}
+    )
+    download_button(
+        "Download Growth Table",
+        lambda: table,
+        f"sales_growth_{grain.lower().replace(' ', '_')}",
+        fingerprint=("sales_growth", dataset_version('sales_daily'), grain, start_date, end_date, selected_outlets),
+        key="sales_growth_download"
+    )
+
+# --- Trend: daily or weekly sales over every year in the data, one line per outlet or tab ---
+@section('web_sales', 'trend')
+def trend_chart(selected_outlets):
+    st.subheader("📉 Sales Trend")
+    col_grain, col_split = st.columns(2)
+    grain = col_grain.radio("Granularity", ['Weekly', 'Daily'], horizontal=True)
+    split_by = col_split.radio("Lines by", ['Outlet Name', 'Tabs'], horizontal=True)
+
+    fig = trend_figure(grain, split_by, selected_outlets, CHART_POINTS)
+    if fig is None:
+        st.info("No sales for the selected outlets.")
+        return
+    st.plotly_chart(fig, use_container_width=True)
+
+# --- Forecast: the next weeks per outlet and tab, from the nightly fit (forecast.py) ---
+@section('web_sales', 'forecast')
+def forecast_section(selected_outlets):
+    st.subheader("🔮 Sales Forecast")
+    weeks = st.slider("Weeks ahead", WEEK_RANGE[0], WEEK_RANGE[1], value=8)
+    view = forecast_view(weeks, selected_outlets)
+    if view is None:
+        st.info("Not enough recent sales to forecast the selected outlets.")
+        return
+
+    fig, table = view
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(
+        f"Day-of-week and yearly seasonality fitted per outlet and tab; "
+        f"Low–High is the {INTERVAL:.0%} interval for the {weeks}-week total."
+    )
+    money = '₹ {:,.0f}'.format
+    render_table(
+        table, key="sales_forecast",
+        formats={'Forecast': money, 'Low': money, 'High': money, f'Last {weeks} Weeks': money, 'Change %': '{:+.1f}%'.format}
+    )
+    download_button(
+        "Download Forecast",
+        lambda: table,
+        f"sales_forecast_{weeks}_weeks",
+        fingerprint=("sales_forecast", dataset_version('sales_forecast'), weeks, selected_outlets),
+        key="sales_forecast_download"
+    )
+
+# --- Main App ---
+@instrument('web_sales')
+def main():
+    st.title("📈 Sales Trends")
+
+    stage('load')
+    with st.spinner("Loading data..."):
+        try:
+            df = get_dataset('sales')
+        except FileNotFoundError:
+            st.error("No CSV files found or data could not be loaded.")
+            return
+        except ValueError:
+            st.error("Required columns missing in CSV files.")
+            return
+    if df.empty:
+        st.error("Required columns missing in CSV files.")
+        return
+
+    # --- Sidebar Filters (cascading; options from the 'sales' facet index) ---
+    stage('filter')
+    st.sidebar.header("📂 Filter Data")
+
+    # Keyed widgets keep their selections when the options change; "Select All" holds every option
+    years = facet_values('sales', 'Year')
+    select_all_years = st.sidebar.checkbox("Select All Years", key="sales_all_years")
+    if select_all_years:
+        st.session_state["sales_years"] = years
+    keep_valid("sales_years", years)
+    selected_years = st.sidebar.multiselect("Select Year(s):", options=years, disabled=select_all_years, key="sales_years")
+
+    months = facet_values('sales', 'Month', {'Year': selected_years})
+    select_all_months = st.sidebar.checkbox("Select All Months", key="sales_all_months")
+    if select_all_months:
+        st.session_state["sales_months"] = months
+    keep_valid("sales_months", months)
+    selected_months = st.sidebar.multiselect("Select Month(s):", options=months, disabled=select_all_months, key="sales_months")
+
+    outlets = facet_values('sales', 'Outlet Name', {'Year': selected_years, 'Month': selected_months})
+    select_all_outlets = st.sidebar.checkbox("Select All Outlets", key="sales_all_outlets")
+    if select_all_outlets:
+        st.session_state["sales_outlets"] = outlets
+    keep_valid("sales_outlets", outlets)
+    selected_outlets = st.sidebar.multiselect("Select Outlet(s):", options=outlets, disabled=select_all_outlets, key="sales_outlets")
+
+    period = {'Year': selected_years, 'Month': selected_months, 'Outlet Name': selected_outlets}
+    weeks = facet_values('sales', 'Week', period)
+    keep_valid("sales_weeks", weeks)
+    selected_weeks = st.sidebar.multiselect("Select Week(s):", weeks, key="sales_weeks")
+    days = facet_values('sales', 'Day', {**period, 'Week': selected_weeks})
+    keep_valid("sales_days", days)
+    selected_days = st.sidebar.multiselect("Select Date(s):", days, key="sales_days")
+
+    # --- Current / previous / same-period-LY totals (memoized) ---
+    stage('aggregate')
+    filters = (
+        tuple(selected_years), tuple(selected_months), tuple(selected_weeks),
+        tuple(selected_days), tuple(selected_outlets)
+    )
+    report = sales_report(*filters)
+    if report is None:
+        st.warning("No data found for current filter selection.")
+    else:
+        stage('kpis')
+        kpi_cards(report)
+        stage('charts')
+        sales_charts(*filters)
+        growth_section(report['start'], report['end'], tuple(selected_outlets))
+
+    trend_chart(tuple(selected_outlets))
+    forecast_section(tuple(selected_outlets))
+
 # Run the app
 if __name__ == "__main__":
     main()